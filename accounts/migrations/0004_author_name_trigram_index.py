@@ -0,0 +1,25 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('accounts', '0003_alter_author_options_alter_author_name'),
+        # pg_trgm é criada pela migration de content.
+        ('content', '0009_post_title_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='author',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'
+                ),
+                name='author_name_upper_trgm_idx',
+            ),
+        ),
+    ]
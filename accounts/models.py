@@ -1,7 +1,9 @@
 import uuid
 
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class Role(models.Model):
@@ -43,6 +45,12 @@ class Author(models.Model):
     class Meta:
         ordering = ['name']
         db_table = 'author'
+        indexes = [
+            # Atende author__name__icontains (UPPER(name) LIKE UPPER('%...%')).
+            GinIndex(
+                OpClass(Upper('name'), name='gin_trgm_ops'), name='author_name_upper_trgm_idx'
+            ),
+        ]
         verbose_name_plural = 'Autores'
 
     def __str__(self):
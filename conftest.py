@@ -1,4 +1,5 @@
 import pytest
+from django.core.cache import cache
 
 
 @pytest.fixture(autouse=True)
@@ -6,6 +7,21 @@ def _disable_ssl_redirect(settings):
     settings.SECURE_SSL_REDIRECT = False
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # As invalidações rodam no COMMIT, que a transação de cada teste não alcança:
+    # sem isto, um teste leria o cache montado pelo anterior.
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def _isolate_sitemaps(settings, tmp_path):
+    # Os callbacks de on_commit dos testes não regravam os sitemaps na árvore do
+    # projeto; homeNews/tests/test_sitemaps.py religa a regeneração quando precisa.
+    settings.SITEMAP_ROOT = tmp_path / 'sitemaps'
+    settings.SITEMAP_AUTO_REGENERATE = False
+
+
 @pytest.fixture
 def api_base_url() -> str:
     return '/api/v1/'
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from content.models import Category, Post, Tag
+from content.models import Category, LiveBlogEntry, Post, Tag
 
 
 @admin.register(Post)
@@ -25,3 +25,19 @@ class CategoryAdmin(admin.ModelAdmin):
 class TagAdmin(admin.ModelAdmin):
     list_display = ('name', 'slug')
     search_fields = ('name',)
+
+
+@admin.register(LiveBlogEntry)
+class LiveBlogEntryAdmin(admin.ModelAdmin):
+    # Fora do PostAdmin (sem inline): publicar uma entrada não regrava o post.
+    list_display = ('post', 'created_at')
+    list_select_related = ('post',)
+    raw_id_fields = ('post',)
+    readonly_fields = ('created_at', 'updated_at')
+
+    # Append-only, como no painel: os clientes de /live/?after=<id> não veem edições.
+    def has_change_permission(self, request, obj=None):
+        return obj is None and super().has_change_permission(request, obj)
+
+    def has_delete_permission(self, request, obj=None):
+        return False
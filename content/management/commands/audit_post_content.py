@@ -0,0 +1,213 @@
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from content.models import PROCESSED_CONTENT_FIELDS, Post
+from content.services.content_audit import (
+    PolicyViolations,
+    audit_post_content,
+    init_audit_worker,
+)
+from content.services.content_blocks import attach_media_ids
+from content.services.post_search import refresh_post_search_vector
+from homeNews.cache_utils import invalidate_dependencies, invalidate_prefixes, post_dependency
+from homeNews.home_snapshot import schedule_home_snapshot_rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Audita o conteúdo dos posts contra a política de sanitização atual (tags, atributos e '
+        'protocolos removidos) e, com --apply, regrava os posts que mudam.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--apply',
+            action='store_true',
+            help='Grava o conteúdo reprocessado. Sem a flag é só um dry-run.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Processos que rodam o pipeline (1 processa no próprio comando).',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--checkpoint',
+            type=Path,
+            help='Arquivo JSON com o último post processado e os totais; retoma dele se existir.',
+        )
+        parser.add_argument('--top', type=int, default=20, help='Ocorrências listadas por tipo.')
+
+    def handle(self, *args, **options):
+        self.apply = options['apply']
+        self.verbosity = options['verbosity']
+        self.checkpoint_path = options['checkpoint']
+        self.state = self._load_checkpoint()
+        self.violations = PolicyViolations.from_dict(self.state['violations'])
+        batch_size = options['batch_size']
+        workers = max(options['workers'], 1)
+
+        # values_list + iterator: cursor do lado do servidor no Postgres, sem
+        # instanciar o modelo inteiro de 400k posts.
+        rows = (
+            Post.objects.filter(pk__gt=self.state['last_pk'])
+            .order_by('pk')
+            .values_list('pk', 'content', 'content_fingerprint', 'updated_at')
+            .iterator(chunk_size=batch_size)
+        )
+        with self._executor(workers) as executor:
+            while batch := list(islice(rows, batch_size)):
+                contents = [(pk, content) for pk, content, *_version in batch]
+                if executor is None:
+                    results = [audit_post_content(row) for row in contents]
+                else:
+                    chunksize = max(len(contents) // (workers * 4), 1)
+                    results = list(executor.map(audit_post_content, contents, chunksize=chunksize))
+                self._handle_batch(batch, results)
+
+        if self.apply and self.state['changed']:
+            invalidate_prefixes(['posts-list', 'feeds'])
+            schedule_home_snapshot_rebuild()
+        self._report(options['top'])
+
+    def _executor(self, workers: int):
+        if workers == 1:
+            init_audit_worker(settings.POST_CONTENT_PIPELINE)
+            return nullcontext()
+        # spawn, não fork: um filho criado com fork herdaria o socket da conexão
+        # com o banco. Os workers só recebem (pk, content).
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_audit_worker,
+            initargs=(settings.POST_CONTENT_PIPELINE,),
+        )
+
+    def _handle_batch(self, batch, results) -> None:
+        stored = {pk: (content, fingerprint) for pk, content, fingerprint, _updated in batch}
+        changed, fingerprinted = [], []
+        now = timezone.now()
+        for result in results:
+            content, fingerprint = stored[result.pk]
+            self.violations.update(result.violations)
+            processed = result.processed
+            if processed.sanitized_html != content:
+                changed.append(
+                    Post(
+                        pk=result.pk,
+                        content=processed.sanitized_html,
+                        plain_text=processed.plain_text,
+                        reading_time=processed.reading_time,
+                        excerpt=processed.excerpt,
+                        content_fingerprint=result.fingerprint,
+                        content_blocks=processed.blocks,
+                        updated_at=now,
+                    )
+                )
+                if self.verbosity >= 2:
+                    self.stdout.write(f'post {result.pk}: conteúdo muda após a sanitização')
+            elif fingerprint != result.fingerprint:
+                # Linha anterior ao fingerprint: conteúdo já limpo, faltam hash e blocos.
+                fingerprinted.append(
+                    Post(
+                        pk=result.pk,
+                        content_fingerprint=result.fingerprint,
+                        content_blocks=processed.blocks,
+                    )
+                )
+
+        if self.apply:
+            read_versions = {pk: (fingerprint, updated) for pk, _, fingerprint, updated in batch}
+            changed, fingerprinted = self._save(changed, fingerprinted, read_versions)
+        self.state['last_pk'] = batch[-1][0]
+        self.state['scanned'] += len(batch)
+        self.state['changed'] += len(changed)
+        self._save_checkpoint()
+
+    def _save(
+        self, changed: list[Post], fingerprinted: list[Post], read_versions: dict
+    ) -> tuple[list[Post], list[Post]]:
+        """Grava o lote e devolve só os posts efetivamente gravados."""
+        pending = [*changed, *fingerprinted]
+        if not pending:
+            return [], []
+        attach_media_ids(post.content_blocks for post in pending)
+        with transaction.atomic():
+            # O conteúdo foi lido antes de passar pelos workers: um post salvo por
+            # um editor nesse meio-tempo (ou apagado) fica de fora, para a edição
+            # não ser trocada pela versão lida no início do lote.
+            current = {
+                pk: (fingerprint, updated)
+                for pk, fingerprint, updated in Post.objects.select_for_update()
+                .filter(pk__in=[post.pk for post in pending])
+                .values_list('pk', 'content_fingerprint', 'updated_at')
+            }
+            changed, fingerprinted = (
+                [post for post in posts if current.get(post.pk) == read_versions[post.pk]]
+                for posts in (changed, fingerprinted)
+            )
+            skipped = len(pending) - len(changed) - len(fingerprinted)
+            if changed:
+                Post.objects.bulk_update(changed, [*PROCESSED_CONTENT_FIELDS, 'updated_at'])
+                refresh_post_search_vector(Post.objects.filter(pk__in=[p.pk for p in changed]))
+            if fingerprinted:
+                Post.objects.bulk_update(fingerprinted, ['content_fingerprint', 'content_blocks'])
+        # bulk_update não dispara os signals de save() por linha; o cache dos
+        # posts alterados é invalidado aqui, em lote.
+        if changed:
+            invalidate_dependencies([post_dependency(post.pk) for post in changed])
+        if skipped:
+            self.stdout.write(
+                f'{skipped} posts alterados durante a auditoria ficaram como estavam.'
+            )
+        return changed, fingerprinted
+
+    def _load_checkpoint(self) -> dict:
+        state = {'apply': self.apply, 'last_pk': 0, 'scanned': 0, 'changed': 0, 'violations': {}}
+        if self.checkpoint_path and self.checkpoint_path.exists():
+            state.update(json.loads(self.checkpoint_path.read_text()))
+            if state['apply'] != self.apply:
+                # Retomar um dry-run com --apply pularia os posts já lidos sem gravá-los.
+                mode = 'com --apply' if state['apply'] else 'sem --apply (dry-run)'
+                raise CommandError(
+                    f'O checkpoint {self.checkpoint_path} foi gravado {mode}; '
+                    'use outro arquivo para mudar de modo.'
+                )
+            self.stdout.write(f'Retomando após o post {state["last_pk"]}.')
+        return state
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        self.state['violations'] = self.violations.as_dict()
+        partial = self.checkpoint_path.with_suffix('.tmp')
+        partial.write_text(json.dumps(self.state))
+        partial.replace(self.checkpoint_path)
+
+    def _report(self, top: int) -> None:
+        for title, counter in (
+            ('Tags removidas', self.violations.tags),
+            ('Atributos removidos', self.violations.attributes),
+            ('Protocolos bloqueados', self.violations.protocols),
+        ):
+            self.stdout.write(f'{title}:')
+            for name, count in counter.most_common(top):
+                self.stdout.write(f'  {name}: {count}')
+
+        verb = 'atualizados' if self.apply else 'mudariam (dry-run, nada foi gravado)'
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{self.state["scanned"]} posts auditados; {self.state["changed"]} {verb}.'
+            )
+        )
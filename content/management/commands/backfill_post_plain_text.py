@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from content.models import Post
+from content.services.plain_text_extractor import HtmlPlainTextExtractor, build_excerpt
+from content.services.post_search import refresh_post_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Preenche plain_text, excerpt e search_vector dos posts a partir do conteúdo salvo.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument(
+            '--only-missing',
+            action='store_true',
+            help='Processa apenas posts com plain_text vazio.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Post.objects.order_by('pk')
+        if options['only_missing']:
+            queryset = queryset.filter(plain_text='')
+
+        extractor = HtmlPlainTextExtractor()
+        processed = 0
+        batch: list[Post] = []
+        # content já está sanitizado no banco: basta extrair o texto, sem rodar o pipeline
+        # completo nem disparar signals de save() por linha.
+        for post in queryset.only('pk', 'content').iterator(chunk_size=batch_size):
+            post.plain_text = extractor.extract(post.content)
+            post.excerpt = build_excerpt(post.plain_text)
+            batch.append(post)
+            if len(batch) >= batch_size:
+                processed += self._flush(batch)
+                batch = []
+        if batch:
+            processed += self._flush(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'{processed} posts atualizados.'))
+
+    @staticmethod
+    def _flush(batch: list[Post]) -> int:
+        Post.objects.bulk_update(batch, ['plain_text', 'excerpt'])
+        refresh_post_search_vector(Post.objects.filter(pk__in=[post.pk for post in batch]))
+        return len(batch)
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.3 on 2026-10-18 09:12
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import UnaccentExtension
+from django.db import migrations
+
+
+CREATE_SEARCH_CONFIG_SQL = """
+CREATE TEXT SEARCH CONFIGURATION portuguese_unaccent (COPY = portuguese);
+ALTER TEXT SEARCH CONFIGURATION portuguese_unaccent
+    ALTER MAPPING FOR hword, hword_part, word WITH unaccent, portuguese_stem;
+"""
+
+DROP_SEARCH_CONFIG_SQL = 'DROP TEXT SEARCH CONFIGURATION IF EXISTS portuguese_unaccent;'
+
+BACKFILL_SEARCH_VECTOR_SQL = """
+UPDATE post SET search_vector =
+    setweight(to_tsvector('portuguese_unaccent', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('portuguese_unaccent', coalesce(subtitle, '')), 'B')
+    || setweight(
+        to_tsvector('portuguese_unaccent', regexp_replace(content, '<[^>]+>', ' ', 'g')),
+        'C'
+    );
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0006_alter_category_managers'),
+    ]
+
+    operations = [
+        UnaccentExtension(),
+        migrations.RunSQL(CREATE_SEARCH_CONFIG_SQL, reverse_sql=DROP_SEARCH_CONFIG_SQL),
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=['search_vector'], name='post_search_vector_gin'
+            ),
+        ),
+        migrations.RunSQL(BACKFILL_SEARCH_VECTOR_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0007_post_search_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='plain_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.CharField(blank=True, default='', editable=False, max_length=300),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.3 on 2026-10-18 10:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0008_post_plain_text_excerpt'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'
+                ),
+                name='post_title_upper_trgm_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 6.0.3 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0010_category_tag_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['updated_at', 'id'], name='post_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.3 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0011_post_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
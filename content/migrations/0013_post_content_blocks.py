@@ -0,0 +1,17 @@
+# Generated by Django 6.0.3 on 2026-10-18 19:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0012_post_content_fingerprint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='content_blocks',
+            field=models.JSONField(blank=True, default=list, editable=False),
+        ),
+    ]
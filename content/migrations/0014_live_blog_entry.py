@@ -0,0 +1,42 @@
+# Generated by Django 6.0.3 on 2026-10-18 20:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0013_post_content_blocks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveBlogEntry',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                (
+                    'post',
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name='live_entries',
+                        to='content.post',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'Entrada de cobertura ao vivo',
+                'verbose_name_plural': 'Entradas de cobertura ao vivo',
+                'db_table': 'live_blog_entry',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['post', 'id'], name='live_entry_post_id_idx')],
+            },
+        ),
+    ]
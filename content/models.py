@@ -1,8 +1,29 @@
+import uuid
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import RegexValidator
 from django.db import models
+from django.db.models.functions import Upper
+
+from content.services.content_blocks import attach_media_ids
+from content.services.post_content_pipeline import (
+    fingerprint_content,
+    get_default_post_content_pipeline,
+)
+from content.services.post_search import refresh_post_search_vector
+
 
-from content.services.post_content_pipeline import get_default_post_content_pipeline
+# Campos gravados a partir do pipeline de conteúdo (Post._process_content).
+PROCESSED_CONTENT_FIELDS = (
+    'content',
+    'reading_time',
+    'plain_text',
+    'excerpt',
+    'content_fingerprint',
+    'content_blocks',
+)
 
 
 class PostStatus(models.TextChoices):
@@ -25,6 +46,8 @@ class Category(models.Model):
     slug = models.SlugField(max_length=100, unique=True, null=False, blank=False)
     color = models.CharField(max_length=7, null=True, validators=[color_validator])
     is_active = models.BooleanField(default=False)
+    # Base do sync incremental (/categories/sync/); queryset.update() não o atualiza.
+    updated_at = models.DateTimeField(auto_now=True)
 
     all_objects = models.Manager()
     objects = CategoryQuerySet.as_manager()
@@ -32,6 +55,7 @@ class Category(models.Model):
     class Meta:
         ordering = ['name']
         db_table = 'category'
+        indexes = [models.Index(fields=['updated_at', 'id'], name='category_updated_idx')]
         verbose_name_plural = 'Categorias'
 
     def __str__(self):
@@ -41,10 +65,13 @@ class Category(models.Model):
 class Tag(models.Model):
     name = models.CharField(max_length=100, null=False, blank=False)
     slug = models.SlugField(max_length=100, unique=True, null=False, blank=False)
+    # Base do sync incremental (/tags/sync/); queryset.update() não o atualiza.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['name']
         db_table = 'tag'
+        indexes = [models.Index(fields=['updated_at', 'id'], name='tag_updated_idx')]
         verbose_name_plural = 'Tags'
 
     def __str__(self):
@@ -62,8 +89,13 @@ class Post(models.Model):
         def by_tag(self, slug):
             return self.filter(tags__slug=slug)
 
-        def by_author(self, name):
-            return self.filter(author__name__icontains=name)
+        def by_author(self, value):
+            # UUID do autor vai direto para o índice de author_id; o resto usa o
+            # índice trigram de UPPER(author.name) (icontains).
+            try:
+                return self.filter(author_id=uuid.UUID(str(value)))
+            except ValueError:
+                return self.filter(author__name__icontains=value)
 
         def recent(self, amount):
             return self.order_by('-published_at', '-created_at')[:amount]
@@ -91,6 +123,15 @@ class Post(models.Model):
     reading_time = models.PositiveIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
+    plain_text = models.TextField(blank=True, default='', editable=False)
+    excerpt = models.CharField(max_length=300, blank=True, default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Hash do conteúdo já processado + versão da política de sanitização: salvar o
+    # mesmo conteúdo de novo não passa pelo pipeline.
+    content_fingerprint = models.CharField(max_length=64, blank=True, default='', editable=False)
+    # Árvore de blocos do conteúdo sanitizado (content.services.content_blocks),
+    # montada uma vez por save para o frontend não reprocessar o HTML a cada render.
+    content_blocks = models.JSONField(default=list, blank=True, editable=False)
 
     objects = PostQuerySet.as_manager()
 
@@ -99,6 +140,12 @@ class Post(models.Model):
         db_table = 'post'
         indexes = [
             models.Index(fields=['status', 'published_at'], name='post_status_published_idx'),
+            # Export incremental (/posts/export/?updated_since=) em ordem de updated_at.
+            models.Index(fields=['updated_at', 'id'], name='post_updated_idx'),
+            GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+            GinIndex(
+                OpClass(Upper('title'), name='gin_trgm_ops'), name='post_title_upper_trgm_idx'
+            ),
         ]
         verbose_name_plural = 'Posts'
 
@@ -110,23 +157,69 @@ class Post(models.Model):
         processed = get_default_post_content_pipeline().process(self.content)
         self.content = processed.sanitized_html
         self.reading_time = processed.reading_time
+        self.plain_text = processed.plain_text
+        self.excerpt = processed.excerpt
+        self.content_fingerprint = fingerprint_content(self.content)
+        attach_media_ids([processed.blocks])
+        self.content_blocks = processed.blocks
+
+    def _content_is_processed(self) -> bool:
+        return bool(self.content_fingerprint) and (
+            fingerprint_content(self.content) == self.content_fingerprint
+        )
 
     def save(self, *args, **kwargs):
         update_fields = kwargs.get('update_fields')
         is_new = self.pk is None
-        should_process_content = (
-            is_new or update_fields is None or 'content' in update_fields
+        should_process_content = is_new or update_fields is None or 'content' in update_fields
+        should_refresh_search = should_process_content or bool(
+            {'title', 'subtitle'} & set(update_fields or ())
         )
 
-        if should_process_content:
+        if should_process_content and (is_new or not self._content_is_processed()):
             self._process_content()
 
             if update_fields is not None:
                 fields = set(update_fields)
-                fields.update({'content', 'reading_time'})
+                fields.update(PROCESSED_CONTENT_FIELDS)
                 kwargs['update_fields'] = tuple(sorted(fields))
 
         super().save(*args, **kwargs)
 
+        if should_refresh_search:
+            refresh_post_search_vector(Post.objects.filter(pk=self.pk))
+
     def __str__(self):
         return self.title
+
+
+class LiveBlogEntry(models.Model):
+    """
+    Atualização de uma cobertura ao vivo: cada entrada é sanitizada sozinha e
+    publicada sem regravar o Post (nem disparar a invalidação dele).
+    """
+
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='live_entries')
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['id']
+        db_table = 'live_blog_entry'
+        indexes = [
+            # /posts/<slug>/live/?after=<id>
+            models.Index(fields=['post', 'id'], name='live_entry_post_id_idx'),
+        ]
+        verbose_name = 'Entrada de cobertura ao vivo'
+        verbose_name_plural = 'Entradas de cobertura ao vivo'
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            processed = get_default_post_content_pipeline().process(self.content)
+            self.content = processed.sanitized_html
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f'{self.post} #{self.pk}'
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from content.services.html_policy import (
+    DEFAULT_HTML_SANITIZATION_POLICY,
+    HtmlSanitizationPolicy,
+)
+from content.services.post_content_pipeline import (
+    ProcessedPostContent,
+    build_post_content_pipeline,
+    fingerprint_content,
+)
+from content.services.single_pass_content import URI_ATTRIBUTES
+
+
+@dataclass
+class PolicyViolations:
+    """What the sanitizer drops from a document, counted by kind."""
+
+    tags: Counter = field(default_factory=Counter)
+    attributes: Counter = field(default_factory=Counter)
+    protocols: Counter = field(default_factory=Counter)
+
+    def update(self, other: PolicyViolations) -> None:
+        self.tags.update(other.tags)
+        self.attributes.update(other.attributes)
+        self.protocols.update(other.protocols)
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        return {
+            'tags': dict(self.tags),
+            'attributes': dict(self.attributes),
+            'protocols': dict(self.protocols),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, dict[str, int]]) -> PolicyViolations:
+        return cls(
+            tags=Counter(data.get('tags', {})),
+            attributes=Counter(data.get('attributes', {})),
+            protocols=Counter(data.get('protocols', {})),
+        )
+
+
+class _PolicyViolationParser(HTMLParser):
+    def __init__(self, policy: HtmlSanitizationPolicy) -> None:
+        super().__init__(convert_charrefs=True)
+        self._allowed_tags = frozenset(policy.allowed_tags)
+        self._allowed_attributes = policy.allowed_attributes
+        self._allowed_protocols = frozenset(policy.allowed_protocols)
+        self.violations = PolicyViolations()
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag not in self._allowed_tags:
+            self.violations.tags[tag] += 1
+            return
+        allowed = self._allowed_attributes.get(tag, ())
+        for name, value in attrs:
+            if name not in allowed:
+                self.violations.attributes[f'{tag}[{name}]'] += 1
+            elif name in URI_ATTRIBUTES and value:
+                scheme = urlsplit(value.strip()).scheme.lower()
+                if scheme and scheme not in self._allowed_protocols:
+                    self.violations.protocols[scheme] += 1
+
+
+def find_policy_violations(
+    raw_html: str, policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY
+) -> PolicyViolations:
+    parser = _PolicyViolationParser(policy)
+    parser.feed(raw_html or '')
+    parser.close()
+    return parser.violations
+
+
+@dataclass(frozen=True)
+class ContentAuditResult:
+    pk: int
+    processed: ProcessedPostContent
+    fingerprint: str
+    violations: PolicyViolations
+
+
+_pipeline = None
+
+
+def init_audit_worker(pipeline_mode: str) -> None:
+    """``ProcessPoolExecutor`` initializer: one pipeline per worker process."""
+    global _pipeline
+    _pipeline = build_post_content_pipeline(pipeline_mode)
+
+
+def audit_post_content(row: tuple[int, str]) -> ContentAuditResult:
+    """
+    Runs in the worker processes, so it only sees ``(pk, content)`` and never
+    touches the database or the cache.
+    """
+    pk, content = row
+    processed = _pipeline.process(content)
+    return ContentAuditResult(
+        pk=pk,
+        processed=processed,
+        fingerprint=fingerprint_content(processed.sanitized_html),
+        violations=find_policy_violations(content),
+    )
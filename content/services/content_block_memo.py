@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Callable, Collection
+
+from django.core.cache import cache
+
+# Top-level block memo: a long live-coverage post edited many times a day only
+# re-sanitizes the blocks that changed since its last save. Each cached block
+# holds (sanitized_html, plain_text, word_count).
+BLOCK_MEMO_CACHE_PREFIX = 'post-content-block'
+BLOCK_MEMO_TTL = 60 * 60 * 24
+
+_TAG_RE = re.compile(
+    r'<!--.*?-->|<(/?)([a-zA-Z][^\s/>]*)(?:[^>"\']|"[^"]*"|\'[^\']*\')*>', re.DOTALL
+)
+_RAW_TEXT_ELEMENTS = frozenset({'script', 'style'})
+_VOID_ELEMENTS = frozenset(
+    {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+)
+
+BlockResult = tuple[str, str, int]
+
+
+def split_top_level_blocks(html: str, allowed_tags: Collection[str]) -> list[str]:
+    """
+    Split ``html`` between two top-level elements that survive sanitizing and
+    are separated only by whitespace. Processing the blocks one by one then
+    gives the same output as processing the whole document: the sanitizer
+    emits a tag on each side of every cut, so no text run, implied end tag or
+    stripped-block newline crosses it. Anything not cleanly nested (unclosed
+    or misnested tags, an unterminated <script>) returns ``[html]``.
+    """
+    blocks: list[str] = []
+    stack: list[str] = []
+    start = 0
+    cut = None  # end of the last top-level allowed element, if nothing followed it yet
+    position = 0
+    while match := _TAG_RE.search(html, position):
+        position = match.end()
+        closing, name = match.group(1), (match.group(2) or '').lower()
+        if not name:
+            cut = None  # comment
+            continue
+        if not stack and not closing:
+            if cut is not None and name in allowed_tags and not html[cut : match.start()].strip():
+                blocks.append(html[start:cut])
+                start = cut
+            cut = None
+        if name in _RAW_TEXT_ELEMENTS and not closing:
+            end = re.compile(rf'</{name}\s*>', re.IGNORECASE).search(html, position)
+            if end is None or end.group(0).lower() != f'</{name}>':
+                # The sanitizer only drops <script>...</script> spelled exactly so.
+                return [html]
+            position = end.end()
+            continue
+        if closing:
+            if not stack or stack.pop() != name:
+                return [html]
+        elif name not in _VOID_ELEMENTS and not match.group(0).endswith('/>'):
+            stack.append(name)
+        if not stack and name in allowed_tags:
+            cut = position
+    if stack:
+        return [html]
+    blocks.append(html[start:])
+    return blocks
+
+
+def _block_key(namespace: str, block: str) -> str:
+    digest = hashlib.sha256(block.encode('utf-8')).hexdigest()
+    return f'{BLOCK_MEMO_CACHE_PREFIX}:{namespace}:{digest}'
+
+
+def process_blocks(
+    blocks: list[str], namespace: str, process_block: Callable[[str], BlockResult]
+) -> list[BlockResult]:
+    """
+    Runs ``process_block`` only for the blocks missing from the cache.
+    ``namespace`` must change whenever the same block would be processed
+    differently (sanitization policy version, pipeline mode).
+    """
+    keys = [_block_key(namespace, block) for block in blocks]
+    cached = cache.get_many(keys)
+    missing: dict[str, BlockResult] = {}
+    results = []
+    for key, block in zip(keys, blocks, strict=True):
+        result = cached.get(key) or missing.get(key)
+        if result is None:
+            result = missing[key] = process_block(block)
+        results.append(result)
+    if missing:
+        cache.set_many(missing, timeout=BLOCK_MEMO_TTL)
+    return results
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import html
+from collections.abc import Iterable, Iterator
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.utils.text import slugify
+
+# Compact block tree of the sanitized HTML, stored in Post.content_blocks so the
+# frontend renders (lazy images, table of contents) without parsing HTML:
+#   {'type': 'paragraph', 'html': '<strong>inline</strong> html'}
+#   {'type': 'heading', 'level': 2, 'text': '...', 'anchor': 'slug'}
+#   {'type': 'image', 'src': '...', 'alt': '...', 'caption': '...', 'media_id': 1 | None}
+#   {'type': 'quote', 'children': [blocks]}
+#   {'type': 'list', 'ordered': False, 'items': ['inline html']}
+#   {'type': 'divider'}
+INLINE_TAGS = frozenset({'strong', 'em', 'a', 'br'})
+VOID_TAGS = frozenset({'br', 'hr', 'img'})
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'children')
+
+    def __init__(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self.tag = tag
+        self.attrs = attrs
+        self.children: list[_Node | str] = []
+
+    def attr(self, name: str) -> str:
+        return next((value or '' for key, value in self.attrs if key == name), '')
+
+    def find(self, tag: str) -> _Node | None:
+        for child in self.children:
+            if isinstance(child, _Node):
+                if child.tag == tag:
+                    return child
+                if found := child.find(tag):
+                    return found
+        return None
+
+
+class _TreeBuilder(HTMLParser):
+    """The input is already sanitized, so the tags are known and well nested."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.root = _Node('', [])
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        node = _Node(tag, attrs)
+        self._stack[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_endtag(self, tag: str) -> None:
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._stack[-1].children.append(data)
+
+
+def _text(node: _Node | str) -> str:
+    if isinstance(node, str):
+        return node
+    return ''.join(_text(child) for child in node.children)
+
+
+def _inner_html(node: _Node) -> str:
+    return ''.join(_outer_html(child) for child in node.children)
+
+
+def _outer_html(node: _Node | str) -> str:
+    if isinstance(node, str):
+        return html.escape(node, quote=False)
+    attrs = ''.join(f' {key}="{html.escape(value or "")}"' for key, value in node.attrs)
+    if node.tag in VOID_TAGS:
+        return f'<{node.tag}{attrs}>'
+    return f'<{node.tag}{attrs}>{_inner_html(node)}</{node.tag}>'
+
+
+def _image(img: _Node, caption: str = '') -> dict:
+    return {
+        'type': 'image',
+        'src': img.attr('src'),
+        'alt': img.attr('alt'),
+        'caption': ' '.join(caption.split()),
+        'media_id': None,
+    }
+
+
+def _blocks(children: list[_Node | str]) -> Iterator[dict]:
+    inline: list[_Node | str] = []
+
+    def flush() -> Iterator[dict]:
+        content = ''.join(_outer_html(child) for child in inline).strip()
+        inline.clear()
+        if content:
+            yield {'type': 'paragraph', 'html': content}
+
+    for child in children:
+        if isinstance(child, str) or child.tag in INLINE_TAGS:
+            inline.append(child)
+            continue
+        yield from flush()
+        tag = child.tag
+        if tag in {'h2', 'h3'}:
+            yield {'type': 'heading', 'level': int(tag[1]), 'text': ' '.join(_text(child).split())}
+        elif tag == 'blockquote':
+            yield {'type': 'quote', 'children': list(_blocks(child.children))}
+        elif tag in {'ul', 'ol'}:
+            items = [
+                _inner_html(item).strip()
+                for item in child.children
+                if isinstance(item, _Node) and item.tag == 'li'
+            ]
+            yield {'type': 'list', 'ordered': tag == 'ol', 'items': items}
+        elif tag == 'img':
+            yield _image(child)
+        elif tag == 'figure' and (img := child.find('img')):
+            caption = child.find('figcaption')
+            yield _image(img, _text(caption) if caption else '')
+        elif tag == 'hr':
+            yield {'type': 'divider'}
+        elif content := _inner_html(child).strip():
+            # p, and li / figcaption / figure outside their containers.
+            yield {'type': 'paragraph', 'html': content}
+    yield from flush()
+
+
+def _headings(blocks: list[dict]) -> Iterator[dict]:
+    for block in blocks:
+        if block['type'] == 'heading':
+            yield block
+        elif block['type'] == 'quote':
+            yield from _headings(block['children'])
+
+
+def _images(blocks: list[dict]) -> Iterator[dict]:
+    for block in blocks:
+        if block['type'] == 'image':
+            yield block
+        elif block['type'] == 'quote':
+            yield from _images(block['children'])
+
+
+def build_content_blocks(sanitized_html: str) -> list[dict]:
+    builder = _TreeBuilder()
+    builder.feed(sanitized_html or '')
+    builder.close()
+    blocks = list(_blocks(builder.root.children))
+
+    seen: dict[str, int] = {}
+    for heading in _headings(blocks):
+        anchor = slugify(heading['text']) or 'secao'
+        seen[anchor] = seen.get(anchor, 0) + 1
+        heading['anchor'] = anchor if seen[anchor] == 1 else f'{anchor}-{seen[anchor]}'
+    return blocks
+
+
+def _media_name(src: str) -> str | None:
+    media_path = urlsplit(settings.MEDIA_URL).path
+    path = urlsplit(src).path
+    if not media_path or not path.startswith(media_path):
+        return None
+    return unquote(path[len(media_path) :]) or None
+
+
+def attach_media_ids(block_lists: Iterable[list[dict]]) -> None:
+    """
+    Fills ``media_id`` of the image blocks whose ``src`` points to an uploaded
+    Media file, with a single query for every list given (e.g. a whole batch).
+    """
+    # Imported here: the audit workers use this module without django.setup().
+    from media_app.models import Media
+
+    images = [image for blocks in block_lists for image in _images(blocks)]
+    names = {name for image in images if (name := _media_name(image['src']))}
+    if not names:
+        return
+    ids = dict(Media.objects.filter(file__in=names).values_list('file', 'id'))
+    for image in images:
+        image['media_id'] = ids.get(_media_name(image['src']))
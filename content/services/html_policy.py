@@ -6,6 +6,9 @@ class HtmlSanitizationPolicy:
     allowed_tags: tuple[str, ...]
     allowed_attributes: dict[str, tuple[str, ...]]
     allowed_protocols: tuple[str, ...]
+    # Part of every stored content fingerprint: bump it when the rules change so
+    # posts saved under the old ones are processed again on their next save.
+    version: str = '1'
 
 
 DEFAULT_HTML_SANITIZATION_POLICY = HtmlSanitizationPolicy(
@@ -32,4 +35,3 @@ DEFAULT_HTML_SANITIZATION_POLICY = HtmlSanitizationPolicy(
     },
     allowed_protocols=('http', 'https', 'mailto'),
 )
-
@@ -11,27 +11,30 @@ from content.services.html_policy import (
 )
 
 
+BLOCKED_TAGS_RE = re.compile(
+    r'<(script|style)\b[^<]*(?:(?!<\/\1>)<[^<]*)*<\/\1>', flags=re.IGNORECASE | re.DOTALL
+)
+
+
 class HtmlSanitizer(Protocol):
-    def sanitize(self, raw_html: str) -> str:
-        ...
+    def sanitize(self, raw_html: str) -> str: ...
 
 
 class BleachHtmlSanitizer:
     def __init__(self, policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY) -> None:
         self._policy = policy
+        # Converted once, not on every post save.
+        self._clean_options = {
+            'tags': list(policy.allowed_tags),
+            'attributes': {tag: list(attrs) for tag, attrs in policy.allowed_attributes.items()},
+            'protocols': list(policy.allowed_protocols),
+        }
 
     def sanitize(self, raw_html: str) -> str:
-        content_without_blocked_tags = re.sub(
-            r'<(script|style)\b[^<]*(?:(?!<\/\1>)<[^<]*)*<\/\1>',
-            '',
-            raw_html or '',
-            flags=re.IGNORECASE | re.DOTALL,
-        )
+        content_without_blocked_tags = BLOCKED_TAGS_RE.sub('', raw_html or '')
         return bleach.clean(
             content_without_blocked_tags,
-            tags=list(self._policy.allowed_tags),
-            attributes={tag: list(attrs) for tag, attrs in self._policy.allowed_attributes.items()},
-            protocols=list(self._policy.allowed_protocols),
+            **self._clean_options,
             strip=True,
             strip_comments=True,
         )
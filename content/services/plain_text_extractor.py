@@ -31,3 +31,10 @@ class HtmlPlainTextExtractor:
         parser.close()
         return parser.get_text()
 
+
+def build_excerpt(plain_text: str, max_length: int = 280) -> str:
+    text = (plain_text or '').strip()
+    if len(text) <= max_length:
+        return text
+    cut = text[: max_length + 1].rsplit(' ', 1)[0] or text[:max_length]
+    return cut.rstrip(' ,;:.-') + '…'
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from django.db.models import Prefetch, QuerySet
+
+from content.models import Category
+
+# Exactly what the public card (PostListSerializer) renders: no content,
+# plain_text or search_vector, and the FKs joined instead of prefetched.
+POST_CARD_FIELDS = (
+    'id',
+    'title',
+    'subtitle',
+    'slug',
+    'published_at',
+    'reading_time',
+    'created_at',
+    'author',
+    'cover_image',
+)
+POST_CARD_RELATED = ('author', 'author__avatar', 'cover_image')
+AUTHOR_CARD_FIELDS = ('id', 'name', 'bio', 'avatar')
+MEDIA_CARD_FIELDS = ('id', 'title', 'file', 'alt_text', 'image_type')
+CATEGORY_CARD_FIELDS = ('id', 'name', 'slug', 'color')
+
+
+def post_card_fields(prefix: str = '', extra_fields=()) -> list[str]:
+    fields = [*POST_CARD_FIELDS, *extra_fields]
+    fields += [f'author__{field}' for field in AUTHOR_CARD_FIELDS]
+    fields += [f'author__avatar__{field}' for field in MEDIA_CARD_FIELDS]
+    fields += [f'cover_image__{field}' for field in MEDIA_CARD_FIELDS]
+    return [f'{prefix}{field}' for field in fields]
+
+
+def card_categories_prefetch(lookup: str = 'categories') -> Prefetch:
+    return Prefetch(lookup, queryset=Category.objects.only(*CATEGORY_CARD_FIELDS))
+
+
+def post_cards(queryset: QuerySet, extra_fields=()) -> QuerySet:
+    """
+    Posts ready to be serialized as cards: one query with author, avatar and
+    cover joined, plus one for the categories. ``extra_fields`` are columns the
+    serializer in use needs on top of the card (e.g. ``excerpt`` for feeds).
+    """
+    return (
+        queryset.select_related(*POST_CARD_RELATED)
+        .only(*post_card_fields(extra_fields=extra_fields))
+        .prefetch_related(card_categories_prefetch())
+    )
@@ -1,14 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import re
+from dataclasses import dataclass, field
 from functools import lru_cache
 
+from django.conf import settings
+
+from content.services.content_blocks import build_content_blocks
+from content.services.content_block_memo import process_blocks, split_top_level_blocks
+from content.services.html_policy import (
+    DEFAULT_HTML_SANITIZATION_POLICY,
+    HtmlSanitizationPolicy,
+)
 from content.services.html_sanitizer import BleachHtmlSanitizer, HtmlSanitizer
-from content.services.plain_text_extractor import HtmlPlainTextExtractor, PlainTextExtractor
+from content.services.plain_text_extractor import (
+    HtmlPlainTextExtractor,
+    PlainTextExtractor,
+    build_excerpt,
+)
 from content.services.reading_time_calculator import (
+    WORD_RE,
     ReadingTimeCalculator,
     WordCountReadingTimeCalculator,
 )
+from content.services.single_pass_content import SinglePassContentProcessor
+
+PIPELINE_STAGED = 'staged'
+PIPELINE_SINGLE_PASS = 'single_pass'
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint_content(
+    html: str, policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY
+) -> str:
+    """Hash stored in ``Post.content_fingerprint``; covers the policy version."""
+    payload = f'{policy.version}\0{html or ""}'
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
 
 
 @dataclass(frozen=True)
@@ -16,6 +44,9 @@ class ProcessedPostContent:
     sanitized_html: str
     plain_text: str
     reading_time: int | None
+    excerpt: str = ''
+    # Block tree of sanitized_html (content.services.content_blocks).
+    blocks: list[dict] = field(default_factory=list)
 
 
 class PostContentPipeline:
@@ -37,14 +68,112 @@ class PostContentPipeline:
             sanitized_html=sanitized_html,
             plain_text=plain_text,
             reading_time=reading_time,
+            excerpt=build_excerpt(plain_text),
+            blocks=build_content_blocks(sanitized_html),
         )
 
 
-@lru_cache(maxsize=1)
-def get_default_post_content_pipeline() -> PostContentPipeline:
-    return PostContentPipeline(
-        sanitizer=BleachHtmlSanitizer(),
-        plain_text_extractor=HtmlPlainTextExtractor(),
-        reading_time_calculator=WordCountReadingTimeCalculator(),
-    )
+class SinglePassPostContentPipeline:
+    """
+    Same output contract as ``PostContentPipeline``, but the HTML is tokenized
+    once: sanitizing, plain text extraction and word counting share the token
+    stream instead of re-parsing each other's output.
+    """
+
+    def __init__(
+        self,
+        reading_time_calculator: WordCountReadingTimeCalculator,
+        policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY,
+    ) -> None:
+        self._processor = SinglePassContentProcessor(policy)
+        self._reading_time_calculator = reading_time_calculator
+
+    def process(self, raw_html: str) -> ProcessedPostContent:
+        result = self._processor.process(raw_html or '')
+        return ProcessedPostContent(
+            sanitized_html=result.sanitized_html,
+            plain_text=result.plain_text,
+            reading_time=self._reading_time_calculator.minutes_for_word_count(result.word_count),
+            excerpt=build_excerpt(result.plain_text),
+            blocks=build_content_blocks(result.sanitized_html),
+        )
+
+
+class BlockMemoPostContentPipeline:
+    """
+    Wraps another pipeline for long documents: the HTML is split into top-level
+    blocks and only the blocks missing from the shared cache go through the
+    inner pipeline. Shorter documents, or ones that cannot be split safely, are
+    processed whole.
+    """
 
+    def __init__(
+        self,
+        inner: PostContentPipeline | SinglePassPostContentPipeline,
+        namespace: str,
+        reading_time_calculator: WordCountReadingTimeCalculator,
+        min_chars: int,
+        policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY,
+    ) -> None:
+        self._inner = inner
+        self._namespace = f'{policy.version}:{namespace}'
+        self._reading_time_calculator = reading_time_calculator
+        self._min_chars = min_chars
+        self._allowed_tags = frozenset(policy.allowed_tags)
+
+    def process(self, raw_html: str) -> ProcessedPostContent:
+        raw_html = raw_html or ''
+        blocks = (
+            split_top_level_blocks(raw_html, self._allowed_tags)
+            if len(raw_html) >= self._min_chars
+            else [raw_html]
+        )
+        if len(blocks) < 2:
+            return self._inner.process(raw_html)
+
+        results = process_blocks(blocks, self._namespace, self._process_block)
+        plain_text = WHITESPACE_RE.sub(' ', ' '.join(text for _, text, _ in results)).strip()
+        words = sum(count for _, _, count in results)
+        sanitized_html = ''.join(html for html, _, _ in results)
+        return ProcessedPostContent(
+            sanitized_html=sanitized_html,
+            plain_text=plain_text,
+            reading_time=self._reading_time_calculator.minutes_for_word_count(words),
+            excerpt=build_excerpt(plain_text),
+            blocks=build_content_blocks(sanitized_html),
+        )
+
+    def _process_block(self, block: str) -> tuple[str, str, int]:
+        processed = self._inner.process(block)
+        words = sum(1 for _ in WORD_RE.finditer(processed.plain_text))
+        return processed.sanitized_html, processed.plain_text, words
+
+
+@lru_cache(maxsize=None)
+def build_post_content_pipeline(mode: str = PIPELINE_STAGED, block_memo_min_chars: int = 0):
+    if block_memo_min_chars > 0:
+        return BlockMemoPostContentPipeline(
+            inner=build_post_content_pipeline(mode),
+            namespace=mode,
+            reading_time_calculator=WordCountReadingTimeCalculator(),
+            min_chars=block_memo_min_chars,
+        )
+    if mode == PIPELINE_SINGLE_PASS:
+        return SinglePassPostContentPipeline(
+            reading_time_calculator=WordCountReadingTimeCalculator(),
+        )
+    if mode == PIPELINE_STAGED:
+        return PostContentPipeline(
+            sanitizer=BleachHtmlSanitizer(),
+            plain_text_extractor=HtmlPlainTextExtractor(),
+            reading_time_calculator=WordCountReadingTimeCalculator(),
+        )
+    raise ValueError(f'Unknown POST_CONTENT_PIPELINE: {mode!r}')
+
+
+def get_default_post_content_pipeline() -> (
+    PostContentPipeline | SinglePassPostContentPipeline | BlockMemoPostContentPipeline
+):
+    return build_post_content_pipeline(
+        settings.POST_CONTENT_PIPELINE, settings.POST_CONTENT_BLOCK_MEMO_MIN_CHARS
+    )
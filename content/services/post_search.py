@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db.models import F, QuerySet
+
+# Copy of the built-in ``portuguese`` configuration with ``unaccent`` in front of
+# the stemmer (created by content/migrations/0007), so "eleição" and "eleicao"
+# produce the same lexeme.
+POST_SEARCH_CONFIG = 'portuguese_unaccent'
+
+POST_SEARCH_HEADLINE_OPTIONS = {
+    'start_sel': '<mark>',
+    'stop_sel': '</mark>',
+    'max_words': 35,
+    'min_words': 15,
+    'max_fragments': 2,
+    'fragment_delimiter': ' … ',
+}
+
+
+def build_post_search_vector() -> SearchVector:
+    return (
+        SearchVector('title', weight='A', config=POST_SEARCH_CONFIG)
+        + SearchVector('subtitle', weight='B', config=POST_SEARCH_CONFIG)
+        + SearchVector('plain_text', weight='C', config=POST_SEARCH_CONFIG)
+    )
+
+
+def refresh_post_search_vector(queryset: QuerySet) -> int:
+    # Computed in the database from the stored columns, so partial saves
+    # (e.g. update_fields=['title']) never need the content re-parsed.
+    return queryset.update(search_vector=build_post_search_vector())
+
+
+def search_posts(queryset: QuerySet, term: str) -> QuerySet:
+    query = SearchQuery(term, config=POST_SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(search_vector=query).annotate(
+        search_rank=SearchRank(F('search_vector'), query),
+        search_headline=SearchHeadline(
+            F('plain_text'),
+            query,
+            config=POST_SEARCH_CONFIG,
+            **POST_SEARCH_HEADLINE_OPTIONS,
+        ),
+    )
@@ -4,10 +4,11 @@ import math
 import re
 from typing import Protocol
 
+WORD_RE = re.compile(r'\b\w+\b', re.UNICODE)
+
 
 class ReadingTimeCalculator(Protocol):
-    def calculate_minutes(self, text: str) -> int | None:
-        ...
+    def calculate_minutes(self, text: str) -> int | None: ...
 
 
 class WordCountReadingTimeCalculator:
@@ -16,8 +17,9 @@ class WordCountReadingTimeCalculator:
         self._minimum_minutes = minimum_minutes
 
     def calculate_minutes(self, text: str) -> int | None:
-        words = len(re.findall(r'\b\w+\b', text, flags=re.UNICODE))
+        return self.minutes_for_word_count(len(WORD_RE.findall(text)))
+
+    def minutes_for_word_count(self, words: int) -> int | None:
         if words == 0:
             return None
         return max(self._minimum_minutes, math.ceil(words / self._words_per_minute))
-
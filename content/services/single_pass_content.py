@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+from bleach import html5lib_shim
+from bleach.sanitizer import (
+    INVISIBLE_CHARACTERS_RE,
+    INVISIBLE_REPLACEMENT_CHAR,
+    BleachSanitizerFilter,
+)
+
+from content.services.html_policy import (
+    DEFAULT_HTML_SANITIZATION_POLICY,
+    HtmlSanitizationPolicy,
+)
+from content.services.reading_time_calculator import WORD_RE
+
+WHITESPACE_RE = re.compile(r'\s+')
+VOID_TAGS = frozenset({'br', 'hr', 'img'})
+# Start tags that close an open <p>, as in the HTML5 tree bleach builds.
+CLOSES_PARAGRAPH = frozenset(
+    {'p', 'h2', 'h3', 'ul', 'ol', 'blockquote', 'figure', 'figcaption', 'hr'}
+)
+URI_ATTRIBUTES = frozenset(name for _namespace, name in html5lib_shim.attr_val_is_uri)
+
+
+class CompiledHtmlPolicy:
+    """``HtmlSanitizationPolicy`` converted once into lookup sets."""
+
+    def __init__(self, policy: HtmlSanitizationPolicy) -> None:
+        self.allowed_tags = frozenset(policy.allowed_tags)
+        self.allowed_attributes = {
+            tag: frozenset(attributes) for tag, attributes in policy.allowed_attributes.items()
+        }
+        self.allowed_protocols = frozenset(policy.allowed_protocols)
+        # URL validation is bleach's own (the method is stateless).
+        self._uri_checker = BleachSanitizerFilter(
+            source=iter(()), allowed_protocols=self.allowed_protocols
+        )
+
+    def is_allowed_uri(self, value: str) -> bool:
+        return self._uri_checker.sanitize_uri_value(value, self.allowed_protocols) is not None
+
+
+@dataclass(frozen=True)
+class SinglePassResult:
+    sanitized_html: str
+    plain_text: str
+    word_count: int
+
+
+class _SinglePassParser(HTMLParser):
+    """
+    One ``HTMLParser`` pass over the raw HTML: every token is written straight
+    to the sanitized output and, if it is text, to the plain text and the word
+    count. Everything emitted is either an allowed tag rebuilt here or escaped
+    text, so no input markup reaches the output verbatim.
+    """
+
+    def __init__(self, policy: CompiledHtmlPolicy) -> None:
+        super().__init__(convert_charrefs=True)
+        self._policy = policy
+        self._html: list[str] = []
+        self._open: list[str] = []
+        self._chunks: list[str] = []
+        self._pending: list[str] = []
+        self._blocked_depth = 0
+        self.word_count = 0
+
+    # --- text ---
+
+    def handle_data(self, data: str) -> None:
+        if self._blocked_depth or not data:
+            return
+        data = INVISIBLE_CHARACTERS_RE.sub(INVISIBLE_REPLACEMENT_CHAR, data)
+        self._html.append(html.escape(data, quote=False).replace('\xa0', '&nbsp;'))
+        self._pending.append(data)
+
+    def _flush_text(self) -> None:
+        # Same chunks as HtmlPlainTextExtractor: one per run of text between two
+        # tags of the output (stripped tags do not split the text).
+        if not self._pending:
+            return
+        chunk = ''.join(self._pending)
+        self._pending = []
+        self._chunks.append(chunk)
+        self.word_count += sum(1 for _ in WORD_RE.finditer(chunk))
+
+    # --- tags ---
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self.CDATA_CONTENT_ELEMENTS:
+            # script/style are dropped along with their content.
+            self._blocked_depth += 1
+            return
+        if self._blocked_depth:
+            return
+        if tag not in self._policy.allowed_tags:
+            if tag in html5lib_shim.HTML_TAGS_BLOCK_LEVEL and self.getpos() != (1, 0):
+                # A stripped block becomes a newline (except at the start), as in bleach.
+                self.handle_data('\n')
+            return
+        if tag in CLOSES_PARAGRAPH and 'p' in self._open:
+            self._close_until('p')
+        elif tag == 'li' and 'li' in self._open:
+            self._close_until('li')
+        self._flush_text()
+        self._html.append(f'<{tag}{self._attributes(tag, attrs)}>')
+        if tag not in VOID_TAGS:
+            self._open.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs) -> None:
+        self.handle_starttag(tag, attrs)
+        if tag in self.CDATA_CONTENT_ELEMENTS:
+            self._blocked_depth -= 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.CDATA_CONTENT_ELEMENTS:
+            self._blocked_depth = max(self._blocked_depth - 1, 0)
+            return
+        if self._blocked_depth or tag not in self._open:
+            return
+        self._close_until(tag)
+
+    def _close_until(self, tag: str) -> None:
+        # Also closes whatever is still open inside it (misnested HTML).
+        self._flush_text()
+        while self._open:
+            current = self._open.pop()
+            self._html.append(f'</{current}>')
+            if current == tag:
+                return
+
+    def _attributes(self, tag: str, attrs) -> str:
+        allowed = self._policy.allowed_attributes.get(tag, ())
+        rendered, seen = [], set()
+        for name, value in attrs:
+            if name not in allowed or name in seen:
+                continue
+            seen.add(name)
+            value = value or ''
+            if name in URI_ATTRIBUTES and not self._policy.is_allowed_uri(value):
+                continue
+            rendered.append(f' {name}="{html.escape(value, quote=True)}"')
+        return ''.join(rendered)
+
+    def result(self) -> SinglePassResult:
+        self.close()
+        self._close_until(None)
+        text = WHITESPACE_RE.sub(' ', ' '.join(self._chunks)).strip()
+        return SinglePassResult(''.join(self._html), text, self.word_count)
+
+
+class SinglePassContentProcessor:
+    """
+    Sanitizes, extracts the plain text and counts words in a single
+    tokenization of the HTML, with the policy compiled once per processor.
+    """
+
+    def __init__(self, policy: HtmlSanitizationPolicy = DEFAULT_HTML_SANITIZATION_POLICY) -> None:
+        self._policy = CompiledHtmlPolicy(policy)
+
+    def process(self, raw_html: str) -> SinglePassResult:
+        # The parser is stateful: one per call (cheap, unlike compiling the policy).
+        parser = _SinglePassParser(self._policy)
+        parser.feed(raw_html or '')
+        return parser.result()
@@ -0,0 +1,155 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models.signals import post_save
+
+from content.management.commands import audit_post_content as audit_command
+from content.models import Post
+from content.services.content_audit import find_policy_violations
+from content.services.post_content_pipeline import fingerprint_content
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+LEGACY_HTML = (
+    '<p onclick="x()">texto <font color="red">legado</font></p>'
+    '<script>alert(1)</script><a href="javascript:alert(1)">link</a>'
+)
+
+
+def _legacy_post(content: str = LEGACY_HTML) -> Post:
+    post = PostFactory(content='<p>provisório</p>')
+    # Como um post salvo antes da sanitização obrigatória: sem passar pelo save().
+    Post.objects.filter(pk=post.pk).update(content=content, content_fingerprint='')
+    return post
+
+
+def test_find_policy_violations_counts_tags_attributes_and_protocols():
+    violations = find_policy_violations(LEGACY_HTML + '<img src="data:image/png;base64,AA">')
+
+    assert violations.tags == {'font': 1, 'script': 1}
+    assert violations.attributes == {'p[onclick]': 1}
+    assert violations.protocols == {'javascript': 1, 'data': 1}
+
+
+def test_audit_dry_run_reports_without_writing():
+    post = _legacy_post()
+    stdout = StringIO()
+
+    call_command('audit_post_content', '--workers', '1', stdout=stdout)
+
+    post.refresh_from_db()
+    assert post.content == LEGACY_HTML
+    output = stdout.getvalue()
+    assert 'script: 1' in output
+    assert 'p[onclick]: 1' in output
+    assert 'javascript: 1' in output
+    assert '1 posts auditados; 1 mudariam' in output
+
+
+def test_audit_apply_uses_bulk_updates_across_a_process_pool(tmp_path):
+    post = _legacy_post()
+    clean = PostFactory(content='<p>limpo</p>')
+    Post.objects.filter(pk=clean.pk).update(content_fingerprint='', content_blocks=[])
+    checkpoint = tmp_path / 'audit.json'
+    saves = []
+
+    def count_save(**kwargs):
+        saves.append(kwargs['instance'].pk)
+
+    post_save.connect(count_save, sender=Post)
+    try:
+        call_command(
+            'audit_post_content',
+            '--apply',
+            '--workers',
+            '2',
+            '--checkpoint',
+            str(checkpoint),
+            stdout=StringIO(),
+        )
+    finally:
+        post_save.disconnect(count_save, sender=Post)
+
+    post.refresh_from_db()
+    clean.refresh_from_db()
+    assert saves == []
+    assert post.content == '<p>texto legado</p><a>link</a>'
+    assert post.plain_text == 'texto legado link'
+    assert post.content_fingerprint == fingerprint_content(post.content)
+    assert clean.content_fingerprint == fingerprint_content('<p>limpo</p>')
+    assert clean.content_blocks == [{'type': 'paragraph', 'html': 'limpo'}]
+    state = json.loads(checkpoint.read_text())
+    assert state['last_pk'] == clean.pk
+    assert state['changed'] == 1
+
+
+def test_audit_resumes_after_the_checkpoint(tmp_path):
+    done = _legacy_post()
+    pending = _legacy_post()
+    checkpoint = tmp_path / 'audit.json'
+    checkpoint.write_text(json.dumps({'last_pk': done.pk, 'scanned': 1, 'changed': 1}))
+    stdout = StringIO()
+
+    call_command(
+        'audit_post_content',
+        '--apply',
+        '--workers',
+        '1',
+        '--checkpoint',
+        str(checkpoint),
+        stdout=stdout,
+    )
+
+    done.refresh_from_db()
+    pending.refresh_from_db()
+    assert done.content == LEGACY_HTML
+    assert pending.content == '<p>texto legado</p><a>link</a>'
+    assert '2 posts auditados; 2 atualizados' in stdout.getvalue()
+
+
+def test_audit_apply_keeps_posts_edited_while_the_batch_was_processed(monkeypatch):
+    post = _legacy_post()
+    original = audit_command.audit_post_content
+
+    def edit_during_audit(row):
+        # O editor salva o post depois da leitura do lote e antes da gravação.
+        edited = Post.objects.get(pk=row[0])
+        edited.content = '<p>edição do editor</p>'
+        edited.save()
+        return original(row)
+
+    monkeypatch.setattr(audit_command, 'audit_post_content', edit_during_audit)
+    stdout = StringIO()
+
+    call_command('audit_post_content', '--apply', '--workers', '1', stdout=stdout)
+
+    post.refresh_from_db()
+    assert post.content == '<p>edição do editor</p>'
+    assert '1 posts alterados durante a auditoria' in stdout.getvalue()
+    assert '0 atualizados' in stdout.getvalue()
+
+
+def test_audit_refuses_to_resume_a_dry_run_checkpoint_with_apply(tmp_path):
+    post = _legacy_post()
+    checkpoint = tmp_path / 'audit.json'
+    call_command(
+        'audit_post_content', '--workers', '1', '--checkpoint', str(checkpoint), stdout=StringIO()
+    )
+
+    with pytest.raises(CommandError, match='dry-run'):
+        call_command(
+            'audit_post_content',
+            '--apply',
+            '--workers',
+            '1',
+            '--checkpoint',
+            str(checkpoint),
+            stdout=StringIO(),
+        )
+
+    post.refresh_from_db()
+    assert post.content == LEGACY_HTML
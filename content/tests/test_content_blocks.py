@@ -0,0 +1,74 @@
+import pytest
+
+from content.models import Post
+from content.services.content_blocks import build_content_blocks
+from setup.tests.factories import MediaFactory, PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_build_content_blocks_from_sanitized_html():
+    blocks = build_content_blocks(
+        '<h2>Operação Tabela</h2><p>um <strong> dois </strong><a href="/x">três</a></p>'
+        'texto solto<blockquote><p>citação</p><h3>Operação Tabela</h3></blockquote>'
+        '<ol><li>primeiro</li><li><em>segundo</em></li></ol>'
+        '<figure><img src="https://cbn.example/foto.jpg" alt="Fachada">'
+        '<figcaption>Sede  da empresa</figcaption></figure><hr>'
+    )
+
+    assert blocks == [
+        {'type': 'heading', 'level': 2, 'text': 'Operação Tabela', 'anchor': 'operacao-tabela'},
+        {'type': 'paragraph', 'html': 'um <strong> dois </strong><a href="/x">três</a>'},
+        {'type': 'paragraph', 'html': 'texto solto'},
+        {
+            'type': 'quote',
+            'children': [
+                {'type': 'paragraph', 'html': 'citação'},
+                {
+                    'type': 'heading',
+                    'level': 3,
+                    'text': 'Operação Tabela',
+                    'anchor': 'operacao-tabela-2',
+                },
+            ],
+        },
+        {'type': 'list', 'ordered': True, 'items': ['primeiro', '<em>segundo</em>']},
+        {
+            'type': 'image',
+            'src': 'https://cbn.example/foto.jpg',
+            'alt': 'Fachada',
+            'caption': 'Sede da empresa',
+            'media_id': None,
+        },
+        {'type': 'divider'},
+    ]
+
+
+def test_post_save_persists_blocks_with_media_references():
+    media = MediaFactory()
+    post = PostFactory(
+        content=(
+            f'<h2>Título</h2><p onclick="x()">texto</p><img src="{media.file.url}" alt="A">'
+            '<script>alert(1)</script>'
+        )
+    )
+
+    post.refresh_from_db()
+
+    assert post.content_blocks == [
+        {'type': 'heading', 'level': 2, 'text': 'Título', 'anchor': 'titulo'},
+        {'type': 'paragraph', 'html': 'texto'},
+        {'type': 'image', 'src': media.file.url, 'alt': 'A', 'caption': '', 'media_id': media.pk},
+    ]
+
+
+def test_unchanged_save_keeps_the_stored_blocks():
+    post = PostFactory(content='<p>texto</p>')
+    Post.objects.filter(pk=post.pk).update(content_blocks=[{'type': 'divider'}])
+
+    post = Post.objects.get(pk=post.pk)
+    post.save()
+
+    post.refresh_from_db()
+    assert post.content_blocks == [{'type': 'divider'}]
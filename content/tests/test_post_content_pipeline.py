@@ -1,11 +1,23 @@
+import html
+from dataclasses import replace
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from accounts.models import Author
 from content.models import Post, PostStatus
+from content.services.html_policy import DEFAULT_HTML_SANITIZATION_POLICY
 from content.services.html_sanitizer import BleachHtmlSanitizer
 from content.services.plain_text_extractor import HtmlPlainTextExtractor
-from content.services.post_content_pipeline import PostContentPipeline
+from content.services.post_content_pipeline import (
+    PIPELINE_SINGLE_PASS,
+    PIPELINE_STAGED,
+    PostContentPipeline,
+    SinglePassPostContentPipeline,
+    build_post_content_pipeline,
+    fingerprint_content,
+)
 from content.services.reading_time_calculator import WordCountReadingTimeCalculator
 
 
@@ -159,3 +171,140 @@ def test_post_partial_save_with_content_runs_pipeline_and_persists_reading_time(
     assert pipeline_called is True
     assert post.content == '<p>conteudo sanitizado</p>'
     assert post.reading_time == 5
+
+
+ARTICLE_HTML = (
+    '<h2>Operação</h2>'
+    '<p onclick="track()">O <strong>esquema</strong> envolvia '
+    '<a href="https://cbn.example/doc?id=1&amp;v=2" target="_blank" rel="noopener">contratos</a> '
+    'de R$ 10 milhões &mdash; segundo a <em>PF</em>.</p>\n'
+    '<div class="embed"><p>Trecho colado de outro site.</p></div>'
+    '<figure><img src="https://cbn.example/foto.jpg" alt="Fachada" onerror="x()">'
+    '<figcaption>Sede da empresa</figcaption></figure>'
+    '<ul><li>um</li><li>dois</li></ul>'
+    '<script>alert("xss")</script><style>p { color: red }</style>'
+    '<a href="javascript:alert(1)">link</a><!-- rascunho -->'
+)
+
+
+def _staged_pipeline() -> PostContentPipeline:
+    return build_post_content_pipeline(PIPELINE_STAGED)
+
+
+def _single_pass_pipeline() -> SinglePassPostContentPipeline:
+    return build_post_content_pipeline(PIPELINE_SINGLE_PASS)
+
+
+def test_single_pass_pipeline_matches_the_staged_pipeline():
+    staged = _staged_pipeline().process(ARTICLE_HTML)
+    single_pass = _single_pass_pipeline().process(ARTICLE_HTML)
+
+    assert single_pass.plain_text == staged.plain_text
+    assert single_pass.reading_time == staged.reading_time
+    assert single_pass.excerpt == staged.excerpt
+    # Mesma marcação; só a grafia das entidades pode mudar (&mdash; vira —).
+    assert html.unescape(single_pass.sanitized_html) == html.unescape(staged.sanitized_html)
+
+
+def test_single_pass_pipeline_removes_malicious_payloads():
+    processed = _single_pass_pipeline().process(
+        '<p onclick="alert(1)">texto</p><script>alert("xss")</script>'
+        '<a href="javascript:alert(1)">link</a><img src="x" onerror="alert(1)">'
+        '<p>a &lt;script&gt; b<style>p{}</style>'
+    )
+
+    assert processed.sanitized_html == (
+        '<p>texto</p><a>link</a><img src="x"><p>a &lt;script&gt; b</p>'
+    )
+    assert processed.plain_text == 'texto link a <script> b'
+
+
+def test_post_save_uses_the_configured_pipeline(settings):
+    settings.POST_CONTENT_PIPELINE = PIPELINE_SINGLE_PASS
+    user = User.objects.create_user(username='post-single-pass', password='secret')
+    author = Author.objects.create(user=user, name='Autor Single Pass')
+
+    post = Post.objects.create(
+        title='Post rápido',
+        slug='post-rapido',
+        content='<p>texto <em>inicial</em></p><script>alert(1)</script>',
+        author=author,
+        status=PostStatus.DRAFT,
+    )
+
+    assert post.content == '<p>texto <em>inicial</em></p>'
+    assert post.plain_text == 'texto inicial'
+    assert post.reading_time == 1
+
+
+def _create_post(slug: str, content: str) -> Post:
+    user = User.objects.create_user(username=slug, password='secret')
+    author = Author.objects.create(user=user, name=f'Autor {slug}')
+    return Post.objects.create(
+        title='Post', slug=slug, content=content, author=author, status=PostStatus.DRAFT
+    )
+
+
+def test_saving_unchanged_content_skips_the_pipeline(monkeypatch):
+    post = _create_post('post-fingerprint', '<p>texto <em>inicial</em></p><script>x()</script>')
+    assert post.content_fingerprint == fingerprint_content('<p>texto <em>inicial</em></p>')
+
+    calls = []
+    process_content = Post._process_content
+    monkeypatch.setattr(
+        Post, '_process_content', lambda instance: calls.append(1) or process_content(instance)
+    )
+
+    post = Post.objects.get(pk=post.pk)
+    post.title = 'Outro título'
+    post.save()
+    post.save(update_fields=['content'])
+    assert calls == []
+
+    post.content += '<p>mais</p>'
+    post.save()
+    assert calls == [1]
+    assert post.plain_text == 'texto inicial mais'
+
+
+def test_new_sanitization_policy_version_reprocesses_on_save():
+    post = _create_post('post-policy-version', '<p>texto</p>')
+    old_policy = replace(DEFAULT_HTML_SANITIZATION_POLICY, version='0')
+    Post.objects.filter(pk=post.pk).update(
+        content='<p onclick="x()">texto</p>',
+        content_fingerprint=fingerprint_content('<p onclick="x()">texto</p>', old_policy),
+    )
+
+    post = Post.objects.get(pk=post.pk)
+    post.save()
+
+    assert post.content == '<p>texto</p>'
+    assert post.content_fingerprint == fingerprint_content('<p>texto</p>')
+
+
+@pytest.mark.parametrize('mode', [PIPELINE_STAGED, PIPELINE_SINGLE_PASS])
+def test_block_memo_only_reprocesses_changed_blocks(monkeypatch, mode):
+    cache.clear()
+    updates = [f'\n<p>Atualização {i}: <strong>fato</strong> novo.</p>' for i in range(10)]
+    raw_html = ARTICLE_HTML + ''.join(updates)
+    edited_update = updates[3].replace('fato', 'fato corrigido')
+    edited_html = raw_html.replace(updates[3], edited_update)
+    expected = build_post_content_pipeline(mode).process(raw_html)
+    expected_edited = build_post_content_pipeline(mode).process(edited_html)
+    memo = build_post_content_pipeline(mode, block_memo_min_chars=1)
+
+    inner = build_post_content_pipeline(mode)
+    processed_blocks = []
+    process = type(inner).process
+    monkeypatch.setattr(
+        type(inner),
+        'process',
+        lambda pipeline, block: processed_blocks.append(block) or process(pipeline, block),
+    )
+
+    assert memo.process(raw_html) == expected
+    assert len(processed_blocks) > len(updates)
+
+    processed_blocks.clear()
+    assert memo.process(edited_html) == expected_edited
+    assert processed_blocks == [edited_update]
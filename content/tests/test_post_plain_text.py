@@ -0,0 +1,39 @@
+import pytest
+from django.core.management import call_command
+
+from content.models import Post
+from content.services.plain_text_extractor import build_excerpt
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_build_excerpt_cuts_on_word_boundary():
+    text = 'palavra ' * 100
+
+    excerpt = build_excerpt(text, max_length=30)
+
+    assert excerpt == 'palavra palavra palavra…'
+    assert build_excerpt('curto', max_length=30) == 'curto'
+
+
+def test_post_save_persists_plain_text_and_excerpt():
+    post = PostFactory(content='<h2>Titulo</h2><p>um <strong>dois</strong> tres</p>')
+
+    post.refresh_from_db()
+
+    assert post.plain_text == 'Titulo um dois tres'
+    assert post.excerpt == 'Titulo um dois tres'
+
+
+def test_backfill_command_fills_plain_text_without_touching_content():
+    post = PostFactory(content='<p>texto legado</p>')
+    Post.objects.filter(pk=post.pk).update(plain_text='', excerpt='')
+
+    call_command('backfill_post_plain_text', '--only-missing')
+
+    post.refresh_from_db()
+    assert post.plain_text == 'texto legado'
+    assert post.excerpt == 'texto legado'
+    assert post.content == '<p>texto legado</p>'
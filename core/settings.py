@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third party apps
     'rest_framework',
     'django_filters',
@@ -56,6 +57,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Arquivos estáticos
     'corsheaders.middleware.CorsMiddleware',  # CORS vem antes de tudo possível
+    'navigation.middleware.LegacyRedirectMiddleware',  # Redirects legados, antes do roteamento
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -130,6 +132,31 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Sitemaps e feeds (homeNews.sitemaps / homeNews.feeds)
+SITE_URL = os.getenv('SITE_URL', 'http://localhost:3000').rstrip('/')
+SITE_NAME = os.getenv('SITE_NAME', 'CBN - Corrupção Brasileira News')
+SITEMAP_ROOT = Path(os.getenv('SITEMAP_ROOT', BASE_DIR / 'sitemaps'))
+# Marca os sitemaps afetados a cada save; o worker `build_sitemaps --watch` regrava.
+SITEMAP_AUTO_REGENERATE = os.getenv('SITEMAP_AUTO_REGENERATE', 'True') == 'True'
+# True regrava no on_commit do próprio request (sem o worker).
+SITEMAP_REGENERATE_ON_COMMIT = os.getenv('SITEMAP_REGENERATE_ON_COMMIT', 'False') == 'True'
+
+# Snapshot da home (homeNews.home_snapshot)
+# URL base das mídias no payload montado fora de um request.
+API_BASE_URL = os.getenv('API_BASE_URL', 'http://localhost:8000').rstrip('/')
+# False (padrão): o request do editor só marca a home como desatualizada e o worker
+# `build_home_snapshot --watch` remonta. True remonta no on_commit do próprio request.
+HOME_SNAPSHOT_REBUILD_ON_COMMIT = os.getenv('HOME_SNAPSHOT_REBUILD_ON_COMMIT', 'False') == 'True'
+# False: cada versão nova fica em rascunho até um editor publicar pelo painel.
+HOME_SNAPSHOT_AUTO_PUBLISH = os.getenv('HOME_SNAPSHOT_AUTO_PUBLISH', 'True') == 'True'
+# Processamento do HTML dos posts ao salvar: 'staged' (bleach, depois extração de
+# texto e contagem de palavras) ou 'single_pass' (uma tokenização só, bem mais rápido).
+POST_CONTENT_PIPELINE = os.getenv('POST_CONTENT_PIPELINE', 'staged')
+# Matérias a partir deste tamanho (em caracteres) são processadas por bloco de topo,
+# com cada bloco guardado no cache: só os parágrafos editados passam de novo pelo
+# sanitizador. 0 desliga.
+POST_CONTENT_BLOCK_MEMO_MIN_CHARS = int(os.getenv('POST_CONTENT_BLOCK_MEMO_MIN_CHARS', '20000'))
+
 
 # --- CONFIGURAÇÃO DE DOMÍNIO E CORS ---
 
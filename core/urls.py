@@ -4,6 +4,8 @@ from django.conf import settings
 from django.conf.urls.static import static
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from homeNews.views import sitemap_file
+
 urlpatterns = [
     # 1. Rota do Painel Administrativo (Django Admin)
     path('admin/', admin.site.urls),
@@ -25,4 +27,7 @@ urlpatterns = [
         'api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'
     ),
     path('api/schema/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    # 5. Sitemaps pré-gerados (homeNews.sitemaps)
+    path('sitemap.xml', sitemap_file, name='sitemap-index'),
+    path('sitemaps/<str:name>', sitemap_file, name='sitemap-file'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,7 +1,18 @@
 import type { NextConfig } from 'next';
 
+const internalApiUrl = process.env.INTERNAL_API_URL ?? 'http://api:8000';
+
 const nextConfig: NextConfig = {
   output: 'standalone',
+  async rewrites() {
+    // Sitemaps e feeds são gerados pela API (homeNews.sitemaps / homeNews.feeds)
+    // e servidos no domínio do site.
+    return [
+      { source: '/sitemap.xml', destination: `${internalApiUrl}/sitemap.xml` },
+      { source: '/sitemaps/:name', destination: `${internalApiUrl}/sitemaps/:name` },
+      { source: '/feeds/:path*', destination: `${internalApiUrl}/api/v1/feeds/:path*/` },
+    ];
+  },
   images: {
     remotePatterns: [
       {
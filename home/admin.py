@@ -10,8 +10,8 @@ class HomeSectionItemInline(admin.TabularInline):
 
 @admin.register(HomeSection)
 class HomeSectionAdmin(admin.ModelAdmin):
-    list_display = ('title', 'section_type', 'order', 'is_active')
-    list_filter = ('section_type', 'is_active')
+    list_display = ('title', 'section_type', 'source', 'order', 'is_active')
+    list_filter = ('section_type', 'source', 'is_active')
     search_fields = ('title',)
     inlines = [HomeSectionItemInline]
 
@@ -0,0 +1,60 @@
+# Generated by Django 6.0.3 on 2026-10-18 15:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('content', '0011_post_updated_idx'),
+        ('home', '0003_alter_homesection_options'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homesection',
+            name='cache_ttl',
+            field=models.PositiveIntegerField(default=300),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='category',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='home_sections',
+                to='content.category',
+            ),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='item_limit',
+            field=models.PositiveSmallIntegerField(default=6),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='source',
+            field=models.CharField(
+                choices=[
+                    ('MANUAL', 'Curadoria manual'),
+                    ('LATEST', 'Mais recentes'),
+                    ('CATEGORY', 'Mais recentes da categoria'),
+                    ('TAG', 'Mais recentes da tag'),
+                ],
+                default='MANUAL',
+                max_length=20,
+            ),
+        ),
+        migrations.AddField(
+            model_name='homesection',
+            name='tag',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='home_sections',
+                to='content.tag',
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 
 
@@ -9,6 +10,13 @@ class HomeSectionType(models.TextChoices):
     SIDEBAR = 'SIDEBAR', 'Barra lateral'
 
 
+class HomeSectionSource(models.TextChoices):
+    MANUAL = 'MANUAL', 'Curadoria manual'
+    LATEST = 'LATEST', 'Mais recentes'
+    CATEGORY = 'CATEGORY', 'Mais recentes da categoria'
+    TAG = 'TAG', 'Mais recentes da tag'
+
+
 class HomeSection(models.Model):
     class HomeSectionQuerySet(models.QuerySet):
         def active(self):
@@ -24,6 +32,28 @@ class HomeSection(models.Model):
     )
     order = models.IntegerField(null=False, blank=False)
     is_active = models.BooleanField(default=True)
+    # Seções por regra se preenchem sozinhas (home.services.section_rules);
+    # só as MANUAL usam HomeSectionItem.
+    source = models.CharField(
+        max_length=20, choices=HomeSectionSource.choices, default=HomeSectionSource.MANUAL
+    )
+    category = models.ForeignKey(
+        'content.Category',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='home_sections',
+    )
+    tag = models.ForeignKey(
+        'content.Tag',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='home_sections',
+    )
+    item_limit = models.PositiveSmallIntegerField(default=6)
+    # Validade da entrada de cache da seção, independente das demais.
+    cache_ttl = models.PositiveIntegerField(default=300)
 
     objects = HomeSectionQuerySet.as_manager()
 
@@ -35,6 +65,16 @@ class HomeSection(models.Model):
     def __str__(self):
         return self.title
 
+    @property
+    def is_rule_based(self) -> bool:
+        return self.source != HomeSectionSource.MANUAL
+
+    def clean(self):
+        if self.source == HomeSectionSource.CATEGORY and self.category_id is None:
+            raise ValidationError({'category': 'Informe a categoria da seção.'})
+        if self.source == HomeSectionSource.TAG and self.tag_id is None:
+            raise ValidationError({'tag': 'Informe a tag da seção.'})
+
 
 class HomeSectionItem(models.Model):
     section = models.ForeignKey(
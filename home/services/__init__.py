@@ -0,0 +1 @@
+"""Domain services for the home page layout."""
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from django.db.models import Prefetch, Q, QuerySet
+
+from content.models import Post
+from content.services.post_cards import (
+    POST_CARD_RELATED,
+    card_categories_prefetch,
+    post_card_fields,
+    post_cards,
+)
+from home.models import HomeSection, HomeSectionItem, HomeSectionSource
+
+
+def section_items_prefetches(lookup: str = 'items') -> list[Prefetch]:
+    """
+    Prefetch dos itens da curadoria com o card de cada post no mesmo lote: uma
+    query para itens, posts, autores, avatares e capas e uma para as categorias.
+    """
+    items = HomeSectionItem.objects.select_related(
+        'post', *(f'post__{name}' for name in POST_CARD_RELATED)
+    ).only('id', 'order', 'section', 'post', *post_card_fields(prefix='post__'))
+    return [
+        Prefetch(lookup, queryset=items),
+        card_categories_prefetch(f'{lookup}__post__categories'),
+    ]
+
+
+def rule_section_posts(section: HomeSection) -> QuerySet:
+    # Uma query por seção: LATEST anda no post_status_published_idx; CATEGORY e
+    # TAG entram pelo índice de category_id/tag_id da tabela de ligação.
+    # Categoria e tag são SET_NULL: apagadas, a seção fica vazia em vez de
+    # filtrar por NULL e listar os posts sem categoria/tag.
+    posts = Post.objects.published()
+    if section.source == HomeSectionSource.CATEGORY:
+        if section.category_id is None:
+            return Post.objects.none()
+        posts = posts.filter(categories=section.category_id)
+    elif section.source == HomeSectionSource.TAG:
+        if section.tag_id is None:
+            return Post.objects.none()
+        posts = posts.filter(tags=section.tag_id)
+    return post_cards(posts).order_by('-published_at', '-created_at')[: section.item_limit]
+
+
+def resolve_section_items(section: HomeSection) -> list[HomeSectionItem]:
+    """
+    Itens da seção: os ``HomeSectionItem`` da curadoria ou, nas seções por
+    regra, itens não salvos (``id=None``) montados a partir da query da regra.
+    """
+    if not section.is_rule_based:
+        return list(section.items.all())
+    return [
+        HomeSectionItem(section=section, post=post, order=order)
+        for order, post in enumerate(rule_section_posts(section), start=1)
+    ]
+
+
+def rule_sections_matching(category_ids=(), tag_ids=()) -> QuerySet:
+    """Seções por regra ativas cujo resultado pode mudar com posts dessas categorias/tags."""
+    return HomeSection.objects.active().filter(
+        Q(source=HomeSectionSource.LATEST)
+        | Q(source=HomeSectionSource.CATEGORY, category_id__in=list(category_ids))
+        | Q(source=HomeSectionSource.TAG, tag_id__in=list(tag_ids))
+    )
@@ -2,9 +2,20 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
+import time
+import uuid
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
 from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
 
+logger = logging.getLogger(__name__)
 
 CACHE_TTLS = {
     'posts_list': 60,
@@ -14,16 +25,87 @@ CACHE_TTLS = {
     'home': 120,
     'menus': 3600,
     'redirects': 3600,
+    'feeds': 300,
+    # Só o Cache-Control de /posts/<slug>/live/; as entradas têm cache próprio.
+    'live_blog': 5,
 }
 
+# Extra time an entry is kept after its TTL so it can still be served while a
+# single worker rebuilds it (stale-while-revalidate).
+CACHE_STALE_TTLS = {
+    'posts_list': 60,
+    'post_detail': 300,
+    'categories': 600,
+    'tags': 600,
+    'home': 120,
+    'menus': 600,
+    'redirects': 600,
+    'feeds': 300,
+}
+
+CACHE_FILL_LOCK_TIMEOUT = 10
+CACHE_FILL_WAIT_TIMEOUT = 2.0
+CACHE_FILL_POLL_INTERVAL = 0.05
+
+
+@dataclass(frozen=True)
+class RenderedPayload:
+    content: bytes
+    content_type: str
+    etag: str
+    last_modified: int | None = None
+
+
+@dataclass(frozen=True)
+class CacheFill:
+    payload: Any
+    dependencies: Iterable[str] = ()
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    payload: Any
+    fresh_until: float
+    dependencies: tuple[str, ...] = ()
+    built_at: int = 0
+
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
+
+
+def _generation_key(prefix: str) -> str:
+    return f'api-cache-generation:{prefix}'
+
+
+def _seed_generation(key: str) -> None:
+    # Seeded from the clock so a counter lost to eviction or a Redis restart
+    # never comes back at a value that older entries were written with.
+    cache.add(key, time.time_ns(), timeout=None)
+
+
+def get_generation(prefix: str) -> int:
+    key = _generation_key(prefix)
+    generation = cache.get(key)
+    if generation is None:
+        _seed_generation(key)
+        generation = cache.get(key)
+    return generation
+
 
 def build_cache_key(prefix: str, full_path: str) -> str:
     digest = hashlib.md5(full_path.encode('utf-8')).hexdigest()
-    return f'api-cache:{prefix}:{digest}'
+    return f'api-cache:{prefix}:{get_generation(prefix)}:{digest}'
+
 
+def compute_etag(raw: bytes) -> str:
+    return f'"{hashlib.md5(raw).hexdigest()}"'
 
-def set_cache_headers(response, max_age: int) -> None:
+
+def set_cache_headers(response, max_age: int, etag: str | None = None) -> None:
     response['Cache-Control'] = f'public, max-age={max_age}'
+    if etag is not None:
+        response['ETag'] = etag
+        return
     # Compute ETag from response.data (dict/list) rather than rendered content,
     # because DRF Response objects may not have an accepted_renderer yet when
     # returning cached data directly via Response(cached_dict).
@@ -32,13 +114,203 @@ def set_cache_headers(response, max_age: int) -> None:
         raw = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
     except (TypeError, ValueError):
         raw = str(data).encode('utf-8')
-    response['ETag'] = f'"{hashlib.md5(raw).hexdigest()}"'
+    response['ETag'] = compute_etag(raw)
+
+
+def render_payload(
+    data: Any,
+    renderer,
+    media_type: str,
+    renderer_context: dict,
+    last_modified: datetime | None = None,
+) -> RenderedPayload:
+    content = renderer.render(data, media_type, renderer_context)
+    if isinstance(content, str):
+        content = content.encode(renderer.charset or 'utf-8')
+    content_type = renderer.media_type
+    if renderer.charset is not None:
+        content_type = f'{content_type}; charset={renderer.charset}'
+    return RenderedPayload(
+        content=content,
+        content_type=content_type,
+        etag=compute_etag(content),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+
+
+def build_rendered_response(request, rendered: RenderedPayload, max_age: int) -> HttpResponse:
+    response = HttpResponse(rendered.content, content_type=rendered.content_type)
+    set_cache_headers(response, max_age, etag=rendered.etag)
+    if rendered.last_modified is not None:
+        response['Last-Modified'] = http_date(rendered.last_modified)
+    # Answers If-None-Match / If-Modified-Since with a 304 built from the
+    # cached metadata only.
+    return get_conditional_response(
+        request,
+        etag=rendered.etag,
+        last_modified=rendered.last_modified,
+        response=response,
+    )
+
+
+def _dependency_key(dependency: str) -> str:
+    return f'api-cache-dependency:{dependency}'
+
+
+def _dependencies_changed(entry: CacheEntry) -> bool:
+    if not entry.dependencies:
+        return False
+    changed_at = cache.get_many([_dependency_key(dep) for dep in entry.dependencies])
+    return any(stamp >= entry.built_at for stamp in changed_at.values())
+
+
+def _store_entry(key: str, result: Any, built_at: int, ttl: int, stale_ttl: int) -> Any:
+    payload, dependencies = result, ()
+    if isinstance(result, CacheFill):
+        payload, dependencies = result.payload, tuple(sorted(set(result.dependencies)))
+    entry = CacheEntry(
+        payload=payload,
+        fresh_until=time.time() + ttl,
+        dependencies=dependencies,
+        built_at=built_at,
+    )
+    cache.set(key, entry, timeout=ttl + stale_ttl)
+    return payload
+
+
+def _fill(key: str, builder: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+    # Taken before building so a dependency changed mid-build marks the new
+    # entry as outdated right away.
+    built_at = time.time_ns()
+    try:
+        result = builder()
+    except Http404:
+        # The object is gone (deleted or unpublished): stop serving it as stale.
+        cache.delete(key)
+        raise
+    return _store_entry(key, result, built_at, ttl, stale_ttl)
+
+
+def _release_lock(lock_key: str, token: str) -> None:
+    # Only drop the lock we own; if it expired and someone else took it over,
+    # deleting it would let a third worker start a concurrent rebuild.
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def get_or_build(
+    key: str,
+    builder: Callable[[], Any],
+    ttl: int,
+    stale_ttl: int = 0,
+    single_flight: bool = True,
+) -> Any:
+    """
+    Returns the cached payload for ``key`` or builds it with ``builder``.
+
+    ``builder`` may return a ``CacheFill`` to declare the surrogate keys the
+    payload depends on; the entry stops being fresh once any of them is passed
+    to ``invalidate_dependencies``.
+
+    With ``single_flight`` enabled only the worker holding the fill lock runs
+    ``builder``. The others serve the stale entry when there is one, or poll
+    briefly for the fresh value before falling back to building it themselves.
+    """
+    entry = cache.get(key)
+    if not isinstance(entry, CacheEntry):
+        entry = None
+    elif entry.is_fresh() and not _dependencies_changed(entry):
+        return entry.payload
+
+    if not single_flight:
+        return _fill(key, builder, ttl, stale_ttl)
+
+    lock_key = f'{key}:lock'
+    token = uuid.uuid4().hex
+    if cache.add(lock_key, token, timeout=CACHE_FILL_LOCK_TIMEOUT):
+        try:
+            return _fill(key, builder, ttl, stale_ttl)
+        finally:
+            _release_lock(lock_key, token)
+
+    if entry is not None:
+        return entry.payload
+
+    deadline = time.monotonic() + CACHE_FILL_WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(CACHE_FILL_POLL_INTERVAL)
+        entry = cache.get(key)
+        if isinstance(entry, CacheEntry):
+            return entry.payload
+
+    # The lock holder is taking too long (or died); answer this request
+    # without touching the entry it is about to write.
+    result = builder()
+    return result.payload if isinstance(result, CacheFill) else result
 
 
 def invalidate_prefixes(prefixes: list[str]) -> None:
+    # Bumping the generation orphans every key built for the prefix; the old
+    # entries are never read again and simply expire with their TTL.
     for prefix in prefixes:
-        pattern = f'*api-cache:{prefix}:*'
+        key = _generation_key(prefix)
         try:
-            cache.delete_pattern(pattern)
+            cache.incr(key)
+        except ValueError:
+            _seed_generation(key)
         except Exception:
-            cache.clear()
+            logger.exception('Failed to invalidate api cache prefix %s', prefix)
+
+
+def invalidate_dependencies(dependencies: Iterable[str]) -> None:
+    # Entries built before this instant that depend on any of the surrogate
+    # keys stop being fresh; everything else stays cached.
+    changed_at = time.time_ns()
+    try:
+        cache.set_many({_dependency_key(dep): changed_at for dep in dependencies}, timeout=None)
+    except Exception:
+        logger.exception('Failed to invalidate api cache dependencies')
+
+
+def post_dependency(post_id) -> str:
+    return f'post:{post_id}'
+
+
+def category_dependency(category_id) -> str:
+    return f'category:{category_id}'
+
+
+def tag_dependency(tag_id) -> str:
+    return f'tag:{tag_id}'
+
+
+def author_dependency(author_id) -> str:
+    return f'author:{author_id}'
+
+
+def home_section_dependency(section_id) -> str:
+    return f'home-section:{section_id}'
+
+
+# Listas "mais recentes" (geral, por categoria, por tag): mudam quando um post
+# entra, sai ou muda de posição nelas, não quando um post só é editado.
+def latest_posts_dependency() -> str:
+    return 'posts:latest'
+
+
+def category_posts_dependency(category_id) -> str:
+    return f'posts:category:{category_id}'
+
+
+def tag_posts_dependency(tag_id) -> str:
+    return f'posts:tag:{tag_id}'
+
+
+def post_payload_dependencies(post_data) -> list[str]:
+    """Surrogate keys de um post serializado (card ou detalhe) e do que ele embute."""
+    dependencies = [post_dependency(post_data['id'])]
+    if post_data.get('author'):
+        dependencies.append(author_dependency(post_data['author']['id']))
+    dependencies.extend(category_dependency(item['id']) for item in post_data.get('categories', []))
+    dependencies.extend(tag_dependency(item['id']) for item in post_data.get('tags', []))
+    return dependencies
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable, Iterator
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer
+
+EXPORT_CHUNK_SIZE = 500
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Só negocia ``application/x-ndjson`` (Accept ou ``?format=ndjson``); o corpo
+    é produzido pelas views de streaming, nunca por ``render``.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def _dumps(data) -> str:
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def iter_serialized(objects: Iterable, serializer_class, context: dict) -> Iterator[dict]:
+    for obj in objects:
+        yield serializer_class(obj, context=context).data
+
+
+def stream_ndjson(rows: Iterable[dict]) -> StreamingHttpResponse:
+    lines = (_dumps(row) + '\n' for row in rows)
+    return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+
+def stream_json_array(rows: Iterable[dict]) -> StreamingHttpResponse:
+    def chunks():
+        yield '['
+        for index, row in enumerate(rows):
+            yield (',\n' if index else '\n') + _dumps(row)
+        yield '\n]\n'
+
+    return StreamingHttpResponse(chunks(), content_type='application/json')
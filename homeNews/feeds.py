@@ -0,0 +1,145 @@
+"""
+Feeds RSS 2.0 e Atom do site inteiro, de cada categoria, tag e autor.
+
+Os itens saem do ``PostFeedSerializer`` (campos do card mais o resumo salvo).
+O feed renderizado fica no cache da API (prefixo ``feeds``) como
+``RenderedPayload``, com ETag e Last-Modified; ``homeNews.signals`` o invalida
+pelo prefixo quando a lista de posts muda e pelas surrogate keys de post,
+categoria, tag e autor quando um item é editado.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+
+from accounts.models import Author
+from content.models import Category, Post, Tag
+from content.services.post_cards import post_cards
+from homeNews.cache_utils import (
+    CacheFill,
+    RenderedPayload,
+    author_dependency,
+    category_dependency,
+    compute_etag,
+    post_payload_dependencies,
+    tag_dependency,
+)
+from homeNews.serializers import PostFeedSerializer
+from homeNews.sitemaps import category_url, post_url, tag_url
+
+FEED_MAX_ITEMS = 30
+FEED_GENERATORS = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+# Caminho público (rewrite /feeds/... do frontend) de cada escopo.
+FEED_SCOPE_PATHS = {
+    'site': '/feeds/',
+    'category': '/feeds/categories/{key}/',
+    'tag': '/feeds/tags/{key}/',
+    'author': '/feeds/authors/{key}/',
+}
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    title: str
+    link: str
+    description: str
+    posts: QuerySet
+    dependencies: tuple[str, ...] = ()
+
+
+def get_feed_source(scope: str, key=None) -> FeedSource:
+    posts = Post.objects.published()
+    site_url = f'{settings.SITE_URL}/'
+    if scope == 'site':
+        return FeedSource(
+            title=settings.SITE_NAME,
+            link=site_url,
+            description=f'Últimas notícias de {settings.SITE_NAME}.',
+            posts=posts,
+        )
+    if scope == 'category':
+        category = get_object_or_404(Category.objects.active(), slug=key)
+        return FeedSource(
+            title=f'{category.name} | {settings.SITE_NAME}',
+            link=category_url(category.slug),
+            description=f'Últimas notícias em {category.name}.',
+            posts=posts.filter(categories=category),
+            dependencies=(category_dependency(category.pk),),
+        )
+    if scope == 'tag':
+        tag = get_object_or_404(Tag, slug=key)
+        return FeedSource(
+            title=f'{tag.name} | {settings.SITE_NAME}',
+            link=tag_url(tag.slug) or site_url,
+            description=f'Últimas notícias sobre {tag.name}.',
+            posts=posts.filter(tags=tag),
+            dependencies=(tag_dependency(tag.pk),),
+        )
+    if scope == 'author':
+        author = get_object_or_404(Author, pk=key)
+        return FeedSource(
+            title=f'{author.name} | {settings.SITE_NAME}',
+            link=site_url,
+            description=f'Últimas notícias de {author.name}.',
+            posts=posts.filter(author=author),
+            dependencies=(author_dependency(author.pk),),
+        )
+    raise ValueError(f'Escopo de feed desconhecido: {scope}')
+
+
+def feed_url(scope: str, feed_format: str, key=None) -> str:
+    # Do SITE_URL, não do request: pelo rewrite do frontend o request chega com o
+    # host interno da API, e o feed em cache é o mesmo para todos os hosts.
+    return f'{settings.SITE_URL}{FEED_SCOPE_PATHS[scope].format(key=key)}{feed_format}'
+
+
+def build_feed(request, scope: str, feed_format: str, key=None) -> CacheFill:
+    """
+    Renderiza o feed e devolve um ``CacheFill`` com o ``RenderedPayload`` e as
+    surrogate keys de tudo o que aparece nele. Levanta ``Http404`` se a
+    categoria, tag ou autor não existir (ou a categoria estiver inativa).
+    """
+    source = get_feed_source(scope, key)
+    posts = post_cards(source.posts, extra_fields=('excerpt', 'updated_at')).order_by(
+        '-published_at', '-created_at'
+    )[:FEED_MAX_ITEMS]
+    items = PostFeedSerializer(posts, many=True, context={'request': request}).data
+
+    feed = FEED_GENERATORS[feed_format](
+        title=source.title,
+        link=source.link,
+        description=source.description,
+        language='pt-br',
+        feed_url=feed_url(scope, feed_format, key),
+    )
+    for item in items:
+        link = post_url(item['slug'])
+        feed.add_item(
+            title=item['title'],
+            link=link,
+            unique_id=link,
+            description=item['excerpt'] or item['subtitle'] or '',
+            author_name=item['author']['name'] if item['author'] else None,
+            pubdate=parse_datetime(item['published_at']) if item['published_at'] else None,
+            updateddate=parse_datetime(item['updated_at']),
+            categories=[category['name'] for category in item['categories']],
+        )
+
+    content = feed.writeString('utf-8').encode('utf-8')
+    last_modified = feed.latest_post_date() if items else None
+    rendered = RenderedPayload(
+        content=content,
+        content_type=feed.content_type,
+        etag=compute_etag(content),
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    dependencies = list(source.dependencies)
+    for item in items:
+        dependencies.extend(post_payload_dependencies(item))
+    return CacheFill(payload=rendered, dependencies=dependencies)
@@ -1,10 +1,15 @@
 import django_filters
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
 from content.models import Post
+from content.services.post_search import search_posts
 
 
 class PostFilter(django_filters.FilterSet):
     # Permite buscar parte do título (ex: ?title=eleicoes)
     # lookup_expr='icontains' significa: ignorar maiúsculas/minúsculas e buscar trechos
+    # (atendido pelo índice trigram post_title_upper_trgm_idx)
     title = django_filters.CharFilter(field_name='title', lookup_expr='icontains')
 
     # Permite filtrar pelo slug da categoria (ex: ?category=esportes)
@@ -14,9 +19,47 @@ class PostFilter(django_filters.FilterSet):
     # Permite filtrar pelo slug da tag (ex: ?tag=plantao)
     tag = django_filters.CharFilter(field_name='tags__slug')
 
-    # Permite filtrar pelo nome do autor (ex: ?author=lucas)
-    author = django_filters.CharFilter(field_name='author__name', lookup_expr='icontains')
+    # Permite filtrar pelo autor (ex: ?author=lucas ou ?author=<uuid do autor>)
+    # UUID usa o índice de author_id; nome usa o índice trigram de author.name
+    author = django_filters.CharFilter(method='filter_author')
 
     class Meta:
         model = Post
         fields = ['status', 'slug']
+
+    def filter_author(self, queryset, name, value):
+        return queryset.by_author(value)
+
+
+class PostFullTextSearchFilter(filters.BaseFilterBackend):
+    """
+    Busca textual via tsvector (português, sem acentos) ordenada por relevância.
+
+    Substitui o ``SearchFilter`` (ILIKE em ``content``) e anota ``search_rank`` e
+    ``search_headline`` (trechos com ``<mark>``) para o ``PostSearchResultSerializer``.
+    """
+
+    search_param = api_settings.SEARCH_PARAM
+
+    def get_search_term(self, request) -> str:
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        term = self.get_search_term(request)
+        if not term:
+            return queryset
+        queryset = search_posts(queryset, term)
+        if api_settings.ORDERING_PARAM in request.query_params:
+            return queryset
+        return queryset.order_by('-search_rank', '-published_at', '-created_at')
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Busca textual em título, subtítulo e conteúdo.',
+                'schema': {'type': 'string'},
+            }
+        ]
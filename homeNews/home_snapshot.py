@@ -0,0 +1,240 @@
+"""
+Snapshot versionado da home (``HomeSnapshot``).
+
+Mudanças em seções, itens ou posts que aparecem na home só agendam uma nova
+versão (``schedule_home_snapshot_rebuild``). Ela é montada pelo worker
+``build_home_snapshot --watch`` (ou no on_commit do próprio request, com
+``HOME_SNAPSHOT_REBUILD_ON_COMMIT``), nunca numa leitura de ``/home/``: o
+request público só lê os bytes da versão ``LIVE`` no cache.
+
+Com ``HOME_SNAPSHOT_AUTO_PUBLISH`` desligado a versão nova fica em rascunho
+até um editor conferir o preview e publicá-la pelo painel.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Min, prefetch_related_objects
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from home.models import HomeSection, HomeSectionSource
+from home.services.section_rules import section_items_prefetches
+from homeNews.cache_utils import (
+    CacheFill,
+    RenderedPayload,
+    build_cache_key,
+    category_posts_dependency,
+    compute_etag,
+    get_or_build,
+    home_section_dependency,
+    latest_posts_dependency,
+    post_payload_dependencies,
+    tag_posts_dependency,
+)
+from homeNews.models import HomeSnapshot, HomeSnapshotStatus
+from homeNews.serializers import HomeSectionSerializer
+
+logger = logging.getLogger(__name__)
+
+HOME_SNAPSHOT_CACHE_KEY = 'home-snapshot:live'
+HOME_SNAPSHOT_STALE_KEY = 'home-snapshot:stale-since'
+HOME_SNAPSHOT_LOCK_KEY = 'home-snapshot:rebuild-lock'
+HOME_SNAPSHOT_LOCK_TIMEOUT = 60
+# Versões fora do ar mantidas para preview e rollback.
+HOME_SNAPSHOT_KEEP = 20
+# Com escrita contínua, quantas versões seguidas um rebuild monta antes de parar.
+HOME_SNAPSHOT_MAX_PASSES = 3
+HOME_SECTION_CACHE_PREFIX = 'home-section'
+
+
+class _SnapshotRequest:
+    # Os serializers só usam o request para as URLs absolutas das mídias.
+    def build_absolute_uri(self, location=None):
+        return urljoin(f'{settings.API_BASE_URL}/', location or '')
+
+
+def home_sections_queryset():
+    return (
+        HomeSection.objects.active().prefetch_related(*section_items_prefetches()).order_by('order')
+    )
+
+
+def _section_dependencies(section: HomeSection, data) -> list[str]:
+    dependencies = [home_section_dependency(section.pk)]
+    if section.source == HomeSectionSource.LATEST:
+        dependencies.append(latest_posts_dependency())
+    elif section.source == HomeSectionSource.CATEGORY:
+        dependencies.append(category_posts_dependency(section.category_id))
+    elif section.source == HomeSectionSource.TAG:
+        dependencies.append(tag_posts_dependency(section.tag_id))
+    for item in data['items']:
+        dependencies.extend(post_payload_dependencies(item['post']))
+    return dependencies
+
+
+def _section_payload(section: HomeSection, context) -> dict:
+    # Cada seção tem a sua entrada e o seu TTL: um post novo em Esportes só
+    # remonta as seções que o mostram, e as demais vêm do cache.
+    def build():
+        if not section.is_rule_based:
+            prefetch_related_objects([section], *section_items_prefetches())
+        data = HomeSectionSerializer(section, context=context).data
+        return CacheFill(payload=data, dependencies=_section_dependencies(section, data))
+
+    return get_or_build(
+        build_cache_key(HOME_SECTION_CACHE_PREFIX, str(section.pk)),
+        build,
+        ttl=section.cache_ttl,
+        single_flight=False,
+    )
+
+
+def render_home_payload() -> bytes:
+    context = {'request': _SnapshotRequest()}
+    sections = HomeSection.objects.active().order_by('order')
+    return JSONRenderer().render([_section_payload(section, context) for section in sections])
+
+
+def build_home_snapshot() -> HomeSnapshot:
+    """Monta uma versão nova em rascunho a partir do estado atual do banco."""
+    built_at = timezone.now()
+    content = render_home_payload()
+    return HomeSnapshot.objects.create(
+        content=content, etag=compute_etag(content), built_at=built_at
+    )
+
+
+def render_home_snapshot(snapshot: HomeSnapshot) -> RenderedPayload:
+    return RenderedPayload(
+        content=bytes(snapshot.content),
+        content_type=JSONRenderer.media_type,
+        etag=snapshot.etag,
+        last_modified=int(snapshot.published_at.timestamp()) if snapshot.published_at else None,
+    )
+
+
+def publish_home_snapshot(snapshot: HomeSnapshot, user=None) -> HomeSnapshot:
+    """Coloca ``snapshot`` no ar (também serve de rollback para uma versão antiga)."""
+    with transaction.atomic():
+        HomeSnapshot.objects.filter(status=HomeSnapshotStatus.LIVE).exclude(pk=snapshot.pk).update(
+            status=HomeSnapshotStatus.RETIRED
+        )
+        snapshot.status = HomeSnapshotStatus.LIVE
+        snapshot.published_at = timezone.now()
+        snapshot.published_by = user
+        snapshot.save(update_fields=['status', 'published_at', 'published_by'])
+        rendered = render_home_snapshot(snapshot)
+        # Um único set: o leitor vê a versão antiga inteira ou a nova inteira.
+        transaction.on_commit(lambda: cache.set(HOME_SNAPSHOT_CACHE_KEY, rendered, timeout=None))
+    return snapshot
+
+
+def get_live_home_snapshot() -> RenderedPayload | None:
+    """
+    Bytes da versão no ar. Sem cache, lê a versão ``LIVE`` do banco (uma query,
+    sem montar nada); devolve ``None`` se nenhuma versão foi publicada ainda.
+    """
+    rendered = cache.get(HOME_SNAPSHOT_CACHE_KEY)
+    if isinstance(rendered, RenderedPayload):
+        return rendered
+    snapshot = HomeSnapshot.objects.filter(status=HomeSnapshotStatus.LIVE).first()
+    if snapshot is None:
+        return None
+    rendered = render_home_snapshot(snapshot)
+    # add, não set: não sobrescreve uma publicação que chegou enquanto líamos o banco.
+    cache.add(HOME_SNAPSHOT_CACHE_KEY, rendered, timeout=None)
+    return rendered
+
+
+def _prune_snapshots() -> None:
+    keep = list(HomeSnapshot.objects.values_list('id', flat=True)[:HOME_SNAPSHOT_KEEP])
+    HomeSnapshot.objects.exclude(status=HomeSnapshotStatus.LIVE).exclude(pk__in=keep).delete()
+
+
+def rebuild_home_snapshot(publish: bool | None = None) -> HomeSnapshot:
+    snapshot = build_home_snapshot()
+    if publish is None:
+        publish = settings.HOME_SNAPSHOT_AUTO_PUBLISH
+    if publish:
+        publish_home_snapshot(snapshot)
+    _prune_snapshots()
+    return snapshot
+
+
+def home_snapshot_is_stale() -> bool:
+    latest = HomeSnapshot.objects.values_list('built_at', flat=True).first()
+    if latest is None:
+        return True
+    changed_at = cache.get(HOME_SNAPSHOT_STALE_KEY)
+    if changed_at is not None and changed_at >= latest.timestamp():
+        return True
+    # Seções por regra também vencem pelo TTL (rede de segurança do worker).
+    shortest_ttl = (
+        HomeSection.objects.active()
+        .exclude(source=HomeSectionSource.MANUAL)
+        .aggregate(ttl=Min('cache_ttl'))['ttl']
+    )
+    return shortest_ttl is not None and timezone.now() >= latest + timedelta(seconds=shortest_ttl)
+
+
+def rebuild_home_snapshot_if_stale() -> HomeSnapshot | None:
+    """
+    Monta (e publica, conforme ``HOME_SNAPSHOT_AUTO_PUBLISH``) uma versão nova
+    se algo mudou desde a última. Só um processo monta por vez; quem não pega o
+    lock sai, e o dono repete enquanto chegarem mudanças durante a montagem.
+    """
+    token = uuid.uuid4().hex
+    if not cache.add(HOME_SNAPSHOT_LOCK_KEY, token, timeout=HOME_SNAPSHOT_LOCK_TIMEOUT):
+        return None
+    try:
+        snapshot = None
+        for _ in range(HOME_SNAPSHOT_MAX_PASSES):
+            if not home_snapshot_is_stale():
+                break
+            snapshot = rebuild_home_snapshot()
+        return snapshot
+    finally:
+        if cache.get(HOME_SNAPSHOT_LOCK_KEY) == token:
+            cache.delete(HOME_SNAPSHOT_LOCK_KEY)
+
+
+class _CommitHook:
+    """Callback de ``on_commit`` que marca a home como desatualizada e a remonta."""
+
+    def __init__(self):
+        self.done = False
+
+    def __call__(self):
+        # O mesmo hook é registrado por cada mudança da transação; só a primeira
+        # chamada faz o trabalho.
+        if self.done:
+            return
+        self.done = True
+        cache.set(HOME_SNAPSHOT_STALE_KEY, time.time(), timeout=None)
+        if not settings.HOME_SNAPSHOT_REBUILD_ON_COMMIT:
+            return
+        try:
+            rebuild_home_snapshot_if_stale()
+        except Exception:
+            logger.exception('Failed to rebuild home snapshot')
+
+
+def schedule_home_snapshot_rebuild() -> None:
+    # Marcado depois do COMMIT: o worker nunca monta a versão nova antes de a
+    # mudança estar visível para ele.
+    # Um hook pendente por conexão, registrado de novo a cada mudança: se o
+    # savepoint de um registro anterior sofrer rollback, o desta ainda roda.
+    connection = transaction.get_connection()
+    hook = getattr(connection, '_home_snapshot_hook', None)
+    if hook is None or hook.done:
+        hook = connection._home_snapshot_hook = _CommitHook()
+    transaction.on_commit(hook)
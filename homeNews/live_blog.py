@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+
+from content.models import LiveBlogEntry
+
+# Entradas devolvidas por chamada de /posts/<slug>/live/; com ``has_more`` o
+# cliente pede de novo a partir do ``after`` recebido.
+LIVE_BLOG_PAGE_SIZE = 100
+LIVE_BLOG_ENTRY_CACHE_PREFIX = 'live-entry'
+LIVE_BLOG_ENTRY_TTL = 60 * 60 * 24
+
+
+def live_entry_cache_key(entry_id: int) -> str:
+    return f'{LIVE_BLOG_ENTRY_CACHE_PREFIX}:{entry_id}'
+
+
+def serialize_live_entry(entry: LiveBlogEntry) -> dict:
+    return {
+        'id': entry.id,
+        'content': entry.content,
+        'created_at': entry.created_at.isoformat(),
+        'updated_at': entry.updated_at.isoformat(),
+    }
+
+
+def load_live_entries(post_id: int, after: int = 0) -> tuple[list[dict], bool]:
+    """
+    Entradas do post com id maior que ``after``, em ordem. Só os ids vêm do
+    banco a cada chamada; cada entrada serializada fica no cache com chave
+    própria, e só as que faltam são lidas (numa query) e gravadas.
+    """
+    ids = list(
+        LiveBlogEntry.objects.filter(post_id=post_id, id__gt=after)
+        .order_by('id')
+        .values_list('id', flat=True)[: LIVE_BLOG_PAGE_SIZE + 1]
+    )
+    has_more = len(ids) > LIVE_BLOG_PAGE_SIZE
+    ids = ids[:LIVE_BLOG_PAGE_SIZE]
+
+    keys = {entry_id: live_entry_cache_key(entry_id) for entry_id in ids}
+    cached = cache.get_many(keys.values())
+    missing = [entry_id for entry_id in ids if keys[entry_id] not in cached]
+    if missing:
+        built = {
+            keys[entry.id]: serialize_live_entry(entry)
+            for entry in LiveBlogEntry.objects.filter(id__in=missing)
+        }
+        cache.set_many(built, timeout=LIVE_BLOG_ENTRY_TTL)
+        cached.update(built)
+    return [cached[keys[entry_id]] for entry_id in ids if keys[entry_id] in cached], has_more
+
+
+def forget_live_entry(entry_id: int) -> None:
+    cache.delete(live_entry_cache_key(entry_id))
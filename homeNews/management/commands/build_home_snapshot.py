@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from homeNews.home_snapshot import rebuild_home_snapshot, rebuild_home_snapshot_if_stale
+
+
+class Command(BaseCommand):
+    help = 'Monta uma versão nova do snapshot da home (ou fica vigiando mudanças com --watch).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--draft',
+            action='store_true',
+            help='Não publica: a versão fica em rascunho para preview no painel.',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Worker: remonta sempre que houver mudança marcada '
+                '(use com HOME_SNAPSHOT_REBUILD_ON_COMMIT=False).'
+            ),
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Segundos entre as checagens do --watch (padrão: 2).',
+        )
+
+    def handle(self, *args, **options):
+        if not options['watch']:
+            snapshot = rebuild_home_snapshot(publish=False if options['draft'] else None)
+            self.stdout.write(self.style.SUCCESS(f'{snapshot} montada.'))
+            return
+
+        self.stdout.write(f'Vigiando mudanças da home a cada {options["interval"]}s...')
+        while True:
+            close_old_connections()
+            snapshot = rebuild_home_snapshot_if_stale()
+            if snapshot is not None:
+                self.stdout.write(f'{snapshot} montada.')
+            time.sleep(options['interval'])
@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from homeNews.sitemaps import (
+    rebuild_all_sitemaps,
+    refresh_stale_sitemaps,
+    sitemap_root,
+    write_news_sitemap,
+    write_sitemap_index,
+)
+
+
+class Command(BaseCommand):
+    help = 'Gera os sitemaps (shards de posts, páginas, Google News e índice) em SITEMAP_ROOT.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--news-only',
+            action='store_true',
+            help='Regrava só o sitemap de notícias e o índice (para o cron de janela de 48h).',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help=(
+                'Worker: regrava os shards marcados pelos saves '
+                '(use com SITEMAP_REGENERATE_ON_COMMIT=False).'
+            ),
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5.0,
+            help='Segundos entre as checagens do --watch (padrão: 5).',
+        )
+
+    def handle(self, *args, **options):
+        if options['watch']:
+            self._watch(options['interval'])
+            return
+        if options['news_only']:
+            write_news_sitemap()
+            write_sitemap_index()
+            self.stdout.write(self.style.SUCCESS('Sitemap de notícias atualizado.'))
+            return
+        shards = rebuild_all_sitemaps()
+        self.stdout.write(
+            self.style.SUCCESS(f'Sitemaps gerados em {sitemap_root()} ({shards} shards de posts).')
+        )
+
+    def _watch(self, interval: float) -> None:
+        self.stdout.write(f'Vigiando mudanças dos sitemaps a cada {interval}s...')
+        while True:
+            close_old_connections()
+            parts = refresh_stale_sitemaps()
+            if parts:
+                self.stdout.write(f'Sitemaps regravados: {", ".join(parts)}.')
+            time.sleep(interval)
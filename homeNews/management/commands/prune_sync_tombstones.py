@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from homeNews.models import SyncTombstone
+from homeNews.sync import SYNC_TOMBSTONE_RETENTION_DAYS
+
+
+class Command(BaseCommand):
+    help = 'Apaga registros de exclusão do sync mais antigos que a retenção.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = SyncTombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} registros de exclusão removidos.'))
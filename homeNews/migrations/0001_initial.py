@@ -0,0 +1,35 @@
+# Generated by Django 6.0.3 on 2026-10-18 16:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncTombstone',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('model_label', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=64)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Exclusões (sync)',
+                'db_table': 'sync_tombstone',
+                'indexes': [
+                    models.Index(
+                        fields=['model_label', 'deleted_at', 'id'], name='sync_tombstone_cursor_idx'
+                    )
+                ],
+            },
+        ),
+    ]
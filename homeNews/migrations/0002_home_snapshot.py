@@ -0,0 +1,64 @@
+# Generated by Django 6.0.3 on 2026-10-18 15:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('homeNews', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HomeSnapshot',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name='ID'
+                    ),
+                ),
+                ('content', models.BinaryField()),
+                ('etag', models.CharField(max_length=40)),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('DRAFT', 'Rascunho'),
+                            ('LIVE', 'No ar'),
+                            ('RETIRED', 'Substituído'),
+                        ],
+                        default='DRAFT',
+                        max_length=10,
+                    ),
+                ),
+                ('built_at', models.DateTimeField()),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                (
+                    'published_by',
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name='+',
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name_plural': 'Versões da Home',
+                'db_table': 'home_snapshot',
+                'ordering': ['-id'],
+                'constraints': [
+                    models.UniqueConstraint(
+                        condition=models.Q(('status', 'LIVE')),
+                        fields=('status',),
+                        name='unique_live_home_snapshot',
+                    )
+                ],
+            },
+        ),
+    ]
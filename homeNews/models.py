@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncTombstone(models.Model):
+    """
+    Registro de exclusão lido pelos endpoints ``/sync/`` da API pública, para
+    que clientes com cópia local removam o que sumiu desde o último token.
+    """
+
+    model_label = models.CharField(max_length=100, null=False, blank=False)
+    object_id = models.CharField(max_length=64, null=False, blank=False)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sync_tombstone'
+        indexes = [
+            models.Index(
+                fields=['model_label', 'deleted_at', 'id'], name='sync_tombstone_cursor_idx'
+            ),
+        ]
+        verbose_name_plural = 'Exclusões (sync)'
+
+    def __str__(self):
+        return f'{self.model_label}:{self.object_id}'
+
+
+class HomeSnapshotStatus(models.TextChoices):
+    DRAFT = 'DRAFT', 'Rascunho'
+    LIVE = 'LIVE', 'No ar'
+    RETIRED = 'RETIRED', 'Substituído'
+
+
+class HomeSnapshot(models.Model):
+    """
+    Payload completo de ``/home/`` materializado em uma versão (``id``).
+
+    Montado fora do caminho de leitura por ``homeNews.home_snapshot``; no máximo
+    uma versão fica ``LIVE`` e é servida do cache.
+    """
+
+    # JSON já renderizado: servido byte a byte (o jsonb não preserva a ordem das chaves).
+    content = models.BinaryField()
+    etag = models.CharField(max_length=40)
+    status = models.CharField(
+        max_length=10, choices=HomeSnapshotStatus.choices, default=HomeSnapshotStatus.DRAFT
+    )
+    # Início da montagem: mudanças marcadas depois disso exigem uma nova versão.
+    built_at = models.DateTimeField()
+    published_at = models.DateTimeField(null=True, blank=True)
+    published_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+    )
+
+    class Meta:
+        ordering = ['-id']
+        db_table = 'home_snapshot'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['status'],
+                condition=models.Q(status='LIVE'),
+                name='unique_live_home_snapshot',
+            ),
+        ]
+        verbose_name_plural = 'Versões da Home'
+
+    def __str__(self):
+        return f'Home v{self.pk} ({self.status})'
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class PostKeysetPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) sobre ``(published_at, created_at, id)``.
+
+    Cada página é um ``WHERE`` sobre a última linha vista seguido de ``LIMIT``,
+    sem ``COUNT(*)`` nem ``OFFSET``: o custo não cresce com a profundidade.
+    A ordem segue a do ``post_status_published_idx`` (``DESC NULLS FIRST``);
+    ``?ordering`` e a busca (ordenada por relevância) não combinam com o cursor.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Cursor inválido.'
+    incompatible_query_params = (api_settings.ORDERING_PARAM, api_settings.SEARCH_PARAM)
+    ordering = (
+        F('published_at').desc(nulls_first=True),
+        F('created_at').desc(),
+        F('id').desc(),
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        conflicting = [
+            param
+            for param in self.incompatible_query_params
+            if request.query_params.get(param, '').strip()
+        ]
+        if conflicting:
+            raise ValidationError(
+                {
+                    self.cursor_query_param: (
+                        'O cursor segue a ordem por data de publicação e não pode ser '
+                        f'combinado com {", ".join(conflicting)}; use ?page.'
+                    )
+                }
+            )
+        position = self.decode_cursor(request)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(*position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_position = None
+        if self.has_next:
+            last = page[-1]
+            self.next_position = (last.published_at, last.created_at, last.pk)
+        return page
+
+    @staticmethod
+    def _after(published_at, created_at, pk) -> Q:
+        same_published = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        if published_at is None:
+            # NULLs come first, so every dated post is still ahead of the cursor.
+            return (Q(published_at__isnull=True) & same_published) | Q(published_at__isnull=False)
+        return Q(published_at__lt=published_at) | (Q(published_at=published_at) & same_published)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            published_at, created_at, pk = json.loads(urlsafe_b64decode(padded))
+            parsed_published_at = parse_datetime(published_at) if published_at else None
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (BinasciiError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        # Um published_at ilegível não vira NULL (o início da ordem): é cursor inválido.
+        if created_at is None or (published_at and parsed_published_at is None):
+            raise NotFound(self.invalid_cursor_message)
+        published_at = parsed_published_at
+        return published_at, created_at, pk
+
+    def encode_cursor(self, position) -> str:
+        published_at, created_at, pk = position
+        raw = json.dumps(
+            [published_at.isoformat() if published_at else None, created_at.isoformat(), pk]
+        )
+        return urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor da paginação keyset (envie vazio para a primeira página).',
+                'schema': {'type': 'string'},
+            }
+        ]
+
+
+class PostFeedPagination(PageNumberPagination):
+    """
+    Mantém ``?page=N`` como padrão e troca para keyset quando ``?cursor`` é enviado.
+    """
+
+    keyset_pagination_class = PostKeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.keyset_pagination_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view=view)
+        return super().paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(
+            view
+        ) + self.keyset_pagination_class().get_schema_operation_parameters(view)
@@ -1,9 +1,12 @@
 from rest_framework import serializers
 from accounts.models import Author
 from content.models import Category, Post, Tag
+from content.services.content_blocks import attach_media_ids, build_content_blocks
 from home.models import HomeSection, HomeSectionItem
+from home.services.section_rules import resolve_section_items
 from media_app.models import Media
-from navigation.models import Menu, MenuItem, Redirect
+from navigation.models import Menu, Redirect
+from navigation.services.menu_tree import get_menu_tree
 
 # --- Blocos Básicos ---
 
@@ -65,15 +68,61 @@ class PostListSerializer(serializers.ModelSerializer):
         ]
 
 
+class PostFeedSerializer(PostListSerializer):
+    """
+    Item dos feeds RSS/Atom: o card mais o resumo salvo e updated_at
+    (``<updated>`` do Atom e Last-Modified do feed).
+    """
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['excerpt', 'updated_at']
+
+
+class PostExportSerializer(PostListSerializer):
+    """
+    Linha do export em streaming: o card mais tags, resumo e updated_at
+    (usado como ``updated_since`` na próxima carga incremental).
+    """
+
+    tags = TagSerializer(many=True, read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['tags', 'excerpt', 'updated_at']
+
+
+class PostSearchResultSerializer(PostListSerializer):
+    """
+    Card de resultado da busca: inclui relevância e trechos destacados com <mark>.
+    """
+
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
+
+    class Meta(PostListSerializer.Meta):
+        fields = PostListSerializer.Meta.fields + ['search_rank', 'search_headline']
+
+
+CONTENT_FORMAT_PARAM = 'content_format'
+CONTENT_FORMAT_BLOCKS = 'blocks'
+
+
+def wants_content_blocks(request) -> bool:
+    return bool(request) and request.query_params.get(CONTENT_FORMAT_PARAM) == CONTENT_FORMAT_BLOCKS
+
+
 class PostDetailSerializer(serializers.ModelSerializer):
     """
     Usado apenas quando o usuário clica na notícia. Traz TUDO.
+
+    Com ``?content_format=blocks`` o conteúdo vem como ``content_blocks`` (a
+    árvore de blocos gravada no save) no lugar do HTML em ``content``.
     """
 
     author = AuthorSerializer(read_only=True)
     categories = CategorySerializer(many=True, read_only=True)
     tags = TagSerializer(many=True, read_only=True)
     cover_image = MediaSerializer(read_only=True)
+    content_blocks = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -83,6 +132,7 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'subtitle',
             'slug',
             'content',
+            'content_blocks',
             'cover_image',
             'author',
             'categories',
@@ -93,6 +143,21 @@ class PostDetailSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        fields.pop(
+            'content' if wants_content_blocks(self.context.get('request')) else 'content_blocks'
+        )
+        return fields
+
+    def get_content_blocks(self, obj) -> list[dict[str, object]]:
+        if obj.content_blocks or not obj.content:
+            return obj.content_blocks
+        # Post salvo antes dos blocos (o audit_post_content --apply preenche).
+        blocks = build_content_blocks(obj.content)
+        attach_media_ids([blocks])
+        return blocks
+
 
 # --- Estrutura da Home ---
 
@@ -107,34 +172,26 @@ class HomeSectionItemSerializer(serializers.ModelSerializer):
 
 
 class HomeSectionSerializer(serializers.ModelSerializer):
-    # Trazemos os itens dessa seção
-    # O source='homesectionitem_set' pega o relacionamento reverso (ou related_name se tiver definido)
-    items = HomeSectionItemSerializer(many=True, read_only=True)
+    # Itens da curadoria (HomeSectionItem) ou, nas seções por regra, os posts
+    # que a regra devolve, no mesmo formato (com id nulo)
+    items = serializers.SerializerMethodField()
 
     class Meta:
         model = HomeSection
         fields = ['id', 'title', 'section_type', 'order', 'items']
 
+    def get_items(self, obj) -> list[dict[str, object]]:
+        return HomeSectionItemSerializer(
+            resolve_section_items(obj), many=True, context=self.context
+        ).data
 
-# --- Menus ---
-
-
-class MenuItemSerializer(serializers.ModelSerializer):
-    # Campo calculado para pegar os filhos (submenus)
-    children = serializers.SerializerMethodField()
-
-    class Meta:
-        model = MenuItem
-        fields = ['id', 'label', 'url', 'target', 'order', 'children']
 
-    def get_children(self, obj):
-        # Pega itens que têm este item como 'parent'
-        children = obj.children.filter(is_active=True).order_by('order')
-        return MenuItemSerializer(children, many=True).data
+# --- Menus ---
 
 
 class MenuSerializer(serializers.ModelSerializer):
-    # Pegamos apenas os itens "Raiz" (que não têm parent)
+    # Árvore completa de itens ativos, montada em memória a partir de uma
+    # única query (e guardada no cache por slug)
     items = serializers.SerializerMethodField()
 
     class Meta:
@@ -142,9 +199,8 @@ class MenuSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'slug', 'items']
 
     def get_items(self, obj) -> list[dict[str, object]]:
-        # Filtra apenas itens de primeiro nível (parent=None)
-        root_items = obj.menuitem_set.filter(parent__isnull=True, is_active=True).order_by('order')
-        return MenuItemSerializer(root_items, many=True).data
+        # Cada item: id, label, url, target, order e children (mesmo formato, recursivo)
+        return get_menu_tree(obj)
 
 
 class RedirectSerializer(serializers.ModelSerializer):
@@ -1,40 +1,283 @@
-from django.db.models.signals import post_delete, post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
-from content.models import Category, Post, Tag
+from accounts.models import Author
+from content.models import Category, LiveBlogEntry, Post, PostStatus, Tag
 from home.models import HomeSection, HomeSectionItem
+from home.services.section_rules import rule_sections_matching
 from navigation.models import Menu, MenuItem, Redirect
+from navigation.services.menu_tree import invalidate_menu_trees
+from navigation.services.redirect_matcher import bump_redirects_version
 
-from homeNews.cache_utils import invalidate_prefixes
+from homeNews.cache_utils import (
+    author_dependency,
+    category_dependency,
+    category_posts_dependency,
+    home_section_dependency,
+    invalidate_dependencies,
+    invalidate_prefixes,
+    latest_posts_dependency,
+    post_dependency,
+    tag_dependency,
+    tag_posts_dependency,
+)
+from homeNews.home_snapshot import schedule_home_snapshot_rebuild
+from homeNews.live_blog import forget_live_entry
+from homeNews.models import SyncTombstone
+from homeNews.sitemaps import mark_sitemaps_stale
 
 
-@receiver([post_save, post_delete], sender=Post)
-def invalidate_post_related_cache(**kwargs):
-    invalidate_prefixes(['posts-list', 'post-detail', 'home'])
+def _invalidate_after_commit(prefixes=(), dependencies=()) -> None:
+    """
+    Invalidates once the transaction commits. Stamped earlier, a concurrent read
+    could rebuild the entry from the old row after the stamp and keep it as fresh.
+    """
+    prefixes, dependencies = list(prefixes), list(dependencies)
+
+    def run():
+        if prefixes:
+            invalidate_prefixes(prefixes)
+        if dependencies:
+            invalidate_dependencies(dependencies)
+
+    transaction.on_commit(run)
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_public_state(sender, instance, **kwargs):
+    previous = None
+    if instance.pk is not None:
+        previous = Post.objects.filter(pk=instance.pk).values('status', 'published_at').first()
+    instance._cache_previous_state = previous
+
+
+def _was_public(instance) -> bool:
+    previous = getattr(instance, '_cache_previous_state', None)
+    return bool(previous and previous['status'] == PostStatus.PUBLISHED)
+
+
+@receiver(post_save, sender=Post)
+def invalidate_post_related_cache(sender, instance, created, **kwargs):
+    was_public = _was_public(instance)
+    is_public = instance.status == PostStatus.PUBLISHED
+    if not was_public and not is_public:
+        # Draft and archived edits never reach the public API.
+        return
+
+    # Detail, list pages and home payloads that embed this post.
+    _invalidate_after_commit(dependencies=[post_dependency(instance.pk)])
+    mark_sitemaps_stale(post_ids=[instance.pk])
+
+    previous = instance._cache_previous_state
+    membership_changed = (
+        created or was_public != is_public or previous['published_at'] != instance.published_at
+    )
+    if membership_changed:
+        # The post enters, leaves or moves within the feed: every page shifts.
+        _invalidate_after_commit(
+            prefixes=['posts-list', 'feeds'],
+            dependencies=_listing_dependencies(*_taxonomy_ids(instance)),
+        )
+
+
+def _taxonomy_ids(post) -> tuple[list, list]:
+    remembered = getattr(post, '_cache_taxonomy_ids', None)
+    if remembered is not None:
+        return remembered
+    return (
+        list(post.categories.values_list('id', flat=True)),
+        list(post.tags.values_list('id', flat=True)),
+    )
+
+
+def _listing_dependencies(category_ids=(), tag_ids=(), latest=True) -> list[str]:
+    # "Latest" lists (rule-based home sections) the post enters or leaves.
+    dependencies = [latest_posts_dependency()] if latest else []
+    dependencies.extend(category_posts_dependency(pk) for pk in category_ids)
+    dependencies.extend(tag_posts_dependency(pk) for pk in tag_ids)
+    return dependencies
+
+
+@receiver(pre_delete, sender=Post)
+def remember_post_taxonomy(sender, instance, **kwargs):
+    # The post-category/tag rows are gone by post_delete.
+    if instance.status == PostStatus.PUBLISHED:
+        instance._cache_taxonomy_ids = _taxonomy_ids(instance)
+
+
+@receiver(post_delete, sender=Post)
+def invalidate_deleted_post_cache(sender, instance, **kwargs):
+    if instance.status != PostStatus.PUBLISHED:
+        return
+    category_ids, tag_ids = _taxonomy_ids(instance)
+    _invalidate_after_commit(
+        prefixes=['posts-list', 'feeds'],
+        dependencies=[post_dependency(instance.pk)] + _listing_dependencies(category_ids, tag_ids),
+    )
+    mark_sitemaps_stale(post_ids=[instance.pk])
+    if rule_sections_matching(category_ids, tag_ids).exists():
+        schedule_home_snapshot_rebuild()
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_taxonomy_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    is_categories = sender is Post.categories.through
+    if action == 'pre_clear' and not reverse:
+        # post_clear has no pk_set: remember which categories/tags are removed.
+        related = instance.categories if is_categories else instance.tags
+        instance._cache_cleared_ids = set(related.values_list('id', flat=True))
+        return
+    if action not in {'post_add', 'post_remove', 'post_clear'}:
+        return
+    if reverse:
+        # The category/tag post list itself changed.
+        _invalidate_after_commit(
+            dependencies=_listing_dependencies(
+                category_ids=[instance.pk] if is_categories else (),
+                tag_ids=() if is_categories else [instance.pk],
+                latest=False,
+            )
+        )
+        if pk_set is None:
+            # Cleared from the category/tag side: the affected posts are unknown.
+            _invalidate_after_commit(prefixes=['posts-list', 'post-detail', 'home', 'feeds'])
+            return
+        _invalidate_after_commit(dependencies=[post_dependency(pk) for pk in pk_set])
+    else:
+        if instance.status != PostStatus.PUBLISHED:
+            return
+        changed = pk_set if pk_set is not None else getattr(instance, '_cache_cleared_ids', set())
+        _invalidate_after_commit(
+            dependencies=[post_dependency(instance.pk)]
+            + _listing_dependencies(
+                category_ids=changed if is_categories else (),
+                tag_ids=() if is_categories else changed,
+                latest=False,
+            )
+        )
+    # Category/tag filtered pages (and feeds) gain or lose the post.
+    _invalidate_after_commit(prefixes=['posts-list', 'feeds'])
 
 
 @receiver([post_save, post_delete], sender=Category)
-def invalidate_category_cache(**kwargs):
-    invalidate_prefixes(['categories'])
+def invalidate_category_cache(sender, instance, **kwargs):
+    _invalidate_after_commit(
+        prefixes=['categories'], dependencies=[category_dependency(instance.pk)]
+    )
+    mark_sitemaps_stale(pages=True)
 
 
 @receiver([post_save, post_delete], sender=Tag)
-def invalidate_tag_cache(**kwargs):
-    invalidate_prefixes(['tags'])
+def invalidate_tag_cache(sender, instance, **kwargs):
+    _invalidate_after_commit(prefixes=['tags'], dependencies=[tag_dependency(instance.pk)])
+    mark_sitemaps_stale(pages=True)
+
+
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_author_cache(sender, instance, **kwargs):
+    # Posts, home and feeds embed the author's name and avatar.
+    _invalidate_after_commit(dependencies=[author_dependency(instance.pk)])
+    if HomeSectionItem.objects.filter(post__author=instance).exists():
+        schedule_home_snapshot_rebuild()
+
+
+@receiver(post_delete, sender=LiveBlogEntry)
+def invalidate_live_blog_entry_cache(sender, instance, **kwargs):
+    # Entries are append-only; they only go away with their post (cascade).
+    forget_live_entry(instance.pk)
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Redirect)
+def record_sync_tombstone(sender, instance, **kwargs):
+    # Lido pelos endpoints /sync/ para propagar a exclusão às cópias locais.
+    SyncTombstone.objects.create(model_label=sender._meta.label_lower, object_id=str(instance.pk))
 
 
 @receiver([post_save, post_delete], sender=HomeSection)
 @receiver([post_save, post_delete], sender=HomeSectionItem)
-def invalidate_home_cache(**kwargs):
-    invalidate_prefixes(['home'])
+def invalidate_home_cache(sender, instance, **kwargs):
+    # Only this section's cache entry is rebuilt; the others are reused.
+    section_id = instance.pk if sender is HomeSection else instance.section_id
+    _invalidate_after_commit(prefixes=['home'], dependencies=[home_section_dependency(section_id)])
+    schedule_home_snapshot_rebuild()
+
+
+def _post_is_on_home(post) -> bool:
+    if HomeSectionItem.objects.filter(post_id=post.pk).exists():
+        return True
+    if post.status != PostStatus.PUBLISHED and not _was_public(post):
+        return False
+    return rule_sections_matching(*_taxonomy_ids(post)).exists()
+
+
+@receiver(post_save, sender=Post)
+def refresh_home_snapshot_for_post(sender, instance, **kwargs):
+    # Deleting a post cascades to its HomeSectionItem rows, handled above.
+    if _post_is_on_home(instance):
+        schedule_home_snapshot_rebuild()
+
+
+@receiver(m2m_changed, sender=Post.categories.through)
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_home_snapshot_for_post_taxonomy(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {'post_add', 'post_remove', 'post_clear'}:
+        return
+    if reverse:
+        # instance is the category/tag; pk_set the posts (None when cleared).
+        items = HomeSectionItem.objects.all()
+        if pk_set is not None:
+            items = items.filter(post_id__in=pk_set)
+        is_categories = sender is Post.categories.through
+        rules = rule_sections_matching(
+            category_ids=[instance.pk] if is_categories else (),
+            tag_ids=() if is_categories else [instance.pk],
+        )
+        if items.exists() or rules.exists():
+            schedule_home_snapshot_rebuild()
+    elif _post_is_on_home(instance):
+        schedule_home_snapshot_rebuild()
+
+
+@receiver([post_save, pre_delete], sender=Category)
+def refresh_home_snapshot_for_category(sender, instance, **kwargs):
+    # pre_delete: after the delete the post-category rows are already gone.
+    shown = HomeSectionItem.objects.filter(post__categories=instance).exists()
+    if shown or rule_sections_matching(category_ids=[instance.pk]).exists():
+        schedule_home_snapshot_rebuild()
+
+
+@receiver(pre_save, sender=MenuItem)
+def remember_menu_item_menu(sender, instance, **kwargs):
+    previous = None
+    if instance.pk is not None:
+        previous = MenuItem.objects.filter(pk=instance.pk).values_list('menu_id', flat=True).first()
+    instance._cache_previous_menu_id = previous
 
 
 @receiver([post_save, post_delete], sender=Menu)
+def invalidate_menu_cache(sender, instance, **kwargs):
+    _invalidate_after_commit(prefixes=['menus'])
+    # Depois do commit: antes dele, uma leitura concorrente regravaria a árvore antiga.
+    slug = instance.slug
+    transaction.on_commit(lambda: invalidate_menu_trees([slug]))
+
+
 @receiver([post_save, post_delete], sender=MenuItem)
-def invalidate_menu_cache(**kwargs):
-    invalidate_prefixes(['menus'])
+def invalidate_menu_item_cache(sender, instance, **kwargs):
+    _invalidate_after_commit(prefixes=['menus'])
+    # Um item movido de menu altera a árvore dos dois.
+    menu_ids = {instance.menu_id, getattr(instance, '_cache_previous_menu_id', None)} - {None}
+    slugs = list(Menu.objects.filter(pk__in=menu_ids).values_list('slug', flat=True))
+    transaction.on_commit(lambda: invalidate_menu_trees(slugs))
 
 
 @receiver([post_save, post_delete], sender=Redirect)
 def invalidate_redirect_cache(**kwargs):
-    invalidate_prefixes(['redirects'])
+    _invalidate_after_commit(prefixes=['redirects'])
+    # Os workers recompilam o matcher do middleware na próxima checagem de versão;
+    # só depois do commit, senão um worker recompilaria lendo o estado antigo.
+    transaction.on_commit(bump_redirects_version)
@@ -0,0 +1,328 @@
+"""
+Sitemaps pré-gerados em disco (``SITEMAP_ROOT``).
+
+- ``sitemap-posts-N.xml.gz``: posts publicados com ``id`` em ``[N * 50k, (N + 1) * 50k)``.
+  O shard de um post nunca muda, então salvar um post regrava só o arquivo dele.
+- ``sitemap-pages.xml.gz``: home e categorias ativas (e tags, se houver ``SITEMAP_TAG_PATH``).
+- ``sitemap-news.xml.gz``: Google News, posts das últimas 48h (máx. 1000).
+- ``sitemap.xml``: índice apontando para todos os arquivos acima.
+
+Salvar um post ou uma categoria/tag só marca as partes afetadas depois do
+COMMIT (``mark_sitemaps_stale``); o worker ``build_sitemaps --watch`` (ou o
+on_commit do próprio request, com ``SITEMAP_REGENERATE_ON_COMMIT``) regrava.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import re
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from content.models import Category, Post, Tag
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_SHARD_SIZE = 50_000
+SITEMAP_NEWS_WINDOW = timedelta(hours=48)
+SITEMAP_NEWS_MAX_URLS = 1000
+SITEMAP_INDEX_NAME = 'sitemap.xml'
+SITEMAP_PAGES_NAME = 'sitemap-pages.xml.gz'
+SITEMAP_NEWS_NAME = 'sitemap-news.xml.gz'
+SITEMAP_FILES_URL = '/sitemaps/'
+
+SITEMAP_PAGES_PART = 'pages'
+SITEMAP_LOCK_KEY = 'sitemap:rebuild-lock'
+SITEMAP_LOCK_TIMEOUT = 300
+
+_SHARD_NAME_RE = re.compile(r'^sitemap-posts-(\d+)\.xml\.gz$')
+SITEMAP_FILE_RE = re.compile(r'^sitemap(?:-posts-\d+|-pages|-news)?\.xml(?:\.gz)?$')
+_URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_NEWS_URLSET_OPEN = (
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    ' xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">\n'
+)
+
+
+def sitemap_root() -> Path:
+    return Path(settings.SITEMAP_ROOT)
+
+
+def shard_name(shard: int) -> str:
+    return f'sitemap-posts-{shard}.xml.gz'
+
+
+def shard_for_post(post_id: int) -> int:
+    return post_id // SITEMAP_SHARD_SIZE
+
+
+def _post_part(shard: int) -> str:
+    return f'posts-{shard}'
+
+
+def _stale_key(part: str) -> str:
+    return f'sitemap:stale:{part}'
+
+
+def _built_key(part: str) -> str:
+    return f'sitemap:built:{part}'
+
+
+def _site_url(path: str) -> str:
+    return f'{settings.SITE_URL}{path}'
+
+
+def post_url(slug: str) -> str:
+    return _site_url(f'/{slug}')
+
+
+def category_url(slug: str) -> str:
+    return _site_url(f'/categoria/{slug}')
+
+
+def tag_url(slug: str) -> str | None:
+    # O frontend ainda não tem página de tag; só existe quando configurado.
+    tag_path = getattr(settings, 'SITEMAP_TAG_PATH', None)
+    return _site_url(tag_path.format(slug=slug)) if tag_path else None
+
+
+def _url_entry(loc: str, lastmod: datetime | None = None) -> str:
+    entry = f'<url><loc>{escape(loc)}</loc>'
+    if lastmod is not None:
+        entry += f'<lastmod>{lastmod.isoformat()}</lastmod>'
+    return entry + '</url>\n'
+
+
+def _write_atomic(name: str, chunks, compress: bool = True) -> Path:
+    # Escreve num temporário e troca com os.replace: quem estiver lendo o
+    # arquivo (view ou nginx) nunca vê um sitemap pela metade.
+    root = sitemap_root()
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=root, prefix=f'.{name}.')
+    try:
+        with os.fdopen(fd, 'wb') as raw:
+            if compress:
+                with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as handle:
+                    for chunk in chunks:
+                        handle.write(chunk.encode('utf-8'))
+            else:
+                for chunk in chunks:
+                    raw.write(chunk.encode('utf-8'))
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, root / name)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+    return root / name
+
+
+def write_post_shard(shard: int) -> Path | None:
+    start = shard * SITEMAP_SHARD_SIZE
+    rows = (
+        Post.objects.published()
+        .filter(id__gte=start, id__lt=start + SITEMAP_SHARD_SIZE)
+        .order_by('id')
+        .values_list('slug', 'updated_at')
+    )
+    if not rows.exists():
+        (sitemap_root() / shard_name(shard)).unlink(missing_ok=True)
+        return None
+
+    def chunks():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield _URLSET_OPEN
+        for slug, updated_at in rows.iterator(chunk_size=5000):
+            yield _url_entry(post_url(slug), updated_at)
+        yield '</urlset>\n'
+
+    return _write_atomic(shard_name(shard), chunks())
+
+
+def write_pages_sitemap() -> Path:
+    def chunks():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield _URLSET_OPEN
+        yield _url_entry(_site_url('/'))
+        for slug, updated_at in (
+            Category.objects.active().order_by('id').values_list('slug', 'updated_at')
+        ):
+            yield _url_entry(category_url(slug), updated_at)
+        if getattr(settings, 'SITEMAP_TAG_PATH', None):
+            for slug, updated_at in Tag.objects.order_by('id').values_list('slug', 'updated_at'):
+                yield _url_entry(tag_url(slug), updated_at)
+        yield '</urlset>\n'
+
+    return _write_atomic(SITEMAP_PAGES_NAME, chunks())
+
+
+def write_news_sitemap() -> Path:
+    since = timezone.now() - SITEMAP_NEWS_WINDOW
+    rows = (
+        Post.objects.published()
+        .filter(published_at__gte=since)
+        .order_by('-published_at', '-id')
+        .values_list('slug', 'title', 'published_at')[:SITEMAP_NEWS_MAX_URLS]
+    )
+    publication = escape(getattr(settings, 'SITEMAP_NEWS_PUBLICATION_NAME', 'CBN'))
+
+    def chunks():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield _NEWS_URLSET_OPEN
+        for slug, title, published_at in rows:
+            yield (
+                f'<url><loc>{escape(post_url(slug))}</loc><news:news>'
+                f'<news:publication><news:name>{publication}</news:name>'
+                '<news:language>pt</news:language></news:publication>'
+                f'<news:publication_date>{published_at.isoformat()}</news:publication_date>'
+                f'<news:title>{escape(title)}</news:title>'
+                '</news:news></url>\n'
+            )
+        yield '</urlset>\n'
+
+    return _write_atomic(SITEMAP_NEWS_NAME, chunks())
+
+
+def write_sitemap_index() -> Path:
+    root = sitemap_root()
+    names = [SITEMAP_PAGES_NAME, SITEMAP_NEWS_NAME]
+    shards = sorted(
+        int(match.group(1))
+        for match in (_SHARD_NAME_RE.match(path.name) for path in root.glob('sitemap-posts-*'))
+        if match
+    )
+    names.extend(shard_name(shard) for shard in shards)
+
+    def chunks():
+        yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+        yield '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+        for name in names:
+            path = root / name
+            if not path.exists():
+                continue
+            lastmod = datetime.fromtimestamp(
+                path.stat().st_mtime, tz=timezone.get_current_timezone()
+            )
+            yield (
+                f'<sitemap><loc>{escape(_site_url(SITEMAP_FILES_URL + name))}</loc>'
+                f'<lastmod>{lastmod.isoformat()}</lastmod></sitemap>\n'
+            )
+        yield '</sitemapindex>\n'
+
+    return _write_atomic(SITEMAP_INDEX_NAME, chunks(), compress=False)
+
+
+def rebuild_all_sitemaps() -> int:
+    """Regrava tudo (deploy/cron). Retorna quantos shards de posts foram escritos."""
+    root = sitemap_root()
+    last_id = Post.objects.published().order_by('-id').values_list('id', flat=True).first()
+    wanted = range(shard_for_post(last_id) + 1) if last_id is not None else range(0)
+    written = sum(1 for shard in wanted if write_post_shard(shard) is not None)
+    for path in root.glob('sitemap-posts-*'):
+        match = _SHARD_NAME_RE.match(path.name)
+        if match and int(match.group(1)) not in wanted:
+            path.unlink(missing_ok=True)
+    write_pages_sitemap()
+    write_news_sitemap()
+    write_sitemap_index()
+    return written
+
+
+class _CommitHook:
+    """Callback de ``on_commit`` que marca as partes alteradas na transação."""
+
+    def __init__(self):
+        self.parts: set[str] = set()
+        self.done = False
+
+    def __call__(self):
+        # Registrado de novo a cada mudança da transação; só a primeira chamada
+        # grava as marcas (de todas as mudanças acumuladas).
+        if self.done:
+            return
+        self.done = True
+        changed_at = time.time()
+        cache.set_many({_stale_key(part): changed_at for part in self.parts}, timeout=None)
+        if not settings.SITEMAP_REGENERATE_ON_COMMIT:
+            return
+        try:
+            refresh_stale_sitemaps()
+        except Exception:
+            logger.exception('Failed to refresh sitemaps')
+
+
+def mark_sitemaps_stale(post_ids=(), pages: bool = False) -> None:
+    """
+    Marca depois do COMMIT os shards dos posts (e o sitemap de páginas) como
+    desatualizados; quem regrava é o worker ``build_sitemaps --watch``.
+    """
+    if not settings.SITEMAP_AUTO_REGENERATE:
+        return
+    connection = transaction.get_connection()
+    hook = getattr(connection, '_sitemap_hook', None)
+    if hook is None or hook.done:
+        hook = connection._sitemap_hook = _CommitHook()
+    hook.parts.update(_post_part(shard_for_post(post_id)) for post_id in post_ids)
+    if pages:
+        hook.parts.add(SITEMAP_PAGES_PART)
+    transaction.on_commit(hook)
+
+
+def _stale_parts(parts: list[str]) -> list[str]:
+    marks = cache.get_many([_stale_key(part) for part in parts])
+    built = cache.get_many([_built_key(part) for part in parts])
+    return [
+        part
+        for part in parts
+        if (changed_at := marks.get(_stale_key(part))) is not None
+        and changed_at >= built.get(_built_key(part), float('-inf'))
+    ]
+
+
+def refresh_stale_sitemaps() -> list[str]:
+    """
+    Regrava as partes marcadas desde a última regravação, e com elas o news
+    sitemap e o índice. Só um processo regrava por vez; devolve as partes
+    regravadas (vazio se nada mudou ou se outro processo está no meio).
+    """
+    token = uuid.uuid4().hex
+    if not cache.add(SITEMAP_LOCK_KEY, token, timeout=SITEMAP_LOCK_TIMEOUT):
+        return []
+    try:
+        last_id = Post.objects.published().order_by('-id').values_list('id', flat=True).first()
+        shards = set(range(shard_for_post(last_id) + 1)) if last_id is not None else set()
+        # Shards que ficaram vazios (último post apagado) ainda têm arquivo a remover.
+        for path in sitemap_root().glob('sitemap-posts-*'):
+            if match := _SHARD_NAME_RE.match(path.name):
+                shards.add(int(match.group(1)))
+        parts = [_post_part(shard) for shard in sorted(shards)] + [SITEMAP_PAGES_PART]
+        stale = _stale_parts(parts)
+        if not stale:
+            return []
+
+        # Uma marca gravada durante a regravação é mais nova que started_at e
+        # deixa a parte desatualizada para a próxima passada.
+        started_at = time.time()
+        for part in stale:
+            if part == SITEMAP_PAGES_PART:
+                write_pages_sitemap()
+            else:
+                write_post_shard(int(part.removeprefix('posts-')))
+        if stale != [SITEMAP_PAGES_PART]:
+            write_news_sitemap()
+        write_sitemap_index()
+        cache.set_many({_built_key(part): started_at for part in stale}, timeout=None)
+        return stale
+    finally:
+        if cache.get(SITEMAP_LOCK_KEY) == token:
+            cache.delete(SITEMAP_LOCK_KEY)
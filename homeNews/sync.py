@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from homeNews.exports import NDJSONRenderer, iter_serialized, stream_ndjson
+from homeNews.models import SyncTombstone
+
+SYNC_PAGE_SIZE = 500
+SYNC_DUMP_CHUNK_SIZE = 2000
+# updated_at é gravado antes do COMMIT: linhas alteradas nos últimos segundos
+# ficam para a próxima chamada, para que uma transação lenta não seja pulada.
+SYNC_SETTLE_SECONDS = 2
+# Tombstones mais antigos são apagados (prune_sync_tombstones); tokens anteriores
+# a isso precisam recomeçar pelo dump completo.
+SYNC_TOMBSTONE_RETENTION_DAYS = 30
+
+Position = tuple[datetime, int]
+
+
+class SyncTokenExpired(APIException):
+    status_code = 410
+    default_detail = 'Token de sync expirado; recomece pelo dump completo.'
+    default_code = 'sync_token_expired'
+
+
+@dataclass(frozen=True)
+class SyncToken:
+    changed: Position | None
+    deleted: Position
+
+    def encode(self) -> str:
+        raw = json.dumps([_dump_position(self.changed), _dump_position(self.deleted)])
+        return urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode(cls, encoded: str) -> SyncToken:
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            changed, deleted = json.loads(urlsafe_b64decode(padded))
+            token = cls(changed=_load_position(changed), deleted=_load_position(deleted))
+        except (BinasciiError, TypeError, ValueError):
+            raise NotFound('Token de sync inválido.')
+        if token.deleted is None:
+            raise NotFound('Token de sync inválido.')
+        return token
+
+
+def _dump_position(position: Position | None):
+    if position is None:
+        return None
+    return [position[0].isoformat(), position[1]]
+
+
+def _load_position(raw) -> Position | None:
+    if raw is None:
+        return None
+    moment, pk = raw
+    moment = parse_datetime(moment)
+    if moment is None:
+        raise ValueError('invalid position')
+    return moment, int(pk)
+
+
+def _after(position: Position | None, field: str) -> Q:
+    if position is None:
+        return Q()
+    moment, pk = position
+    return Q(**{f'{field}__gt': moment}) | Q(**{field: moment, 'id__gt': pk})
+
+
+class SyncViewSetMixin:
+    """
+    Acrescenta ``/sync/`` (delta paginado) e ``/dump/`` (NDJSON em streaming) a
+    um viewset de leitura cujo model tem ``updated_at``.
+
+    ``GET sync/`` sem ``since`` devolve a base inteira em páginas; cada resposta
+    traz ``next`` para a chamada seguinte e ``has_more`` enquanto houver fila.
+    ``upserts`` usa o mesmo serializer do endpoint; ``deletes`` lista os ids
+    removidos ou que saíram do queryset público (ex.: categoria desativada).
+    """
+
+    sync_page_size = SYNC_PAGE_SIZE
+
+    def _sync_model(self):
+        return self.get_queryset().model
+
+    def _sync_horizon(self) -> datetime:
+        return timezone.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def sync(self, request, *args, **kwargs):
+        model = self._sync_model()
+        horizon = self._sync_horizon()
+        since = request.query_params.get('since')
+        if since:
+            token = SyncToken.decode(since)
+            retention = timezone.now() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+            if token.deleted[0] < retention:
+                raise SyncTokenExpired()
+        else:
+            # Primeira carga: nada a remover, só acompanhar exclusões daqui em diante.
+            token = SyncToken(changed=None, deleted=(horizon, 0))
+
+        changed = list(
+            model._base_manager.filter(_after(token.changed, 'updated_at'), updated_at__lt=horizon)
+            .order_by('updated_at', 'id')
+            .values_list('id', 'updated_at')[: self.sync_page_size + 1]
+        )
+        tombstones = list(
+            SyncTombstone.objects.filter(
+                _after(token.deleted, 'deleted_at'),
+                model_label=model._meta.label_lower,
+                deleted_at__lt=horizon,
+            )
+            .order_by('deleted_at', 'id')
+            .values_list('id', 'deleted_at', 'object_id')[: self.sync_page_size + 1]
+        )
+        more_tombstones = len(tombstones) > self.sync_page_size
+        has_more = len(changed) > self.sync_page_size or more_tombstones
+        changed = changed[: self.sync_page_size]
+        tombstones = tombstones[: self.sync_page_size]
+
+        changed_ids = [pk for pk, _ in changed]
+        visible = {obj.pk: obj for obj in self.get_queryset().filter(pk__in=changed_ids)}
+        upserts = [visible[pk] for pk in changed_ids if pk in visible]
+        deletes = [pk for pk in changed_ids if pk not in visible]
+        pk_field = model._meta.pk
+        deletes.extend(pk_field.to_python(object_id) for _, _, object_id in tombstones)
+
+        if more_tombstones:
+            deleted = (tombstones[-1][1], tombstones[-1][0])
+        else:
+            # Fila de exclusões vazia: a posição anda até o horizonte. Senão um model
+            # sem deletes mantém a da primeira carga e o token expira na retenção.
+            deleted = (horizon, 0)
+        next_token = SyncToken(
+            changed=(changed[-1][1], changed[-1][0]) if changed else token.changed,
+            deleted=deleted,
+        )
+        return Response(
+            {
+                'upserts': self.get_serializer(upserts, many=True).data,
+                'deletes': deletes,
+                'next': next_token.encode(),
+                'has_more': has_more,
+            }
+        )
+
+    @action(
+        detail=False,
+        methods=['get'],
+        pagination_class=None,
+        renderer_classes=[NDJSONRenderer, JSONRenderer],
+    )
+    def dump(self, request, *args, **kwargs):
+        # O token aponta para antes do início do dump: o que mudar durante o
+        # streaming volta no próximo sync (upserts são idempotentes).
+        horizon = self._sync_horizon()
+        token = SyncToken(changed=(horizon, 0), deleted=(horizon, 0))
+        queryset = self.get_queryset().order_by('pk')
+        rows = iter_serialized(
+            queryset.iterator(chunk_size=SYNC_DUMP_CHUNK_SIZE),
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+        )
+        response = stream_ndjson(rows)
+        response['X-Sync-Token'] = token.encode()
+        return response
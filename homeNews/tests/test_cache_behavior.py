@@ -1,10 +1,18 @@
+import json
+
 import pytest
 from django.contrib.auth.models import User
 from django.core.cache import cache
 
 from accounts.models import Author
 from content.models import Category, Post, PostStatus
-from homeNews.cache_utils import build_cache_key
+from homeNews.cache_utils import (
+    CacheEntry,
+    build_cache_key,
+    get_generation,
+    get_or_build,
+    invalidate_prefixes,
+)
 
 
 pytestmark = pytest.mark.django_db
@@ -38,10 +46,10 @@ def test_posts_list_cache_key_is_written(api_client):
     key = build_cache_key('posts-list', '/api/v1/posts/')
     cached = cache.get(key)
     assert cached is not None
-    assert cached['results'][0]['slug'] == post.slug
+    assert json.loads(cached.payload.content)['results'][0]['slug'] == post.slug
 
 
-def test_post_save_invalidates_posts_cache(api_client):
+def test_post_save_invalidates_posts_cache(api_client, django_capture_on_commit_callbacks):
     cache.clear()
     _build_post('cache-invalidate-a')
 
@@ -50,6 +58,148 @@ def test_post_save_invalidates_posts_cache(api_client):
     key = build_cache_key('posts-list', '/api/v1/posts/')
     assert cache.get(key) is not None
 
-    _build_post('cache-invalidate-b')
+    with django_capture_on_commit_callbacks(execute=True):
+        _build_post('cache-invalidate-b')
+        # Até o COMMIT a lista em cache continua valendo.
+        assert build_cache_key('posts-list', '/api/v1/posts/') == key
+
+    new_key = build_cache_key('posts-list', '/api/v1/posts/')
+    assert new_key != key
+    assert cache.get(new_key) is None
+
+
+def test_invalidation_only_bumps_the_generation_of_the_given_prefix():
+    cache.clear()
+    cache.set('unrelated-session-key', 'keep-me')
+    tags_key = build_cache_key('tags', '/api/v1/tags/')
+    posts_key = build_cache_key('posts-list', '/api/v1/posts/')
+
+    invalidate_prefixes(['posts-list'])
+
+    assert cache.get('unrelated-session-key') == 'keep-me'
+    assert build_cache_key('tags', '/api/v1/tags/') == tags_key
+    assert build_cache_key('posts-list', '/api/v1/posts/') != posts_key
+
+
+def test_invalidation_reseeds_a_lost_generation_counter():
+    cache.clear()
+
+    invalidate_prefixes(['home'])
+
+    assert get_generation('home') > 0
+
+
+def test_cache_hit_serves_rendered_bytes_with_stored_etag(api_client):
+    cache.clear()
+    _build_post('cache-rendered')
+
+    first_response = api_client.get('/api/v1/posts/')
+    key = build_cache_key('posts-list', '/api/v1/posts/')
+    rendered = cache.get(key).payload
+
+    second_response = api_client.get('/api/v1/posts/')
+
+    assert second_response.status_code == 200
+    assert second_response.content == first_response.content == rendered.content
+    assert second_response['ETag'] == first_response['ETag'] == rendered.etag
+    assert second_response['Content-Type'] == rendered.content_type == 'application/json'
+
+
+def test_browsable_api_does_not_share_the_rendered_json_entry(api_client):
+    cache.clear()
+    _build_post('cache-browsable')
+
+    api_client.get('/api/v1/posts/')
+    response = api_client.get('/api/v1/posts/', HTTP_ACCEPT='text/html')
+
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/html')
+
+
+def test_get_or_build_serves_stale_entry_while_another_worker_holds_the_lock():
+    cache.clear()
+    key = build_cache_key('posts-list', '/stale-while-revalidate/')
+    cache.set(key, CacheEntry(payload={'version': 1}, fresh_until=0), timeout=60)
+    cache.add(f'{key}:lock', 'other-worker', timeout=10)
+
+    def _builder():
+        raise AssertionError('only the lock holder may rebuild the entry')
+
+    assert get_or_build(key, _builder, ttl=60, stale_ttl=60) == {'version': 1}
+
+
+def test_get_or_build_lock_holder_refreshes_stale_entry():
+    cache.clear()
+    key = build_cache_key('posts-list', '/stale-refresh/')
+    cache.set(key, CacheEntry(payload={'version': 1}, fresh_until=0), timeout=60)
+
+    payload = get_or_build(key, lambda: {'version': 2}, ttl=60, stale_ttl=60)
+
+    assert payload == {'version': 2}
+    assert cache.get(key).is_fresh()
+    assert cache.get(f'{key}:lock') is None
+
+
+def test_get_or_build_does_not_rebuild_fresh_entry():
+    cache.clear()
+    key = build_cache_key('posts-list', '/fresh/')
+    calls = []
+
+    def _builder():
+        calls.append(1)
+        return {'version': len(calls)}
+
+    first = get_or_build(key, _builder, ttl=60)
+    second = get_or_build(key, _builder, ttl=60)
+
+    assert first == second == {'version': 1}
+    assert len(calls) == 1
+
+
+def test_draft_save_does_not_evict_public_cache(api_client, django_assert_num_queries):
+    cache.clear()
+    _build_post('cache-draft-public')
+    draft = _build_post('cache-draft')
+    draft.status = PostStatus.DRAFT
+    draft.save()
+    api_client.get('/api/v1/posts/')
+
+    draft.title = 'Rascunho editado'
+    draft.save()
+
+    with django_assert_num_queries(0):
+        response = api_client.get('/api/v1/posts/')
+    assert response.status_code == 200
+
+
+def test_published_post_edit_only_evicts_entries_that_embed_it(
+    api_client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    edited = _build_post('cache-edited')
+    untouched = _build_post('cache-untouched')
+    api_client.get(f'/api/v1/posts/{edited.slug}/')
+    api_client.get(f'/api/v1/posts/{untouched.slug}/')
+
+    edited.title = 'Titulo corrigido'
+    with django_capture_on_commit_callbacks(execute=True):
+        edited.save()
+
+    with django_assert_num_queries(0):
+        api_client.get(f'/api/v1/posts/{untouched.slug}/')
+    response = api_client.get(f'/api/v1/posts/{edited.slug}/')
+    assert response.json()['title'] == 'Titulo corrigido'
+
+
+def test_unpublished_post_detail_is_not_served_stale(
+    api_client, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    post = _build_post('cache-unpublished')
+    assert api_client.get(f'/api/v1/posts/{post.slug}/').status_code == 200
+
+    post.status = PostStatus.ARCHIVED
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
 
-    assert cache.get(key) is None
+    assert api_client.get(f'/api/v1/posts/{post.slug}/').status_code == 404
@@ -0,0 +1,72 @@
+import pytest
+from django.core.cache import cache
+from django.utils.http import http_date
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_posts_list_returns_304_for_matching_etag(
+    api_client, public_post, django_assert_num_queries
+):
+    cache.clear()
+    first_response = api_client.get('/api/v1/posts/')
+    etag = first_response['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get('/api/v1/posts/', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response['ETag'] == etag
+
+
+def test_posts_list_returns_200_for_stale_etag(api_client, public_post):
+    cache.clear()
+
+    response = api_client.get('/api/v1/posts/', HTTP_IF_NONE_MATCH='"outdated"')
+
+    assert response.status_code == 200
+    assert response.json()['results']
+
+
+def test_posts_list_ignores_if_modified_since(api_client, public_post):
+    cache.clear()
+    # O Max(updated_at) da lista não avança quando um post sai dela, então a
+    # lista não manda Last-Modified e um If-Modified-Since não gera 304.
+    since = http_date(public_post.updated_at.timestamp() + 3600)
+
+    response = api_client.get('/api/v1/posts/', HTTP_IF_MODIFIED_SINCE=since)
+
+    assert response.status_code == 200
+    assert 'Last-Modified' not in response
+
+
+def test_post_detail_sends_last_modified_from_updated_at(api_client, public_post):
+    cache.clear()
+
+    response = api_client.get(f'/api/v1/posts/{public_post.slug}/')
+
+    assert response.status_code == 200
+    assert response['Last-Modified'] == http_date(public_post.updated_at.timestamp())
+
+
+def test_post_detail_honours_if_modified_since(api_client, public_post):
+    cache.clear()
+    last_modified = api_client.get(f'/api/v1/posts/{public_post.slug}/')['Last-Modified']
+
+    response = api_client.get(
+        f'/api/v1/posts/{public_post.slug}/', HTTP_IF_MODIFIED_SINCE=last_modified
+    )
+
+    assert response.status_code == 304
+
+
+def test_home_without_snapshot_sends_only_the_etag(api_client, home_section_with_item):
+    cache.clear()
+
+    response = api_client.get('/api/v1/home/')
+
+    assert response.status_code == 200
+    assert response['ETag']
+    assert 'Last-Modified' not in response
@@ -0,0 +1,114 @@
+import xml.etree.ElementTree as ET
+
+import pytest
+from django.core.cache import cache
+
+from content.models import PostStatus
+from setup.tests.factories import AuthorFactory, CategoryFactory, PostFactory, TagFactory
+
+
+pytestmark = pytest.mark.django_db
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    settings.SITE_URL = 'https://cbn.example'
+    cache.clear()
+
+
+def _rss_titles(response) -> list[str]:
+    return [item.findtext('title') for item in ET.fromstring(response.content).iter('item')]
+
+
+def test_site_rss_lists_published_posts_with_excerpt(api_client):
+    post = PostFactory(title='Operação deflagrada', content='<p>Primeiro parágrafo.</p>')
+    PostFactory(title='Rascunho', status=PostStatus.DRAFT)
+
+    response = api_client.get('/api/v1/feeds/rss/')
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/rss+xml; charset=utf-8'
+    item = ET.fromstring(response.content).find('channel/item')
+    assert item.findtext('title') == 'Operação deflagrada'
+    assert item.findtext('link') == f'https://cbn.example/{post.slug}'
+    assert item.findtext('description') == post.excerpt
+    assert _rss_titles(response) == ['Operação deflagrada']
+
+
+def test_scoped_atom_feeds_only_list_their_posts(api_client):
+    category = CategoryFactory(slug='politica')
+    tag = TagFactory(slug='stf')
+    author = AuthorFactory()
+    PostFactory(title='Na categoria', categories=[category])
+    PostFactory(title='Com a tag', tags=[tag])
+    PostFactory(title='Do autor', author=author)
+
+    urls = {
+        '/api/v1/feeds/categories/politica/atom/': 'Na categoria',
+        '/api/v1/feeds/tags/stf/atom/': 'Com a tag',
+        f'/api/v1/feeds/authors/{author.pk}/atom/': 'Do autor',
+    }
+    for url, title in urls.items():
+        response = api_client.get(url)
+        assert response['Content-Type'] == 'application/atom+xml; charset=utf-8'
+        entries = ET.fromstring(response.content).findall(f'{ATOM}entry')
+        assert [entry.findtext(f'{ATOM}title') for entry in entries] == [title]
+
+
+def test_feed_self_link_uses_the_public_site_url(api_client):
+    CategoryFactory(slug='politica')
+
+    rss = api_client.get('/api/v1/feeds/rss/', HTTP_HOST='api:8000')
+    atom = api_client.get('/api/v1/feeds/categories/politica/atom/', HTTP_HOST='api:8000')
+
+    rss_self = ET.fromstring(rss.content).find(f'channel/{ATOM}link').get('href')
+    atom_self = ET.fromstring(atom.content).find(f"{ATOM}link[@rel='self']").get('href')
+    assert rss_self == 'https://cbn.example/feeds/rss'
+    assert atom_self == 'https://cbn.example/feeds/categories/politica/atom'
+
+
+def test_unknown_or_inactive_scope_returns_404(api_client):
+    CategoryFactory(slug='oculta', is_active=False)
+
+    assert api_client.get('/api/v1/feeds/categories/oculta/rss/').status_code == 404
+    assert api_client.get('/api/v1/feeds/tags/nao-existe/rss/').status_code == 404
+    assert api_client.get('/api/v1/feeds/json/').status_code == 404
+
+
+def test_cached_feed_answers_conditional_requests_without_queries(
+    api_client, django_assert_num_queries
+):
+    post = PostFactory()
+    first = api_client.get('/api/v1/feeds/rss/')
+
+    with django_assert_num_queries(0):
+        cached = api_client.get('/api/v1/feeds/rss/?utm_source=aggregator')
+        not_modified = api_client.get('/api/v1/feeds/rss/', HTTP_IF_NONE_MATCH=first['ETag'])
+
+    assert cached.content == first.content
+    assert not_modified.status_code == 304
+    assert first['Last-Modified']
+    assert post.slug in first.content.decode()
+
+
+def test_feed_is_invalidated_by_post_and_author_changes(
+    api_client, django_capture_on_commit_callbacks
+):
+    post = PostFactory(title='Título antigo')
+    api_client.get('/api/v1/feeds/rss/')
+
+    post.title = 'Título novo'
+    with django_capture_on_commit_callbacks(execute=True):
+        post.save()
+    assert _rss_titles(api_client.get('/api/v1/feeds/rss/')) == ['Título novo']
+
+    post.author.name = 'Nova Assinatura'
+    with django_capture_on_commit_callbacks(execute=True):
+        post.author.save()
+    assert b'Nova Assinatura' in api_client.get('/api/v1/feeds/rss/').content
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(title='Mais recente')
+    assert _rss_titles(api_client.get('/api/v1/feeds/rss/'))[0] == 'Mais recente'
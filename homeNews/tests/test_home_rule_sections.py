@@ -0,0 +1,131 @@
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from content.models import PostStatus
+from home.models import HomeSectionSource
+from homeNews.home_snapshot import render_home_payload
+from homeNews.models import HomeSnapshot, HomeSnapshotStatus
+from setup.tests.factories import (
+    CategoryFactory,
+    HomeSectionFactory,
+    HomeSectionItemFactory,
+    PostFactory,
+    TagFactory,
+    UserFactory,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def snapshot_settings(settings):
+    settings.API_BASE_URL = 'https://api.cbn.example'
+    settings.HOME_SNAPSHOT_REBUILD_ON_COMMIT = True
+    settings.HOME_SNAPSHOT_AUTO_PUBLISH = True
+    cache.clear()
+
+
+def _sections(api_client) -> dict[str, list[str]]:
+    data = api_client.get('/api/v1/home/').json()
+    return {
+        section['title']: [item['post']['title'] for item in section['items']] for section in data
+    }
+
+
+def test_rule_sections_list_the_latest_posts_of_their_source(api_client):
+    sports = CategoryFactory()
+    election = TagFactory()
+    PostFactory(title='Antigo', categories=[sports], tags=[election])
+    PostFactory(title='Gol', categories=[sports])
+    PostFactory(title='Urna', tags=[election])
+    PostFactory(title='Rascunho', categories=[sports], status=PostStatus.DRAFT)
+    HomeSectionFactory(title='Últimas', source=HomeSectionSource.LATEST, item_limit=2)
+    HomeSectionFactory(title='Esportes', source=HomeSectionSource.CATEGORY, category=sports)
+    HomeSectionFactory(title='Eleições', source=HomeSectionSource.TAG, tag=election)
+    manual = HomeSectionItemFactory(post=PostFactory(title='Curadoria'))
+
+    response = api_client.get('/api/v1/home/')
+
+    assert _sections(api_client) == {
+        manual.section.title: ['Curadoria'],
+        'Últimas': ['Curadoria', 'Urna'],
+        'Esportes': ['Gol', 'Antigo'],
+        'Eleições': ['Urna', 'Antigo'],
+    }
+    rule_item = next(s for s in response.json() if s['title'] == 'Esportes')['items'][0]
+    assert rule_item['id'] is None
+    assert rule_item['order'] == 1
+    assert rule_item['post']['slug']
+    assert rule_item['post']['categories'][0]['id'] == sports.pk
+
+
+def test_rule_section_of_a_deleted_category_or_tag_is_empty(api_client):
+    sports = CategoryFactory()
+    election = TagFactory()
+    PostFactory(title='Gol', categories=[sports], tags=[election])
+    PostFactory(title='Sem taxonomia')
+    HomeSectionFactory(title='Esportes', source=HomeSectionSource.CATEGORY, category=sports)
+    HomeSectionFactory(title='Eleições', source=HomeSectionSource.TAG, tag=election)
+
+    sports.delete()
+    election.delete()
+    cache.clear()
+
+    assert _sections(api_client) == {'Esportes': [], 'Eleições': []}
+
+
+def test_new_post_only_rebuilds_the_sections_that_show_it(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    sports, politics = CategoryFactory(), CategoryFactory()
+    HomeSectionFactory(title='Esportes', source=HomeSectionSource.CATEGORY, category=sports)
+    HomeSectionFactory(title='Política', source=HomeSectionSource.CATEGORY, category=politics)
+    PostFactory(title='Debate', categories=[politics])
+    render_home_payload()
+
+    # Seções e post em cache: só a query da lista de seções.
+    with django_assert_num_queries(1):
+        render_home_payload()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(title='Gol', categories=[sports])
+
+    # Lista de seções + posts da seção Esportes + categorias dos posts.
+    with django_assert_num_queries(3):
+        assert b'Gol' in render_home_payload()
+
+
+def test_publishing_a_matching_post_publishes_a_new_home_version(
+    api_client, django_capture_on_commit_callbacks
+):
+    sports = CategoryFactory()
+    with django_capture_on_commit_callbacks(execute=True):
+        HomeSectionFactory(title='Esportes', source=HomeSectionSource.CATEGORY, category=sports)
+    first = HomeSnapshot.objects.get(status=HomeSnapshotStatus.LIVE)
+
+    draft = PostFactory(title='Gol', categories=[sports], status=PostStatus.DRAFT)
+    assert _sections(api_client) == {'Esportes': []}
+
+    with django_capture_on_commit_callbacks(execute=True):
+        draft.status = PostStatus.PUBLISHED
+        draft.save()
+
+    assert HomeSnapshot.objects.get(status=HomeSnapshotStatus.LIVE).pk != first.pk
+    assert _sections(api_client) == {'Esportes': ['Gol']}
+
+
+def test_painel_requires_the_category_of_a_category_section():
+    editor = APIClient()
+    editor.force_authenticate(user=UserFactory())
+    payload = {'title': 'Esportes', 'section_type': 'LIST', 'order': 1, 'source': 'CATEGORY'}
+
+    response = editor.post('/api/v1/painel/home-sections/', payload, format='json')
+    assert response.status_code == 400
+    assert 'category' in response.json()
+
+    payload['category'] = CategoryFactory().pk
+    response = editor.post('/api/v1/painel/home-sections/', payload, format='json')
+    assert response.status_code == 201
+    assert response.json()['item_limit'] == 6
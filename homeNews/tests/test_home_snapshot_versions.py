@@ -0,0 +1,153 @@
+import json
+
+import pytest
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from homeNews.home_snapshot import (
+    HOME_SNAPSHOT_CACHE_KEY,
+    rebuild_home_snapshot_if_stale,
+)
+from homeNews.models import HomeSnapshot, HomeSnapshotStatus
+from setup.tests.factories import (
+    HomeSectionFactory,
+    HomeSectionItemFactory,
+    PostFactory,
+    UserFactory,
+)
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def snapshot_settings(settings):
+    settings.API_BASE_URL = 'https://api.cbn.example'
+    settings.HOME_SNAPSHOT_REBUILD_ON_COMMIT = True
+    settings.HOME_SNAPSHOT_AUTO_PUBLISH = True
+    cache.clear()
+
+
+@pytest.fixture
+def published_home(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        section = HomeSectionFactory(title='Destaques')
+        item = HomeSectionItemFactory(section=section, post=PostFactory(title='Manchete'))
+    return item
+
+
+def _live() -> HomeSnapshot:
+    return HomeSnapshot.objects.get(status=HomeSnapshotStatus.LIVE)
+
+
+def test_home_is_served_from_the_live_snapshot_without_queries(
+    api_client, published_home, django_assert_num_queries
+):
+    snapshot = _live()
+
+    with django_assert_num_queries(0):
+        response = api_client.get('/api/v1/home/')
+
+    assert response.status_code == 200
+    assert response.content == bytes(snapshot.content)
+    assert response['ETag'] == snapshot.etag
+    assert response['Last-Modified'] == http_date(snapshot.published_at.timestamp())
+    data = response.json()
+    assert data[0]['items'][0]['post']['title'] == 'Manchete'
+    cover = data[0]['items'][0]['post']['cover_image']['file']
+    assert cover.startswith('https://api.cbn.example/media/')
+
+    # Sem cache, a versão no ar é lida do banco: nada é montado no request.
+    cache.delete(HOME_SNAPSHOT_CACHE_KEY)
+    with django_assert_num_queries(1):
+        assert api_client.get('/api/v1/home/').content == response.content
+
+
+def test_editing_a_post_on_the_home_publishes_a_new_version(
+    api_client, published_home, django_capture_on_commit_callbacks
+):
+    first = _live()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        PostFactory(title='Fora da home')
+    assert HomeSnapshot.objects.count() == 1
+
+    post = published_home.post
+    with django_capture_on_commit_callbacks(execute=True):
+        post.title = 'Manchete corrigida'
+        post.save()
+
+    live = _live()
+    assert live.pk != first.pk
+    first.refresh_from_db()
+    assert first.status == HomeSnapshotStatus.RETIRED
+    response = api_client.get('/api/v1/home/')
+    assert response.json()[0]['items'][0]['post']['title'] == 'Manchete corrigida'
+
+
+def test_editors_preview_a_draft_before_publishing_it(
+    settings, api_client, published_home, django_capture_on_commit_callbacks
+):
+    settings.HOME_SNAPSHOT_AUTO_PUBLISH = False
+    live = _live()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        published_home.section.title = 'Urgente'
+        published_home.section.save()
+
+    draft = HomeSnapshot.objects.get(status=HomeSnapshotStatus.DRAFT)
+    assert api_client.get('/api/v1/home/').json()[0]['title'] == 'Destaques'
+
+    editor = APIClient()
+    editor.force_authenticate(user=UserFactory())
+    listing = editor.get('/api/v1/painel/home-snapshots/?status=DRAFT').json()
+    assert [row['id'] for row in listing['results']] == [draft.pk]
+    preview = editor.get(f'/api/v1/painel/home-snapshots/{draft.pk}/preview/')
+    assert preview.json()[0]['title'] == 'Urgente'
+
+    with django_capture_on_commit_callbacks(execute=True):
+        published = editor.post(f'/api/v1/painel/home-snapshots/{draft.pk}/publish/')
+    assert published.json()['status'] == HomeSnapshotStatus.LIVE
+    assert api_client.get('/api/v1/home/').json()[0]['title'] == 'Urgente'
+
+    # Rollback: publicar de novo a versão anterior.
+    with django_capture_on_commit_callbacks(execute=True):
+        editor.post(f'/api/v1/painel/home-snapshots/{live.pk}/publish/')
+    assert api_client.get('/api/v1/home/').json()[0]['title'] == 'Destaques'
+
+
+def test_worker_mode_only_marks_the_snapshot_stale(
+    settings, published_home, django_capture_on_commit_callbacks
+):
+    settings.HOME_SNAPSHOT_REBUILD_ON_COMMIT = False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        HomeSectionItemFactory(section=published_home.section, order=2)
+    assert HomeSnapshot.objects.count() == 1
+
+    snapshot = rebuild_home_snapshot_if_stale()
+
+    assert snapshot is not None
+    assert _live().pk == snapshot.pk
+    assert rebuild_home_snapshot_if_stale() is None
+
+
+def test_one_version_per_transaction_even_after_a_savepoint_rollback(
+    published_home, django_capture_on_commit_callbacks
+):
+    section = published_home.section
+
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                HomeSectionItemFactory(section=section, order=2)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        HomeSectionItemFactory(section=section, order=3)
+        HomeSectionItemFactory(section=section, order=4)
+
+    assert HomeSnapshot.objects.count() == 2
+    assert len(json.loads(bytes(_live().content))[0]['items']) == 3
@@ -0,0 +1,90 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from content.models import LiveBlogEntry, PostStatus
+from homeNews.cache_utils import build_cache_key
+from homeNews.live_blog import live_entry_cache_key
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def _live_url(post, after=None) -> str:
+    url = f'/api/v1/posts/{post.slug}/live/'
+    return url if after is None else f'{url}?after={after}'
+
+
+def test_live_entries_are_sanitized_and_returned_in_order(api_client):
+    post = PostFactory()
+    first = LiveBlogEntry.objects.create(post=post, content='<p onclick="x()">1º gol</p>')
+    second = LiveBlogEntry.objects.create(post=post, content='<p>2º gol</p><script>x()</script>')
+
+    data = api_client.get(_live_url(post)).json()
+
+    assert [entry['content'] for entry in data['results']] == ['<p>1º gol</p>', '<p>2º gol</p>']
+    assert data['after'] == second.id
+    assert data['has_more'] is False
+    assert api_client.get(_live_url(post, after=first.id)).json()['results'][0]['id'] == second.id
+
+
+def test_live_entries_after_the_last_one_are_served_from_per_entry_cache(api_client):
+    post = PostFactory()
+    entries = [LiveBlogEntry.objects.create(post=post, content=f'<p>{i}</p>') for i in range(3)]
+    api_client.get(_live_url(post))
+
+    new_entry = LiveBlogEntry.objects.create(post=post, content='<p>nova</p>')
+    with CaptureQueriesContext(connection) as queries:
+        data = api_client.get(_live_url(post, after=0)).json()
+
+    assert [entry['id'] for entry in data['results']] == [*[e.id for e in entries], new_entry.id]
+    # Post, ids das entradas e só a entrada nova (as outras vêm do cache).
+    assert len(queries) == 3
+    assert cache.get(live_entry_cache_key(new_entry.id))['content'] == '<p>nova</p>'
+
+
+def test_new_entry_does_not_invalidate_the_post_detail(api_client):
+    post = PostFactory()
+    api_client.get(f'/api/v1/posts/{post.slug}/')
+    detail_key = build_cache_key('post-detail', f'/api/v1/posts/{post.slug}/')
+    cached = cache.get(detail_key)
+
+    entry = LiveBlogEntry.objects.create(post=post, content='<p>atualização</p>')
+
+    assert cached is not None
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(f'/api/v1/posts/{post.slug}/')
+    assert len(queries) == 0
+    assert api_client.get(_live_url(post)).json()['results'][0]['id'] == entry.id
+
+
+def test_live_entries_are_paginated_by_after(api_client, monkeypatch):
+    monkeypatch.setattr('homeNews.live_blog.LIVE_BLOG_PAGE_SIZE', 2)
+    post = PostFactory()
+    LiveBlogEntry.objects.bulk_create(
+        LiveBlogEntry(post=post, content=f'<p>{i}</p>') for i in range(3)
+    )
+
+    first_page = api_client.get(_live_url(post)).json()
+    second_page = api_client.get(_live_url(post, after=first_page['after'])).json()
+
+    assert len(first_page['results']) == 2
+    assert first_page['has_more'] is True
+    assert [entry['content'] for entry in second_page['results']] == ['<p>2</p>']
+    assert second_page['has_more'] is False
+
+
+def test_live_entries_validate_after_and_hide_drafts(api_client):
+    post = PostFactory()
+    draft = PostFactory(status=PostStatus.DRAFT)
+
+    for after in ('abc', '²', '-1'):
+        assert api_client.get(_live_url(post, after=after)).status_code == 400
+    assert api_client.get(_live_url(draft)).status_code == 404
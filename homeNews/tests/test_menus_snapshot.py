@@ -1,6 +1,8 @@
 import pytest
+from django.core.cache import cache
 
 from homeNews.tests.helpers import assert_keys
+from setup.tests.factories import MenuFactory, MenuItemFactory
 
 
 pytestmark = pytest.mark.django_db
@@ -17,3 +19,22 @@ def test_menus_snapshot_shape(api_client, active_menu):
     assert data[0]['items']
     assert_keys(data[0]['items'][0], {'id', 'label', 'url', 'target', 'order', 'children'})
     assert data[0]['slug'] == active_menu.slug
+
+
+def test_menu_endpoint_query_count_does_not_grow_with_depth(api_client, django_assert_num_queries):
+    cache.clear()
+    menu = MenuFactory(slug='profundo')
+    parents = [None]
+    for depth in range(4):
+        parents = [
+            MenuItemFactory(menu=menu, parent=parent, order=order)
+            for parent in parents
+            for order in (1, 2)
+        ]
+
+    # Menu + itens (a árvore inteira vem em uma query).
+    with django_assert_num_queries(2):
+        response = api_client.get('/api/v1/menus/profundo/')
+
+    assert response.status_code == 200
+    assert len(response.json()['items']) == 2
@@ -0,0 +1,57 @@
+import pytest
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from home.models import HomeSectionSource
+from homeNews.home_snapshot import render_home_payload
+from setup.tests.factories import HomeSectionFactory, HomeSectionItemFactory, PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+def _selects_post_content(queries) -> bool:
+    return any('"post"."content"' in query['sql'] for query in queries)
+
+
+@pytest.mark.parametrize('amount', [1, 8])
+def test_posts_list_loads_cards_in_constant_queries(api_client, amount):
+    PostFactory.create_batch(amount)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get('/api/v1/posts/')
+
+    assert len(response.json()['results']) == amount
+    assert response.json()['results'][0]['author']['avatar']['file']
+    # Contagem; posts com autor, avatar e capa em JOIN; categorias.
+    assert len(queries) == 3
+    assert not _selects_post_content(queries)
+
+
+@pytest.mark.parametrize('amount', [1, 8])
+def test_home_loads_section_cards_in_constant_queries(api_client, amount):
+    section = HomeSectionFactory()
+    HomeSectionItemFactory.create_batch(amount, section=section)
+    HomeSectionFactory(source=HomeSectionSource.LATEST, item_limit=amount)
+
+    with CaptureQueriesContext(connection) as queries:
+        payload = render_home_payload()
+
+    assert payload.count(b'"avatar":{') == amount * 2
+    # Seções; itens da curadoria com os cards; categorias; posts da seção por regra; categorias.
+    assert len(queries) == 5
+    assert not _selects_post_content(queries)
+
+
+def test_post_detail_still_loads_content(api_client):
+    post = PostFactory(content='<p>Texto completo.</p>')
+
+    response = api_client.get(f'/api/v1/posts/{post.slug}/')
+
+    assert response.json()['content'] == '<p>Texto completo.</p>'
@@ -0,0 +1,31 @@
+import pytest
+
+from content.models import Post
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_post_detail_returns_blocks_instead_of_html_on_request(api_client):
+    post = PostFactory(content='<h2>Resumo</h2><p>texto</p>')
+
+    default = api_client.get(f'/api/v1/posts/{post.slug}/').json()
+    blocks = api_client.get(f'/api/v1/posts/{post.slug}/?content_format=blocks').json()
+
+    assert default['content'] == '<h2>Resumo</h2><p>texto</p>'
+    assert 'content_blocks' not in default
+    assert 'content' not in blocks
+    assert blocks['content_blocks'] == [
+        {'type': 'heading', 'level': 2, 'text': 'Resumo', 'anchor': 'resumo'},
+        {'type': 'paragraph', 'html': 'texto'},
+    ]
+
+
+def test_post_detail_builds_blocks_for_posts_saved_before_them(api_client):
+    post = PostFactory(content='<p>texto legado</p>')
+    Post.objects.filter(pk=post.pk).update(content_blocks=[])
+
+    response = api_client.get(f'/api/v1/posts/{post.slug}/?content_format=blocks')
+
+    assert response.json()['content_blocks'] == [{'type': 'paragraph', 'html': 'texto legado'}]
@@ -0,0 +1,69 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from content.models import Post, PostStatus
+from setup.tests.factories import PostFactory, TagFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _body(response) -> str:
+    assert response.status_code == 200
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+def test_export_streams_every_published_post_as_json_array(api_client):
+    tag = TagFactory(slug='plantao')
+    first = PostFactory(slug='primeiro', tags=[tag])
+    second = PostFactory(slug='segundo')
+    PostFactory(slug='rascunho', status=PostStatus.DRAFT)
+
+    response = api_client.get('/api/v1/posts/export/')
+    rows = json.loads(_body(response))
+
+    assert response['Content-Type'] == 'application/json'
+    assert 'X-Export-Started-At' in response
+    assert [row['slug'] for row in rows] == [first.slug, second.slug]
+    assert rows[0]['tags'][0]['slug'] == 'plantao'
+    assert {'excerpt', 'updated_at', 'author', 'categories'} <= set(rows[0])
+    assert 'content' not in rows[0]
+
+
+def test_export_ndjson_emits_one_post_per_line(api_client):
+    PostFactory.create_batch(3)
+
+    response = api_client.get('/api/v1/posts/export/?format=ndjson')
+    lines = _body(response).splitlines()
+
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert len(lines) == 3
+    assert all('slug' in json.loads(line) for line in lines)
+
+
+def test_export_updated_since_returns_only_recent_changes(api_client):
+    old = PostFactory(slug='antigo')
+    recent = PostFactory(slug='recente')
+    Post.objects.filter(pk=old.pk).update(updated_at=timezone.now() - timedelta(days=2))
+    since = (timezone.now() - timedelta(days=1)).isoformat()
+
+    response = api_client.get('/api/v1/posts/export/', {'updated_since': since})
+
+    assert [row['slug'] for row in json.loads(_body(response))] == [recent.slug]
+
+
+def test_export_rejects_invalid_updated_since(api_client):
+    response = api_client.get('/api/v1/posts/export/?updated_since=ontem')
+
+    assert response.status_code == 400
+    assert 'updated_since' in response.json()
+
+
+def test_export_prefetches_relations_per_batch(api_client, django_assert_max_num_queries):
+    PostFactory.create_batch(5, tags=[TagFactory()])
+
+    with django_assert_max_num_queries(3):
+        _body(api_client.get('/api/v1/posts/export/'))
@@ -0,0 +1,53 @@
+import pytest
+from django.core.cache import cache
+
+from content.models import Post
+from setup.tests.factories import AuthorFactory, PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _slugs(response) -> list[str]:
+    assert response.status_code == 200
+    return sorted(item['slug'] for item in response.json()['results'])
+
+
+def test_author_filter_matches_name_substring_case_insensitively(api_client):
+    cache.clear()
+    PostFactory(slug='da-maria', author=AuthorFactory(name='Maria Souza'))
+    PostFactory(slug='do-joao', author=AuthorFactory(name='João Lima'))
+
+    response = api_client.get('/api/v1/posts/?author=souz')
+
+    assert _slugs(response) == ['da-maria']
+
+
+def test_author_filter_accepts_author_uuid(api_client):
+    cache.clear()
+    author = AuthorFactory(name='Maria Souza')
+    PostFactory(slug='da-maria', author=author)
+    PostFactory(slug='do-joao', author=AuthorFactory(name='João Lima'))
+
+    response = api_client.get(f'/api/v1/posts/?author={author.id}')
+
+    assert _slugs(response) == ['da-maria']
+
+
+def test_by_author_uses_author_id_for_uuids_without_joining_author():
+    author = AuthorFactory()
+
+    query = str(Post.objects.by_author(str(author.id)).query)
+
+    assert 'JOIN' not in query.upper()
+    assert 'author_id' in query
+
+
+def test_title_filter_is_case_insensitive_substring(api_client):
+    cache.clear()
+    PostFactory(slug='eleicoes', title='Resultado das Eleições')
+    PostFactory(slug='futebol', title='Rodada do campeonato')
+
+    response = api_client.get('/api/v1/posts/?title=RESULTADO')
+
+    assert _slugs(response) == ['eleicoes']
@@ -0,0 +1,89 @@
+import json
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from homeNews.pagination import PostKeysetPagination
+from setup.tests.factories import CategoryFactory, PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _walk_feed(api_client, url: str) -> list[str]:
+    slugs = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data.keys()) == {'next', 'results'}
+        slugs.extend(item['slug'] for item in data['results'])
+        url = data['next']
+    return slugs
+
+
+def test_cursor_feed_walks_every_post_once_in_feed_order(api_client, monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(PostKeysetPagination, 'page_size', 2)
+    now = timezone.now()
+    same_instant = now - timedelta(hours=1)
+    posts = [
+        PostFactory(slug='sem-data'),
+        PostFactory(slug='recente', published_at=now),
+        PostFactory(slug='empate-a', published_at=same_instant),
+        PostFactory(slug='empate-b', published_at=same_instant),
+        PostFactory(slug='antigo', published_at=now - timedelta(days=3)),
+    ]
+
+    slugs = _walk_feed(api_client, '/api/v1/posts/?cursor=')
+
+    assert sorted(slugs) == sorted(post.slug for post in posts)
+    assert slugs == ['sem-data', 'recente', 'empate-b', 'empate-a', 'antigo']
+
+
+def test_cursor_feed_respects_category_filter_and_skips_count(api_client):
+    cache.clear()
+    category = CategoryFactory(slug='esportes')
+    PostFactory(slug='no-esporte', categories=[category], published_at=timezone.now())
+    PostFactory(slug='fora-do-esporte', published_at=timezone.now())
+
+    response = api_client.get('/api/v1/posts/?category=esportes&cursor=')
+
+    assert [item['slug'] for item in response.json()['results']] == ['no-esporte']
+    assert 'count' not in response.json()
+
+
+def test_invalid_cursor_returns_404(api_client):
+    cache.clear()
+
+    response = api_client.get('/api/v1/posts/?cursor=nao-e-um-cursor')
+
+    assert response.status_code == 404
+
+
+def test_cursor_with_unparsable_published_at_returns_404(api_client):
+    raw = json.dumps(['ontem', timezone.now().isoformat(), 1])
+    tampered = urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    response = api_client.get('/api/v1/posts/', {'cursor': tampered})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize('params', [{'ordering': 'title'}, {'search': 'reforma'}])
+def test_cursor_rejects_ordering_and_search(api_client, params):
+    response = api_client.get('/api/v1/posts/', {'cursor': '', **params})
+
+    assert response.status_code == 400
+    assert 'cursor' in response.json()
+
+
+def test_page_number_pagination_remains_the_default(api_client, public_post):
+    cache.clear()
+
+    response = api_client.get('/api/v1/posts/')
+
+    assert set(response.json().keys()) == {'count', 'next', 'previous', 'results'}
@@ -0,0 +1,55 @@
+import pytest
+from django.core.cache import cache
+
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_search_matches_without_accents_and_stems_portuguese(api_client):
+    cache.clear()
+    PostFactory(
+        slug='eleicoes-municipais',
+        title='Eleições municipais',
+        content='<p>Candidatos apresentaram propostas.</p>',
+    )
+    PostFactory(slug='futebol', title='Final do campeonato', content='<p>Gols e festa.</p>')
+
+    response = api_client.get('/api/v1/posts/', {'search': 'eleicao'})
+
+    assert response.status_code == 200
+    assert [item['slug'] for item in response.json()['results']] == ['eleicoes-municipais']
+
+
+def test_search_ranks_title_matches_first_and_returns_highlighted_snippets(api_client):
+    cache.clear()
+    PostFactory(
+        slug='citacao-no-conteudo',
+        title='Balanço da semana',
+        content='<p>O relatório da <strong>corrupção</strong> foi entregue.</p>',
+    )
+    PostFactory(
+        slug='corrupcao-no-titulo',
+        title='Corrupção na prefeitura',
+        content='<p>Investigação segue em sigilo.</p>',
+    )
+
+    response = api_client.get('/api/v1/posts/', {'search': 'corrupção'})
+
+    results = response.json()['results']
+    assert [item['slug'] for item in results] == ['corrupcao-no-titulo', 'citacao-no-conteudo']
+    assert '<mark>corrupção</mark>' in results[1]['search_headline']
+    assert '<strong>' not in results[1]['search_headline']
+    assert results[0]['search_rank'] > results[1]['search_rank']
+
+
+def test_search_vector_follows_title_only_updates(api_client):
+    cache.clear()
+    post = PostFactory(slug='titulo-antigo', title='Reforma tributária')
+
+    post.title = 'Privatização aprovada'
+    post.save(update_fields=['title'])
+
+    response = api_client.get('/api/v1/posts/', {'search': 'privatizacao'})
+    assert [item['slug'] for item in response.json()['results']] == ['titulo-antigo']
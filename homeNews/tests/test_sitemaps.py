@@ -0,0 +1,123 @@
+import gzip
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+
+from content.models import PostStatus
+from homeNews import sitemaps
+from setup.tests.factories import CategoryFactory, PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def sitemap_settings(settings, tmp_path):
+    settings.SITEMAP_ROOT = tmp_path
+    settings.SITE_URL = 'https://cbn.example'
+    settings.SITEMAP_AUTO_REGENERATE = True
+    settings.SITEMAP_REGENERATE_ON_COMMIT = False
+    cache.clear()
+    return tmp_path
+
+
+def _read(name: str) -> str:
+    path = sitemaps.sitemap_root() / name
+    if name.endswith('.gz'):
+        return gzip.decompress(path.read_bytes()).decode('utf-8')
+    return path.read_text(encoding='utf-8')
+
+
+def test_build_sitemaps_writes_shards_pages_news_and_index(monkeypatch):
+    monkeypatch.setattr(sitemaps, 'SITEMAP_SHARD_SIZE', 2)
+    posts = PostFactory.create_batch(3, published_at=timezone.now())
+    old = PostFactory(slug='antigo', published_at=timezone.now() - timedelta(days=5))
+    PostFactory(slug='rascunho', status=PostStatus.DRAFT)
+    CategoryFactory(slug='esportes')
+
+    call_command('build_sitemaps', stdout=None)
+
+    shard_files = sorted(path.name for path in sitemaps.sitemap_root().glob('sitemap-posts-*'))
+    all_posts = ''.join(_read(name) for name in shard_files)
+    assert all(f'https://cbn.example/{post.slug}</loc>' in all_posts for post in posts + [old])
+    assert 'rascunho' not in all_posts
+    assert 'https://cbn.example/categoria/esportes' in _read(sitemaps.SITEMAP_PAGES_NAME)
+
+    news = _read(sitemaps.SITEMAP_NEWS_NAME)
+    assert posts[0].slug in news
+    assert 'antigo' not in news
+
+    index = _read(sitemaps.SITEMAP_INDEX_NAME)
+    for name in shard_files + [sitemaps.SITEMAP_PAGES_NAME, sitemaps.SITEMAP_NEWS_NAME]:
+        assert f'https://cbn.example/sitemaps/{name}' in index
+
+
+def test_publishing_a_post_marks_only_its_shard_for_the_worker(
+    monkeypatch, django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(sitemaps, 'SITEMAP_SHARD_SIZE', 1_000_000)
+    with django_capture_on_commit_callbacks(execute=True):
+        post = PostFactory(slug='nova-materia', status=PostStatus.DRAFT)
+    shard = sitemaps.shard_name(sitemaps.shard_for_post(post.pk))
+    # Rascunho não entra no sitemap (as categorias da factory só marcam as páginas).
+    assert sitemaps.refresh_stale_sitemaps() == ['pages']
+    assert not (sitemaps.sitemap_root() / shard).exists()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.status = PostStatus.PUBLISHED
+        post.published_at = timezone.now()
+        post.save()
+
+    # O request só marca: quem escreve é o worker.
+    assert not (sitemaps.sitemap_root() / shard).exists()
+    assert sitemaps.refresh_stale_sitemaps() == ['posts-0']
+    assert sitemaps.refresh_stale_sitemaps() == []
+    assert 'nova-materia' in _read(shard)
+    assert 'nova-materia' in _read(sitemaps.SITEMAP_NEWS_NAME)
+    assert shard in _read(sitemaps.SITEMAP_INDEX_NAME)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+    sitemaps.refresh_stale_sitemaps()
+
+    assert not (sitemaps.sitemap_root() / shard).exists()
+    assert shard not in _read(sitemaps.SITEMAP_INDEX_NAME)
+
+
+def test_regenerate_on_commit_writes_once_per_transaction(
+    settings, monkeypatch, django_capture_on_commit_callbacks
+):
+    settings.SITEMAP_REGENERATE_ON_COMMIT = True
+    refreshes = []
+    original = sitemaps.refresh_stale_sitemaps
+    monkeypatch.setattr(sitemaps, 'refresh_stale_sitemaps', lambda: refreshes.append(original()))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first = PostFactory(slug='primeira')
+        second = PostFactory(slug='segunda')
+        second.title = 'Outro título'
+        second.save()
+
+    assert refreshes == [['posts-0', 'pages']]
+    shard = _read(sitemaps.shard_name(sitemaps.shard_for_post(first.pk)))
+    assert 'primeira' in shard
+    assert 'segunda' in shard
+
+
+def test_sitemap_view_serves_files_with_conditional_get(client):
+    PostFactory(slug='servida')
+    sitemaps.rebuild_all_sitemaps()
+
+    index = client.get('/sitemap.xml')
+    news = client.get(f'/sitemaps/{sitemaps.SITEMAP_NEWS_NAME}')
+    not_modified = client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=index['Last-Modified'])
+
+    assert index.status_code == 200
+    assert index['Content-Type'] == 'application/xml'
+    assert news['Content-Type'] == 'application/gzip'
+    assert not_modified.status_code == 304
+    assert client.get('/sitemaps/..%2Fsettings.py').status_code == 404
+    assert client.get('/sitemaps/sitemap-posts-99.xml.gz').status_code == 404
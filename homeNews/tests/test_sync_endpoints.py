@@ -0,0 +1,112 @@
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from homeNews import sync
+from homeNews.models import SyncTombstone
+from homeNews.sync import SyncToken
+from setup.tests.factories import CategoryFactory, RedirectFactory, TagFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window(monkeypatch):
+    monkeypatch.setattr(sync, 'SYNC_SETTLE_SECONDS', 0)
+
+
+def _sync(api_client, url, since=None):
+    response = api_client.get(url, {'since': since} if since else {})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_tags_sync_pages_through_everything_then_returns_deltas(api_client, monkeypatch):
+    monkeypatch.setattr(sync.SyncViewSetMixin, 'sync_page_size', 2)
+    tags = TagFactory.create_batch(3)
+
+    first = _sync(api_client, '/api/v1/tags/sync/')
+    second = _sync(api_client, '/api/v1/tags/sync/', first['next'])
+
+    assert first['has_more'] is True
+    assert second['has_more'] is False
+    synced = [item['slug'] for item in first['upserts'] + second['upserts']]
+    assert sorted(synced) == sorted(tag.slug for tag in tags)
+    assert first['deletes'] == second['deletes'] == []
+
+    renamed, removed = tags[0], tags[1]
+    renamed.name = 'Renomeada'
+    renamed.save()
+    removed_id = removed.pk
+    removed.delete()
+
+    delta = _sync(api_client, '/api/v1/tags/sync/', second['next'])
+
+    assert [item['name'] for item in delta['upserts']] == ['Renomeada']
+    assert delta['deletes'] == [removed_id]
+    assert _sync(api_client, '/api/v1/tags/sync/', delta['next'])['upserts'] == []
+
+
+def test_categories_sync_reports_deactivated_category_as_delete(api_client):
+    category = CategoryFactory()
+    token = _sync(api_client, '/api/v1/categories/sync/')['next']
+
+    category.is_active = False
+    category.save()
+    delta = _sync(api_client, '/api/v1/categories/sync/', token)
+
+    assert delta['upserts'] == []
+    assert delta['deletes'] == [category.pk]
+
+
+def test_sync_rejects_invalid_and_expired_tokens(api_client):
+    expired = SyncToken(changed=None, deleted=(timezone.now() - timedelta(days=365), 0))
+
+    invalid_response = api_client.get('/api/v1/redirects/sync/', {'since': 'lixo'})
+    expired_response = api_client.get('/api/v1/redirects/sync/', {'since': expired.encode()})
+
+    assert invalid_response.status_code == 404
+    assert expired_response.status_code == 410
+
+
+def test_sync_token_of_a_model_without_deletes_does_not_expire(api_client, monkeypatch):
+    now = timezone.now()
+    token = None
+    # Cliente que sincroniza sempre, com a primeira carga fora da janela de retenção.
+    for days_ago in (40, 20, 0):
+        monkeypatch.setattr(
+            sync.timezone, 'now', lambda days_ago=days_ago: now - timedelta(days=days_ago)
+        )
+        token = _sync(api_client, '/api/v1/tags/sync/', token)['next']
+
+    assert SyncToken.decode(token).deleted[0] == now
+
+
+def test_redirects_dump_streams_ndjson_with_a_sync_token(api_client):
+    RedirectFactory(old_path='/a', new_path='/b')
+    RedirectFactory(old_path='/inativo', new_path='/c', is_active=False)
+
+    response = api_client.get('/api/v1/redirects/dump/')
+    lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert [json.loads(line)['old_path'] for line in lines] == ['/a']
+
+    RedirectFactory(old_path='/nova', new_path='/d')
+    delta = _sync(api_client, '/api/v1/redirects/sync/', response['X-Sync-Token'])
+    assert '/nova' in [item['old_path'] for item in delta['upserts']]
+
+
+def test_deleting_a_redirect_records_a_tombstone():
+    redirect = RedirectFactory()
+    redirect_id = redirect.pk
+
+    redirect.delete()
+
+    tombstone = SyncTombstone.objects.get()
+    assert tombstone.model_label == 'navigation.redirect'
+    assert tombstone.object_id == str(redirect_id)
@@ -1,4 +1,4 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from . import views
 
@@ -12,6 +12,28 @@ router.register(r'home', views.HomeViewSet, basename='home')
 router.register(r'menus', views.MenuViewSet, basename='menu')
 router.register(r'redirects', views.RedirectViewSet, basename='redirect')
 
+FEED_FORMAT = r'(?P<feed_format>rss|atom)'
+
 urlpatterns = [
+    # Feeds RSS 2.0 / Atom (homeNews.feeds)
+    re_path(rf'^feeds/{FEED_FORMAT}/$', views.post_feed, name='feed'),
+    re_path(
+        rf'^feeds/categories/(?P<key>[-\w]+)/{FEED_FORMAT}/$',
+        views.post_feed,
+        {'scope': 'category'},
+        name='category-feed',
+    ),
+    re_path(
+        rf'^feeds/tags/(?P<key>[-\w]+)/{FEED_FORMAT}/$',
+        views.post_feed,
+        {'scope': 'tag'},
+        name='tag-feed',
+    ),
+    re_path(
+        rf'^feeds/authors/(?P<key>[0-9a-f-]{{36}})/{FEED_FORMAT}/$',
+        views.post_feed,
+        {'scope': 'author'},
+        name='author-feed',
+    ),
     path('', include(router.urls)),
 ]
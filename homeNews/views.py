@@ -1,89 +1,268 @@
-from django.core.cache import cache
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db.models import Max
+from django.http import FileResponse, Http404
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 
 from content.models import Category, Post, Tag
-from home.models import HomeSection
-from homeNews.cache_utils import CACHE_TTLS, build_cache_key, set_cache_headers
-from homeNews.filters import PostFilter
+from content.services.post_cards import post_cards
+from homeNews.cache_utils import (
+    CACHE_STALE_TTLS,
+    CACHE_TTLS,
+    CacheFill,
+    build_cache_key,
+    build_rendered_response,
+    get_or_build,
+    post_payload_dependencies,
+    render_payload,
+    set_cache_headers,
+)
+from homeNews.exports import (
+    EXPORT_CHUNK_SIZE,
+    NDJSONRenderer,
+    iter_serialized,
+    stream_json_array,
+    stream_ndjson,
+)
+from homeNews.feeds import build_feed
+from homeNews.filters import PostFilter, PostFullTextSearchFilter
+from homeNews.home_snapshot import get_live_home_snapshot, home_sections_queryset
+from homeNews.live_blog import load_live_entries
+from homeNews.pagination import PostFeedPagination
 from homeNews.serializers import (
     CategorySerializer,
     HomeSectionSerializer,
     MenuSerializer,
     PostDetailSerializer,
+    PostExportSerializer,
     PostListSerializer,
+    PostSearchResultSerializer,
     RedirectSerializer,
     TagSerializer,
+    wants_content_blocks,
 )
+from homeNews.sitemaps import SITEMAP_FILE_RE, SITEMAP_INDEX_NAME, sitemap_root
+from homeNews.sync import SYNC_SETTLE_SECONDS, SyncViewSetMixin
 from navigation.models import Menu, Redirect
 
+SITEMAP_MAX_AGE = 300
+
 
 class CachedReadOnlyViewSet(viewsets.ReadOnlyModelViewSet):
     cache_prefix = ''
     cache_ttl = 60
+    cache_stale_ttl = 0
+    cache_single_flight = True
+    # Cache the rendered JSON bytes (plus ETag and content type) so a hit is
+    # served as a raw HttpResponse without re-rendering the payload.
+    cache_rendered = True
 
     def _cache_key(self) -> str:
-        return build_cache_key(self.cache_prefix, self.request.get_full_path())
+        full_path = self.request.get_full_path()
+        media_type = getattr(self.request, 'accepted_media_type', JSONRenderer.media_type)
+        if media_type != JSONRenderer.media_type:
+            # Browsable API and Accept parameters (e.g. indent) render differently.
+            full_path = f'{full_path}|{media_type}'
+        return build_cache_key(self.cache_prefix, full_path)
 
-    def list(self, request, *args, **kwargs):
-        key = self._cache_key()
-        cached = cache.get(key)
-        if cached is not None:
-            response = Response(cached)
-            set_cache_headers(response, self.cache_ttl)
-            return response
-
-        response = super().list(request, *args, **kwargs)
-        cache.set(key, response.data, timeout=self.cache_ttl)
+    def _should_cache_rendered(self) -> bool:
+        return self.cache_rendered and isinstance(
+            getattr(self.request, 'accepted_renderer', None), JSONRenderer
+        )
+
+    def get_last_modified(self) -> datetime | None:
+        # Override to send Last-Modified; only evaluated when the cache is filled.
+        return None
+
+    def get_cache_dependencies(self, data) -> list[str]:
+        # Override to list the surrogate keys (post:<id>, category:<id>, ...)
+        # whose invalidation must evict this entry.
+        return []
+
+    def _build(self, handler, request, *args, **kwargs) -> CacheFill:
+        data = handler(request, *args, **kwargs).data
+        return CacheFill(payload=data, dependencies=self.get_cache_dependencies(data))
+
+    def _render(self, handler, request, *args, **kwargs) -> CacheFill:
+        data = handler(request, *args, **kwargs).data
+        rendered = render_payload(
+            data,
+            request.accepted_renderer,
+            request.accepted_media_type,
+            self.get_renderer_context(),
+            last_modified=self.get_last_modified(),
+        )
+        return CacheFill(payload=rendered, dependencies=self.get_cache_dependencies(data))
+
+    def _cached_response(self, handler, request, *args, **kwargs):
+        if self._should_cache_rendered():
+            rendered = get_or_build(
+                self._cache_key(),
+                lambda: self._render(handler, request, *args, **kwargs),
+                ttl=self.cache_ttl,
+                stale_ttl=self.cache_stale_ttl,
+                single_flight=self.cache_single_flight,
+            )
+            return build_rendered_response(request, rendered, self.cache_ttl)
+
+        data = get_or_build(
+            self._cache_key(),
+            lambda: self._build(handler, request, *args, **kwargs),
+            ttl=self.cache_ttl,
+            stale_ttl=self.cache_stale_ttl,
+            single_flight=self.cache_single_flight,
+        )
+        response = Response(data)
         set_cache_headers(response, self.cache_ttl)
-        return response
+        return get_conditional_response(request, etag=response['ETag'], response=response)
+
+    def list(self, request, *args, **kwargs):
+        return self._cached_response(super().list, request, *args, **kwargs)
 
     def retrieve(self, request, *args, **kwargs):
-        key = self._cache_key()
-        cached = cache.get(key)
-        if cached is not None:
-            response = Response(cached)
-            set_cache_headers(response, self.cache_ttl)
-            return response
-
-        response = super().retrieve(request, *args, **kwargs)
-        cache.set(key, response.data, timeout=self.cache_ttl)
-        set_cache_headers(response, self.cache_ttl)
-        return response
+        return self._cached_response(super().retrieve, request, *args, **kwargs)
 
 
 class PostViewSet(CachedReadOnlyViewSet):
     lookup_field = 'slug'
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, PostFullTextSearchFilter]
     filterset_class = PostFilter
-    search_fields = ['title', 'subtitle', 'content']
+    pagination_class = PostFeedPagination
     ordering_fields = ['published_at', 'created_at', 'title']
     ordering = ['-published_at', '-created_at']
     cache_prefix = 'posts-list'
     cache_ttl = CACHE_TTLS['posts_list']
+    cache_stale_ttl = CACHE_STALE_TTLS['posts_list']
 
     def get_queryset(self):
-        return (
-            Post.objects.published()
-            .select_related('author', 'author__avatar', 'cover_image')
-            .prefetch_related('categories', 'tags')
-            .order_by('-published_at', '-created_at')
+        posts = Post.objects.published().order_by('-published_at', '-created_at')
+        if self.action == 'list':
+            # Cards não mostram conteúdo nem tags.
+            return post_cards(posts)
+        if self.action == 'export':
+            fields = ('excerpt', 'updated_at')
+            return post_cards(posts, extra_fields=fields).prefetch_related('tags')
+        if not wants_content_blocks(self.request):
+            posts = posts.defer('content_blocks')
+        return posts.select_related('author', 'author__avatar', 'cover_image').prefetch_related(
+            'categories', 'tags'
         )
 
     def get_serializer_class(self):
+        if self.action == 'export':
+            return PostExportSerializer
         if self.action == 'list':
+            if PostFullTextSearchFilter().get_search_term(self.request):
+                return PostSearchResultSerializer
             return PostListSerializer
         return PostDetailSerializer
 
+    def get_cache_dependencies(self, data):
+        if self.action == 'retrieve':
+            return post_payload_dependencies(data)
+        posts = data['results'] if isinstance(data, dict) else data
+        return [dependency for post in posts for dependency in post_payload_dependencies(post)]
+
+    def get_last_modified(self):
+        if self.action != 'retrieve':
+            # Na lista, o Max(updated_at) não avança quando um post sai dela
+            # (despublicado, apagado, sem a categoria/tag): um If-Modified-Since
+            # receberia 304 de uma lista que mudou. A lista fica só com o ETag.
+            return None
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset().filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.aggregate(last_modified=Max('updated_at'))['last_modified']
+
+    @action(
+        detail=False,
+        methods=['get'],
+        pagination_class=None,
+        filter_backends=[],
+        renderer_classes=[JSONRenderer, NDJSONRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Acervo publicado inteiro em uma resposta em streaming (JSON ou NDJSON
+        com ``?format=ndjson``), em ordem de ``updated_at``.
+
+        ``?updated_since=<ISO 8601>`` limita às alterações desde então; o header
+        ``X-Export-Started-At`` é o valor a usar na próxima carga.
+        """
+        started_at = timezone.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+        queryset = self.get_queryset().order_by('updated_at', 'id')
+        updated_since = request.query_params.get('updated_since')
+        if updated_since:
+            moment = parse_datetime(updated_since)
+            if moment is None:
+                raise ValidationError({'updated_since': 'Data inválida (use ISO 8601).'})
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            queryset = queryset.filter(updated_at__gte=moment)
+
+        # Com chunk_size o prefetch (categorias, tags) roda por lote e a memória
+        # fica constante; no PostgreSQL o iterator usa cursor no servidor.
+        rows = iter_serialized(
+            queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE),
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+        )
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            response = stream_ndjson(rows)
+        else:
+            response = stream_json_array(rows)
+        response['X-Export-Started-At'] = started_at.isoformat()
+        return response
+
+    @action(detail=True, methods=['get'], pagination_class=None, filter_backends=[])
+    def live(self, request, *args, **kwargs):
+        """
+        Entradas da cobertura ao vivo do post, em ordem. ``?after=<id>`` traz só
+        as publicadas depois da última recebida, então uma entrada nova custa
+        uma resposta pequena e o post não é baixado de novo. As entradas são
+        append-only: correções entram como entradas novas.
+        """
+        try:
+            after = int(request.query_params.get('after', '0'))
+        except ValueError:
+            after = -1
+        if after < 0:
+            raise ValidationError({'after': 'Informe o id da última entrada recebida.'})
+        post_id = get_object_or_404(
+            Post.objects.published()
+            .filter(slug=kwargs[self.lookup_field])
+            .values_list('id', flat=True)
+        )
+        entries, has_more = load_live_entries(post_id, after)
+        response = Response(
+            {
+                'results': entries,
+                'after': entries[-1]['id'] if entries else after,
+                'has_more': has_more,
+            }
+        )
+        set_cache_headers(response, CACHE_TTLS['live_blog'])
+        return get_conditional_response(request, etag=response['ETag'], response=response)
+
     def retrieve(self, request, *args, **kwargs):
         self.cache_prefix = 'post-detail'
         self.cache_ttl = CACHE_TTLS['post_detail']
+        self.cache_stale_ttl = CACHE_STALE_TTLS['post_detail']
         return super().retrieve(request, *args, **kwargs)
 
 
-class CategoryViewSet(CachedReadOnlyViewSet):
+class CategoryViewSet(SyncViewSetMixin, CachedReadOnlyViewSet):
     queryset = Category.objects.active()
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
@@ -91,9 +270,10 @@ class CategoryViewSet(CachedReadOnlyViewSet):
     pagination_class = None
     cache_prefix = 'categories'
     cache_ttl = CACHE_TTLS['categories']
+    cache_stale_ttl = CACHE_STALE_TTLS['categories']
 
 
-class TagViewSet(CachedReadOnlyViewSet):
+class TagViewSet(SyncViewSetMixin, CachedReadOnlyViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = [permissions.AllowAny]
@@ -101,6 +281,7 @@ class TagViewSet(CachedReadOnlyViewSet):
     pagination_class = None
     cache_prefix = 'tags'
     cache_ttl = CACHE_TTLS['tags']
+    cache_stale_ttl = CACHE_STALE_TTLS['tags']
 
 
 class HomeViewSet(CachedReadOnlyViewSet):
@@ -109,19 +290,28 @@ class HomeViewSet(CachedReadOnlyViewSet):
     pagination_class = None
     cache_prefix = 'home'
     cache_ttl = CACHE_TTLS['home']
+    cache_stale_ttl = CACHE_STALE_TTLS['home']
 
     def get_queryset(self):
-        return (
-            HomeSection.objects.active()
-            .prefetch_related(
-                'items',
-                'items__post',
-                'items__post__author',
-                'items__post__cover_image',
-                'items__post__categories',
-            )
-            .order_by('order')
-        )
+        return home_sections_queryset()
+
+    def get_cache_dependencies(self, data):
+        return [
+            dependency
+            for section in data
+            for item in section['items']
+            for dependency in post_payload_dependencies(item['post'])
+        ]
+
+    def list(self, request, *args, **kwargs):
+        # A home inteira vem da versão publicada do snapshot (homeNews.home_snapshot);
+        # montar na hora só antes da primeira publicação ou na API navegável. Esse
+        # caminho fica só com o ETag: nenhum updated_at avança quando um item sai da
+        # home ou as seções mudam de ordem. O snapshot manda o published_at.
+        rendered = get_live_home_snapshot() if self._should_cache_rendered() else None
+        if rendered is None:
+            return super().list(request, *args, **kwargs)
+        return build_rendered_response(request, rendered, self.cache_ttl)
 
 
 class MenuViewSet(CachedReadOnlyViewSet):
@@ -131,19 +321,51 @@ class MenuViewSet(CachedReadOnlyViewSet):
     pagination_class = None
     cache_prefix = 'menus'
     cache_ttl = CACHE_TTLS['menus']
+    cache_stale_ttl = CACHE_STALE_TTLS['menus']
 
     def get_queryset(self):
-        return Menu.objects.active().prefetch_related(
-            'menuitem_set',
-            'menuitem_set__children',
-            'menuitem_set__children__children',
-        )
+        return Menu.objects.active()
 
 
-class RedirectViewSet(CachedReadOnlyViewSet):
+class RedirectViewSet(SyncViewSetMixin, CachedReadOnlyViewSet):
     queryset = Redirect.objects.filter(is_active=True)
     serializer_class = RedirectSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = None
     cache_prefix = 'redirects'
     cache_ttl = CACHE_TTLS['redirects']
+    cache_stale_ttl = CACHE_STALE_TTLS['redirects']
+
+
+def _sitemap_last_modified(request, name=SITEMAP_INDEX_NAME):
+    try:
+        mtime = (sitemap_root() / name).stat().st_mtime
+    except (FileNotFoundError, ValueError):
+        return None
+    return datetime.fromtimestamp(mtime, tz=dt_timezone.utc)
+
+
+@condition(last_modified_func=_sitemap_last_modified)
+def sitemap_file(request, name=SITEMAP_INDEX_NAME):
+    # Os arquivos mudam depois do deploy, então não dá para deixá-los com o
+    # WhiteNoise (que indexa STATIC_ROOT só na inicialização).
+    if not SITEMAP_FILE_RE.match(name):
+        raise Http404
+    path = sitemap_root() / name
+    if not path.is_file():
+        raise Http404
+    content_type = 'application/gzip' if name.endswith('.gz') else 'application/xml'
+    response = FileResponse(path.open('rb'), content_type=content_type)
+    response['Cache-Control'] = f'public, max-age={SITEMAP_MAX_AGE}'
+    return response
+
+
+def post_feed(request, feed_format, scope='site', key=None):
+    # Chave pelo path (sem query string): parâmetros arbitrários não furam o cache.
+    rendered = get_or_build(
+        build_cache_key('feeds', request.path),
+        lambda: build_feed(request, scope, feed_format, key),
+        ttl=CACHE_TTLS['feeds'],
+        stale_ttl=CACHE_STALE_TTLS['feeds'],
+    )
+    return build_rendered_response(request, rendered, CACHE_TTLS['feeds'])
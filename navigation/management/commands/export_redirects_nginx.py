@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from navigation.services.redirect_matcher import (
+    load_compiled_redirects,
+    render_nginx_redirect_map,
+)
+
+
+class Command(BaseCommand):
+    help = 'Exporta os redirects ativos como blocos map do nginx (frontend/nginx/redirects.map).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Arquivo de destino. Sem ele, o mapa é escrito na saída padrão.',
+        )
+
+    def handle(self, *args, **options):
+        compiled = load_compiled_redirects()
+        content, skipped = render_nginx_redirect_map(compiled)
+
+        if skipped:
+            self.stderr.write(
+                self.style.WARNING(
+                    f'{skipped} redirects ignorados (caracteres inválidos no nginx).'
+                )
+            )
+        if not options['output']:
+            self.stdout.write(content, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(compiled) - skipped} redirects exportados para {options["output"]}.'
+            )
+        )
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.http import HttpResponsePermanentRedirect, HttpResponseRedirect
+
+from navigation.services.redirect_matcher import redirect_matcher
+
+DEFAULT_REDIRECTS_EXCLUDED_PREFIXES = ('/api/', '/admin/', '/static/', '/media/')
+
+
+class LegacyRedirectMiddleware:
+    """
+    Responde 301/302 para os ``Redirect`` ativos antes do roteamento de URLs.
+
+    A busca é feita no matcher compilado em memória; o banco só é lido quando
+    a versão dos redirects no cache muda.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.excluded_prefixes = tuple(
+            getattr(settings, 'REDIRECTS_EXCLUDED_PREFIXES', DEFAULT_REDIRECTS_EXCLUDED_PREFIXES)
+        )
+
+    def __call__(self, request):
+        path = request.path_info
+        if request.method in ('GET', 'HEAD') and not path.startswith(self.excluded_prefixes):
+            target = redirect_matcher.match(path)
+            if target is not None:
+                location = target.location
+                query_string = request.META.get('QUERY_STRING')
+                if query_string and '?' not in location:
+                    location = f'{location}?{query_string}'
+                if target.permanent:
+                    return HttpResponsePermanentRedirect(location)
+                return HttpResponseRedirect(location)
+        return self.get_response(request)
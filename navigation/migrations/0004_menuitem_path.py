@@ -0,0 +1,50 @@
+# Generated by Django 6.0.3 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+PATH_DIGITS = 10
+
+
+def backfill_menu_item_paths(apps, schema_editor):
+    MenuItem = apps.get_model('navigation', 'MenuItem')
+    rows = list(MenuItem.objects.values_list('id', 'parent_id'))
+    children = {}
+    for pk, parent_id in rows:
+        children.setdefault(parent_id, []).append(pk)
+
+    # Percorre a partir das raízes; itens presos em ciclos ficam sem caminho.
+    paths = {}
+    pending = [(pk, '', 0) for pk in children.get(None, [])]
+    while pending:
+        pk, parent_path, depth = pending.pop()
+        paths[pk] = (f'{parent_path}{pk:0{PATH_DIGITS}d}/', depth)
+        pending.extend((child, paths[pk][0], depth + 1) for child in children.get(pk, []))
+
+    items = [MenuItem(pk=pk, path=path, depth=depth) for pk, (path, depth) in paths.items()]
+    MenuItem.objects.bulk_update(items, ['path', 'depth'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('navigation', '0003_alter_redirect_url_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='menuitem',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='menuitem',
+            name='path',
+            field=models.CharField(default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_menu_item_paths, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='menuitem',
+            index=models.Index(
+                fields=['path'], name='menu_item_path_idx', opclasses=['varchar_pattern_ops']
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 6.0.3 on 2026-10-18 16:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('navigation', '0004_menuitem_path'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='redirect',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='redirect',
+            index=models.Index(fields=['updated_at', 'id'], name='redirect_updated_idx'),
+        ),
+    ]
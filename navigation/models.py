@@ -1,4 +1,11 @@
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+
+# Cada nível do caminho materializado é o id com zero à esquerda + '/'.
+# Com max_length=255 cabem 23 níveis, muito além de qualquer menu real.
+MENU_ITEM_PATH_DIGITS = 10
 
 
 class MenuItemTarget(models.TextChoices):
@@ -35,6 +42,19 @@ class Menu(models.Model):
 
 
 class MenuItem(models.Model):
+    class MenuItemQuerySet(models.QuerySet):
+        def subtree(self, item, include_self=True):
+            # Prefixo do caminho: uma única busca no índice menu_item_path_idx.
+            queryset = self.filter(path__startswith=item.path)
+            return queryset if include_self else queryset.exclude(pk=item.pk)
+
+        def ancestors(self, item, include_self=False):
+            ids = item.ancestor_ids + ([item.pk] if include_self else [])
+            return self.filter(pk__in=ids).order_by('depth')
+
+        def breadcrumb(self, item):
+            return self.ancestors(item, include_self=True)
+
     menu = models.ForeignKey('navigation.Menu', on_delete=models.CASCADE, null=False, blank=False)
     parent = models.ForeignKey(
         'self', on_delete=models.CASCADE, null=True, blank=True, related_name='children'
@@ -50,15 +70,101 @@ class MenuItem(models.Model):
         default=MenuItemTarget.SELF,
     )
     is_active = models.BooleanField(default=True)
+    # Caminho materializado (ids dos ancestrais + o próprio) e profundidade (raiz = 0),
+    # mantidos pelo save(); nunca edite à mão.
+    path = models.CharField(max_length=255, editable=False, default='')
+    depth = models.PositiveSmallIntegerField(editable=False, default=0)
+
+    objects = MenuItemQuerySet.as_manager()
 
     class Meta:
         ordering = ['order']
         db_table = 'menu_item'
+        indexes = [
+            # varchar_pattern_ops permite usar o índice em LIKE 'prefixo%' com qualquer collation.
+            models.Index(
+                fields=['path'], name='menu_item_path_idx', opclasses=['varchar_pattern_ops']
+            ),
+        ]
         verbose_name_plural = 'Itens de menu'
 
     def __str__(self):
         return f'{self.menu.title} - {self.label}'
 
+    @staticmethod
+    def path_segment(pk) -> str:
+        return f'{pk:0{MENU_ITEM_PATH_DIGITS}d}/'
+
+    @property
+    def ancestor_ids(self) -> list[int]:
+        return [int(segment) for segment in self.path.split('/') if segment][:-1]
+
+    def is_descendant_of(self, other: 'MenuItem') -> bool:
+        return bool(other.path) and self.path.startswith(other.path)
+
+    def clean(self):
+        if self.pk and self.parent_id:
+            parent = MenuItem.objects.filter(pk=self.parent_id).only('path').first()
+            if parent and parent.is_descendant_of(self):
+                raise ValidationError(
+                    {'parent': 'Um item não pode ficar abaixo de si mesmo ou de um descendente.'}
+                )
+
+    def save(self, *args, **kwargs):
+        stored = {
+            row['pk']: row
+            for row in MenuItem.objects.filter(pk__in=[self.pk, self.parent_id]).values(
+                'pk', 'path', 'depth', 'menu_id'
+            )
+        }
+        previous = stored.get(self.pk) if self.pk is not None else None
+        parent = stored.get(self.parent_id) if self.parent_id is not None else None
+        if previous and parent and parent['path'].startswith(previous['path']):
+            raise ValidationError('Um item não pode ficar abaixo de si mesmo ou de um descendente.')
+
+        parent_path = parent['path'] if parent else ''
+        depth = parent['depth'] + 1 if parent else 0
+
+        with transaction.atomic():
+            if self.pk is None:
+                # O caminho usa o próprio id, que só existe depois do INSERT.
+                super().save(*args, **kwargs)
+                self.path, self.depth = parent_path + self.path_segment(self.pk), depth
+                MenuItem.objects.filter(pk=self.pk).update(path=self.path, depth=self.depth)
+                return
+
+            self.path, self.depth = parent_path + self.path_segment(self.pk), depth
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = tuple(sorted({*update_fields, 'path', 'depth'}))
+            super().save(*args, **kwargs)
+
+            if (
+                previous
+                and previous['path']
+                and (previous['path'] != self.path or previous['menu_id'] != self.menu_id)
+            ):
+                # Item movido: a subárvore inteira acompanha em um único UPDATE.
+                old_path = previous['path']
+                MenuItem.objects.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(
+                        Value(self.path),
+                        Substr('path', len(old_path) + 1),
+                        output_field=models.CharField(),
+                    ),
+                    depth=F('depth') + (self.depth - previous['depth']),
+                    menu_id=self.menu_id,
+                )
+
+    def get_descendants(self, include_self=False):
+        return MenuItem.objects.subtree(self, include_self=include_self)
+
+    def get_ancestors(self, include_self=False):
+        return MenuItem.objects.ancestors(self, include_self=include_self)
+
+    def get_breadcrumb(self):
+        return MenuItem.objects.breadcrumb(self)
+
 
 class Redirect(models.Model):
     old_path = models.CharField(max_length=200, unique=True, null=False, blank=False)
@@ -71,10 +177,13 @@ class Redirect(models.Model):
         default=RedirectType.PERMANENT,
     )
     is_active = models.BooleanField(default=True)
+    # Base do sync incremental (/redirects/sync/); queryset.update() não o atualiza.
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-id']
         db_table = 'redirect'
+        indexes = [models.Index(fields=['updated_at', 'id'], name='redirect_updated_idx')]
         verbose_name_plural = 'Redirecionamentos'
 
     def __str__(self):
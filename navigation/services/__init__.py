@@ -0,0 +1 @@
+"""Domain services for site navigation."""
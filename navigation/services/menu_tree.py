@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from django.core.cache import cache
+
+from navigation.models import Menu, MenuItem
+
+MENU_TREE_FIELDS = ('id', 'label', 'url', 'target', 'order')
+MENU_TREE_CACHE_TIMEOUT = 3600
+
+
+def build_menu_tree(rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Monta a árvore aninhada a partir das linhas planas (com ``parent_id``).
+
+    As linhas devem vir na ordem de exibição; cada nó é anexado ao pai em uma
+    única passada, sem limite de profundidade. Nós cujo pai não está entre as
+    linhas (ex.: pai inativo) ficam de fora junto com a sua subárvore.
+    """
+    rows = list(rows)
+    nodes = {
+        row['id']: {**{field: row[field] for field in MENU_TREE_FIELDS}, 'children': []}
+        for row in rows
+    }
+    roots = []
+    for row in rows:
+        parent_id = row['parent_id']
+        if parent_id is None:
+            roots.append(nodes[row['id']])
+        elif parent_id in nodes:
+            nodes[parent_id]['children'].append(nodes[row['id']])
+    return roots
+
+
+def load_menu_tree(menu_id: int) -> list[dict[str, Any]]:
+    rows = (
+        MenuItem.objects.filter(menu_id=menu_id, is_active=True)
+        .order_by('order', 'id')
+        .values('parent_id', *MENU_TREE_FIELDS)
+    )
+    return build_menu_tree(rows)
+
+
+def _menu_tree_cache_key(slug: str) -> str:
+    return f'navigation-menu-tree:{slug}'
+
+
+def get_menu_tree(menu: Menu) -> list[dict[str, Any]]:
+    """
+    Árvore já compilada do menu, guardada no cache por slug.
+
+    O id do menu vai junto no valor: se o slug for reaproveitado por outro
+    menu, a entrada antiga é descartada em vez de servida.
+    """
+    key = _menu_tree_cache_key(menu.slug)
+    cached = cache.get(key)
+    if cached is not None and cached['menu_id'] == menu.pk:
+        return cached['items']
+    items = load_menu_tree(menu.pk)
+    cache.set(key, {'menu_id': menu.pk, 'items': items}, timeout=MENU_TREE_CACHE_TIMEOUT)
+    return items
+
+
+def invalidate_menu_trees(slugs: Iterable[str]) -> None:
+    cache.delete_many([_menu_tree_cache_key(slug) for slug in slugs])
@@ -0,0 +1,213 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.core.cache import cache
+
+from navigation.models import Redirect, RedirectType
+
+# Regra curinga: ``/antigo/*`` casa ``/antigo`` e tudo abaixo dele (por segmento
+# de caminho). Se o destino também terminar em ``*``, o restante do caminho é
+# repassado (``/novo/*``).
+WILDCARD = '*'
+
+REDIRECTS_VERSION_KEY = 'navigation-redirects-version'
+# Intervalo mínimo entre consultas da versão no cache, por processo.
+REDIRECTS_VERSION_CHECK_INTERVAL = 5.0
+
+
+def normalize_path(path: str) -> str:
+    if len(path) > 1 and path.endswith('/'):
+        return path.rstrip('/') or '/'
+    return path
+
+
+@dataclass(frozen=True)
+class RedirectTarget:
+    location: str
+    permanent: bool
+
+
+@dataclass(frozen=True)
+class _PrefixRule:
+    prefix: str
+    new_path: str
+    permanent: bool
+
+    def resolve(self, path: str) -> RedirectTarget:
+        if self.new_path.endswith(WILDCARD):
+            rest = path[len(self.prefix) :] if path.startswith(self.prefix) else ''
+            location = self.new_path[:-1] + rest
+        else:
+            location = self.new_path
+        return RedirectTarget(location=location, permanent=self.permanent)
+
+
+@dataclass
+class _TrieNode:
+    children: dict[str, _TrieNode] = field(default_factory=dict)
+    rule: _PrefixRule | None = None
+
+
+class CompiledRedirects:
+    """
+    Redirects ativos compilados em memória: dicionário para caminhos exatos e
+    trie por segmento de caminho para as regras curinga (vence o prefixo mais longo).
+    """
+
+    def __init__(self) -> None:
+        self.exact: dict[str, RedirectTarget] = {}
+        self.prefixes: list[_PrefixRule] = []
+        self._root = _TrieNode()
+
+    def __len__(self) -> int:
+        return len(self.exact) + len(self.prefixes)
+
+    def add(self, old_path: str, new_path: str, permanent: bool) -> None:
+        if old_path.endswith(WILDCARD):
+            segments = self._segments(old_path[:-1])
+            prefix = '/' + ''.join(f'{segment}/' for segment in segments)
+            rule = _PrefixRule(prefix, new_path, permanent)
+            node = self._root
+            for segment in segments:
+                node = node.children.setdefault(segment, _TrieNode())
+            node.rule = rule
+            self.prefixes.append(rule)
+            return
+        self.exact[normalize_path(old_path)] = RedirectTarget(new_path, permanent)
+
+    @staticmethod
+    def _segments(path: str) -> list[str]:
+        return [segment for segment in path.split('/') if segment]
+
+    def match(self, path: str) -> RedirectTarget | None:
+        target = self.exact.get(normalize_path(path))
+        if target is not None:
+            return target
+
+        node, best = self._root, self._root.rule
+        for segment in self._segments(path):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.rule is not None:
+                best = node.rule
+        if best is None:
+            return None
+        return best.resolve(path)
+
+
+def compile_redirects(rows: Iterable[tuple[str, str, str]]) -> CompiledRedirects:
+    compiled = CompiledRedirects()
+    for old_path, new_path, url_type in rows:
+        compiled.add(old_path, new_path, permanent=url_type == RedirectType.PERMANENT)
+    return compiled
+
+
+def load_compiled_redirects() -> CompiledRedirects:
+    rows = Redirect.objects.filter(is_active=True).values_list('old_path', 'new_path', 'url_type')
+    return compile_redirects(rows.iterator(chunk_size=5000))
+
+
+def get_redirects_version() -> int:
+    version = cache.get(REDIRECTS_VERSION_KEY)
+    if version is None:
+        # Semeado pelo relógio, como as gerações do cache da API.
+        cache.add(REDIRECTS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(REDIRECTS_VERSION_KEY)
+    return version
+
+
+def bump_redirects_version() -> None:
+    try:
+        cache.incr(REDIRECTS_VERSION_KEY)
+    except ValueError:
+        cache.add(REDIRECTS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+class RedirectMatcher:
+    """
+    Mantém o ``CompiledRedirects`` do processo e o recompila só quando a versão
+    no cache muda (qualquer save/delete de ``Redirect``).
+    """
+
+    def __init__(self, check_interval: float = REDIRECTS_VERSION_CHECK_INTERVAL) -> None:
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._compiled: CompiledRedirects | None = None
+        self._version: int | None = None
+        self._checked_at = 0.0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._compiled, self._version, self._checked_at = None, None, 0.0
+
+    def current(self) -> CompiledRedirects:
+        now = time.monotonic()
+        if self._compiled is not None and now - self._checked_at < self.check_interval:
+            return self._compiled
+        with self._lock:
+            version = get_redirects_version()
+            if self._compiled is None or version != self._version:
+                self._compiled = load_compiled_redirects()
+                self._version = version
+            self._checked_at = now
+            return self._compiled
+
+    def match(self, path: str) -> RedirectTarget | None:
+        return self.current().match(path)
+
+
+redirect_matcher = RedirectMatcher()
+
+
+NGINX_MAP_VARIABLES = {True: '$cbn_redirect_permanent', False: '$cbn_redirect_temporary'}
+_NGINX_UNSAFE_CHARS = frozenset('"\\${};\'') | frozenset(chr(code) for code in range(33))
+
+
+def _nginx_safe(*values: str) -> bool:
+    return not any(_NGINX_UNSAFE_CHARS & set(value) for value in values)
+
+
+def render_nginx_redirect_map(compiled: CompiledRedirects) -> tuple[str, int]:
+    """
+    Gera os blocos ``map`` do nginx equivalentes ao matcher (ver frontend/nginx).
+
+    Retorna o texto e quantas regras foram puladas por conterem caracteres que
+    o nginx não aceita sem escape (aspas, ``$``, espaços...).
+    """
+    entries: dict[bool, list[str]] = {True: [], False: []}
+    skipped = 0
+    for old_path, target in sorted(compiled.exact.items()):
+        if not _nginx_safe(old_path, target.location):
+            skipped += 1
+            continue
+        variants = {old_path, old_path if old_path == '/' else f'{old_path}/'}
+        entries[target.permanent].extend(
+            f'    "{variant}" "{target.location}";' for variant in sorted(variants)
+        )
+    # O nginx testa as regex na ordem do arquivo: prefixos mais longos primeiro.
+    for rule in sorted(compiled.prefixes, key=lambda rule: len(rule.prefix), reverse=True):
+        if not _nginx_safe(rule.prefix, rule.new_path):
+            skipped += 1
+            continue
+        pattern = '^' + re.escape(rule.prefix.rstrip('/')) + '(?:/(.*))?$'
+        location = rule.new_path[:-1] + '$1' if rule.new_path.endswith(WILDCARD) else rule.new_path
+        entries[rule.permanent].append(f'    "~{pattern}" "{location}";')
+
+    blocks = [
+        '# Gerado por `python manage.py export_redirects_nginx`; não edite à mão.',
+        'map_hash_max_size 262144;',
+        'map_hash_bucket_size 256;',
+    ]
+    for permanent, variable in NGINX_MAP_VARIABLES.items():
+        blocks.append('')
+        blocks.append(f'map $uri {variable} {{')
+        blocks.append('    default "";')
+        blocks.extend(entries[permanent])
+        blocks.append('}')
+    return '\n'.join(blocks) + '\n', skipped
@@ -0,0 +1,100 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from navigation.models import MenuItem
+from setup.tests.factories import MenuFactory, MenuItemFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _chain(menu, labels):
+    parent, items = None, []
+    for label in labels:
+        parent = MenuItemFactory(menu=menu, parent=parent, label=label)
+        items.append(parent)
+    return items
+
+
+def test_path_and_depth_follow_the_parent_chain():
+    root, child, grandchild = _chain(MenuFactory(), ['Raiz', 'Filho', 'Neto'])
+
+    assert root.depth == 0
+    assert grandchild.depth == 2
+    assert grandchild.path == (
+        MenuItem.path_segment(root.pk)
+        + MenuItem.path_segment(child.pk)
+        + MenuItem.path_segment(grandchild.pk)
+    )
+    assert grandchild.ancestor_ids == [root.pk, child.pk]
+    assert MenuItem.objects.get(pk=grandchild.pk).path == grandchild.path
+
+
+def test_subtree_ancestors_and_breadcrumb_are_single_queries(django_assert_num_queries):
+    menu = MenuFactory()
+    root, child, grandchild = _chain(menu, ['Notícias', 'Brasil', 'Política'])
+    sibling = MenuItemFactory(menu=menu, label='Esportes')
+
+    with django_assert_num_queries(1):
+        subtree = set(root.get_descendants())
+    with django_assert_num_queries(1):
+        breadcrumb = [item.label for item in grandchild.get_breadcrumb()]
+
+    assert subtree == {child, grandchild}
+    assert sibling not in set(MenuItem.objects.subtree(root))
+    assert breadcrumb == ['Notícias', 'Brasil', 'Política']
+    assert list(grandchild.get_ancestors()) == [root, child]
+
+
+def test_moving_an_item_rewrites_its_subtree():
+    menu = MenuFactory()
+    root, child, grandchild = _chain(menu, ['A', 'B', 'C'])
+    other_root = MenuItemFactory(menu=MenuFactory(), label='Outro')
+
+    child.parent = other_root
+    child.menu = other_root.menu
+    child.save()
+
+    grandchild.refresh_from_db()
+    assert grandchild.path.startswith(other_root.path)
+    assert grandchild.depth == 2
+    assert grandchild.menu_id == other_root.menu_id
+    assert list(root.get_descendants()) == []
+
+
+def test_promoting_an_item_to_root_shortens_descendant_depth():
+    _, child, grandchild = _chain(MenuFactory(), ['A', 'B', 'C'])
+
+    child.parent = None
+    child.save(update_fields=['parent'])
+
+    grandchild.refresh_from_db()
+    assert child.depth == 0
+    assert grandchild.depth == 1
+    assert grandchild.ancestor_ids == [child.pk]
+
+
+def test_item_cannot_be_moved_below_its_own_descendant():
+    root, _, grandchild = _chain(MenuFactory(), ['A', 'B', 'C'])
+
+    root.parent = grandchild
+
+    with pytest.raises(ValidationError):
+        root.clean()
+    with pytest.raises(ValidationError):
+        root.save()
+
+
+def test_painel_rejects_moving_an_item_below_its_descendant():
+    root, _, grandchild = _chain(MenuFactory(), ['A', 'B', 'C'])
+    client = APIClient()
+    client.force_authenticate(user=User.objects.create_user(username='editor-menu'))
+
+    response = client.patch(
+        f'/api/v1/painel/menu-items/{root.pk}/', {'parent': grandchild.pk}, format='json'
+    )
+
+    assert response.status_code == 400
+    assert 'parent' in response.json()
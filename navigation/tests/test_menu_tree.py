@@ -0,0 +1,98 @@
+import pytest
+from django.core.cache import cache
+
+from navigation.services.menu_tree import build_menu_tree, get_menu_tree, load_menu_tree
+from setup.tests.factories import MenuFactory, MenuItemFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _labels(nodes) -> list:
+    return [(node['label'], _labels(node['children'])) for node in nodes]
+
+
+def test_build_menu_tree_nests_rows_in_display_order():
+    rows = [
+        {'id': 1, 'parent_id': None, 'label': 'A', 'url': '/a', 'target': '_self', 'order': 1},
+        {'id': 3, 'parent_id': 1, 'label': 'A1', 'url': '/a1', 'target': '_self', 'order': 1},
+        {'id': 2, 'parent_id': None, 'label': 'B', 'url': '/b', 'target': '_blank', 'order': 2},
+        {'id': 4, 'parent_id': 3, 'label': 'A1x', 'url': '/x', 'target': '_self', 'order': 1},
+        {'id': 5, 'parent_id': 99, 'label': 'Órfão', 'url': '/o', 'target': '_self', 'order': 1},
+    ]
+
+    tree = build_menu_tree(rows)
+
+    assert _labels(tree) == [('A', [('A1', [('A1x', [])])]), ('B', [])]
+    assert set(tree[0]) == {'id', 'label', 'url', 'target', 'order', 'children'}
+
+
+def test_load_menu_tree_uses_one_query_at_any_depth(django_assert_num_queries):
+    menu = MenuFactory()
+    parent = None
+    for depth in range(6):
+        parent = MenuItemFactory(menu=menu, parent=parent, label=f'Nível {depth}', order=1)
+
+    with django_assert_num_queries(1):
+        tree = load_menu_tree(menu.pk)
+
+    node, depth = tree[0], 0
+    while node['children']:
+        node, depth = node['children'][0], depth + 1
+    assert depth == 5
+
+
+def test_inactive_item_hides_its_subtree():
+    menu = MenuFactory()
+    hidden = MenuItemFactory(menu=menu, label='Oculto', order=1, is_active=False)
+    MenuItemFactory(menu=menu, parent=hidden, label='Filho', order=1)
+    MenuItemFactory(menu=menu, label='Visível', order=2)
+
+    assert _labels(load_menu_tree(menu.pk)) == [('Visível', [])]
+
+
+def test_get_menu_tree_is_cached_and_refreshed_on_item_save(
+    django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    cache.clear()
+    menu = MenuFactory(slug='principal')
+    item = MenuItemFactory(menu=menu, label='Política', order=1)
+    get_menu_tree(menu)
+
+    with django_assert_num_queries(0):
+        assert _labels(get_menu_tree(menu)) == [('Política', [])]
+
+    item.label = 'Economia'
+    with django_capture_on_commit_callbacks(execute=True):
+        item.save()
+
+    assert _labels(get_menu_tree(menu)) == [('Economia', [])]
+
+
+def test_moving_item_between_menus_refreshes_both_trees(django_capture_on_commit_callbacks):
+    cache.clear()
+    header = MenuFactory(slug='header')
+    footer = MenuFactory(slug='footer')
+    item = MenuItemFactory(menu=header, label='Contato', order=1)
+    get_menu_tree(header)
+    get_menu_tree(footer)
+
+    item.menu = footer
+    with django_capture_on_commit_callbacks(execute=True):
+        item.save()
+
+    assert get_menu_tree(header) == []
+    assert _labels(get_menu_tree(footer)) == [('Contato', [])]
+
+
+def test_cached_tree_is_not_served_to_a_menu_reusing_the_slug():
+    cache.clear()
+    old = MenuFactory(slug='rodape')
+    MenuItemFactory(menu=old, label='Antigo', order=1)
+    get_menu_tree(old)
+    old.slug = 'rodape-antigo'
+    old.save()
+
+    new = MenuFactory(slug='rodape')
+
+    assert get_menu_tree(new) == []
@@ -0,0 +1,106 @@
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+
+from navigation.models import RedirectType
+from navigation.services.redirect_matcher import (
+    CompiledRedirects,
+    RedirectTarget,
+    redirect_matcher,
+)
+from setup.tests.factories import RedirectFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_matcher(monkeypatch):
+    cache.clear()
+    redirect_matcher.reset()
+    # Checa a versão a cada requisição para os testes verem as mudanças na hora.
+    monkeypatch.setattr(redirect_matcher, 'check_interval', 0)
+    yield
+    redirect_matcher.reset()
+
+
+def test_compiled_redirects_prefer_exact_then_longest_prefix():
+    compiled = CompiledRedirects()
+    compiled.add('/noticia-antiga', '/posts/nova', permanent=True)
+    compiled.add('/arquivo/*', '/acervo/*', permanent=True)
+    compiled.add('/arquivo/2009/*', '/acervo-2009', permanent=False)
+
+    assert compiled.match('/noticia-antiga/') == RedirectTarget('/posts/nova', True)
+    assert compiled.match('/arquivo/2010/materia') == RedirectTarget('/acervo/2010/materia', True)
+    assert compiled.match('/arquivo/2009/materia') == RedirectTarget('/acervo-2009', False)
+    assert compiled.match('/arquivos/2010') is None
+    assert compiled.match('/outra') is None
+
+
+def test_middleware_redirects_before_routing_and_keeps_query_string(client):
+    RedirectFactory(old_path='/materia-velha', new_path='/posts/materia-nova')
+    RedirectFactory(old_path='/promo/*', new_path='/ofertas', url_type=RedirectType.TEMPORARY)
+
+    permanent = client.get('/materia-velha?utm_source=feed')
+    temporary = client.get('/promo/verao')
+
+    assert permanent.status_code == 301
+    assert permanent['Location'] == '/posts/materia-nova?utm_source=feed'
+    assert temporary.status_code == 302
+    assert temporary['Location'] == '/ofertas'
+
+
+def test_middleware_serves_from_memory_until_redirects_change(
+    client, django_assert_num_queries, django_capture_on_commit_callbacks
+):
+    redirect = RedirectFactory(old_path='/velha', new_path='/nova')
+    client.get('/velha')
+
+    with django_assert_num_queries(0):
+        assert client.get('/velha')['Location'] == '/nova'
+
+    redirect.new_path = '/novissima'
+    with django_capture_on_commit_callbacks(execute=True):
+        redirect.save()
+        # A versão só muda no commit: antes dele o matcher em memória continua valendo.
+        assert client.get('/velha')['Location'] == '/nova'
+
+    assert client.get('/velha')['Location'] == '/novissima'
+
+
+def test_middleware_ignores_api_paths_and_inactive_redirects(client):
+    RedirectFactory(old_path='/api/v1/posts/', new_path='/em-outro-lugar')
+    RedirectFactory(old_path='/desativada', new_path='/destino', is_active=False)
+
+    assert client.get('/api/v1/posts/').status_code == 200
+    assert client.get('/desativada').status_code == 404
+
+
+def test_export_redirects_nginx_writes_map_blocks():
+    RedirectFactory(old_path='/velha', new_path='/nova')
+    RedirectFactory(old_path='/arquivo/*', new_path='/acervo/*')
+    RedirectFactory(old_path='/com espaco', new_path='/destino')
+    stdout, stderr = StringIO(), StringIO()
+
+    call_command('export_redirects_nginx', stdout=stdout, stderr=stderr)
+
+    output = stdout.getvalue()
+    assert 'map $uri $cbn_redirect_permanent {' in output
+    assert '"/velha" "/nova";' in output
+    assert '"/velha/" "/nova";' in output
+    assert '"~^/arquivo(?:/(.*))?$" "/acervo/$1";' in output
+    assert 'com espaco' not in output
+    assert '1 redirects ignorados' in stderr.getvalue()
+
+
+def test_committed_nginx_map_matches_export_without_redirects():
+    stdout = StringIO()
+
+    call_command('export_redirects_nginx', stdout=stdout)
+
+    # O nginx.conf inclui o mapa versionado; ele tem que ser válido mesmo sem redirects.
+    committed = settings.BASE_DIR / 'frontend' / 'nginx' / 'redirects.map'
+    assert committed.read_text(encoding='utf-8') == stdout.getvalue()
@@ -1,7 +1,8 @@
 from rest_framework import serializers
 
-from content.models import Category, Post, Tag
-from home.models import HomeSection, HomeSectionItem
+from content.models import Category, LiveBlogEntry, Post, Tag
+from home.models import HomeSection, HomeSectionItem, HomeSectionSource
+from homeNews.models import HomeSnapshot
 from media_app.models import Media
 from navigation.models import Menu, MenuItem
 
@@ -73,12 +74,48 @@ class PostWriteSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class LiveBlogEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LiveBlogEntry
+        fields = ['id', 'post', 'content', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+    def validate_post(self, value):
+        if self.instance is not None and value != self.instance.post:
+            raise serializers.ValidationError('A entrada não pode mudar de post.')
+        return value
+
+
 class HomeSectionSerializer(serializers.ModelSerializer):
     class Meta:
         model = HomeSection
-        fields = ['id', 'title', 'section_type', 'order', 'is_active']
+        fields = [
+            'id',
+            'title',
+            'section_type',
+            'order',
+            'is_active',
+            'source',
+            'category',
+            'tag',
+            'item_limit',
+            'cache_ttl',
+        ]
         read_only_fields = ['id']
 
+    def validate(self, attrs):
+        def current(field):
+            if field in attrs:
+                return attrs[field]
+            return getattr(self.instance, field, None)
+
+        source = current('source') or HomeSectionSource.MANUAL
+        if source == HomeSectionSource.CATEGORY and current('category') is None:
+            raise serializers.ValidationError({'category': 'Informe a categoria da seção.'})
+        if source == HomeSectionSource.TAG and current('tag') is None:
+            raise serializers.ValidationError({'tag': 'Informe a tag da seção.'})
+        return attrs
+
 
 class HomeSectionItemSerializer(serializers.ModelSerializer):
     class Meta:
@@ -87,6 +124,15 @@ class HomeSectionItemSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
+class HomeSnapshotSerializer(serializers.ModelSerializer):
+    published_by = serializers.CharField(source='published_by.username', default=None)
+
+    class Meta:
+        model = HomeSnapshot
+        fields = ['id', 'status', 'etag', 'built_at', 'published_at', 'published_by']
+        read_only_fields = fields
+
+
 class MenuSerializer(serializers.ModelSerializer):
     class Meta:
         model = Menu
@@ -99,3 +145,14 @@ class MenuItemSerializer(serializers.ModelSerializer):
         model = MenuItem
         fields = ['id', 'menu', 'parent', 'label', 'url', 'order', 'target', 'is_active']
         read_only_fields = ['id']
+
+    def validate_parent(self, parent):
+        if (
+            self.instance is not None
+            and parent is not None
+            and parent.is_descendant_of(self.instance)
+        ):
+            raise serializers.ValidationError(
+                'Um item não pode ficar abaixo de si mesmo ou de um descendente.'
+            )
+        return parent
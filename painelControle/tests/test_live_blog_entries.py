@@ -0,0 +1,63 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+
+from accounts.models import Author
+from content.models import LiveBlogEntry
+from setup.tests.factories import PostFactory
+
+
+pytestmark = pytest.mark.django_db
+
+
+def _client_for(username: str) -> tuple[APIClient, Author]:
+    user = User.objects.create_user(username=username, password='secret')
+    author = Author.objects.create(user=user, name=username)
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client, author
+
+
+def test_post_author_publishes_sanitized_live_entries_without_saving_the_post():
+    client, author = _client_for('reporter-ao-vivo')
+    post = PostFactory(author=author)
+    updated_at = post.updated_at
+
+    response = client.post(
+        '/api/v1/painel/live-entries/',
+        {'post': post.id, 'content': '<p>Urna apurada</p><script>x()</script>'},
+        format='json',
+    )
+
+    assert response.status_code == 201
+    assert LiveBlogEntry.objects.get().content == '<p>Urna apurada</p>'
+    post.refresh_from_db()
+    assert post.updated_at == updated_at
+
+
+def test_other_authors_cannot_publish_on_the_post():
+    client, _ = _client_for('outro-reporter')
+    post = PostFactory()
+
+    response = client.post(
+        '/api/v1/painel/live-entries/', {'post': post.id, 'content': '<p>x</p>'}, format='json'
+    )
+
+    assert response.status_code == 403
+    assert not LiveBlogEntry.objects.exists()
+
+
+def test_live_entries_are_append_only():
+    client, author = _client_for('reporter-append-only')
+    entry = LiveBlogEntry.objects.create(post=PostFactory(author=author), content='<p>1</p>')
+    other_post = PostFactory()
+    url = f'/api/v1/painel/live-entries/{entry.id}/'
+
+    patch = client.patch(url, {'post': other_post.id, 'content': '<p>x</p>'}, format='json')
+    delete = client.delete(url)
+
+    assert patch.status_code == 405
+    assert delete.status_code == 405
+    entry.refresh_from_db()
+    assert entry.content == '<p>1</p>'
+    assert entry.post.author == author
@@ -5,6 +5,8 @@ from .views import (
     CategoryViewSet,
     HomeSectionItemViewSet,
     HomeSectionViewSet,
+    HomeSnapshotViewSet,
+    LiveBlogEntryViewSet,
     MediaViewSet,
     MenuItemViewSet,
     MenuViewSet,
@@ -19,8 +21,10 @@ router.register(r'media', MediaViewSet, basename='media')
 router.register(r'categories', CategoryViewSet, basename='category')
 router.register(r'tags', TagViewSet, basename='tag')
 router.register(r'posts', PostViewSet, basename='post')
+router.register(r'live-entries', LiveBlogEntryViewSet, basename='live-entry')
 router.register(r'home-sections', HomeSectionViewSet, basename='home-section')
 router.register(r'home-section-items', HomeSectionItemViewSet, basename='home-section-item')
+router.register(r'home-snapshots', HomeSnapshotViewSet, basename='home-snapshot')
 router.register(r'menus', MenuViewSet, basename='menu')
 router.register(r'menu-items', MenuItemViewSet, basename='menu-item')
 
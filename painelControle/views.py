@@ -1,15 +1,26 @@
-from rest_framework import filters, permissions, viewsets
+from rest_framework import filters, permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 
-from content.models import Category, Post, Tag
+from content.models import Category, LiveBlogEntry, Post, Tag
 from home.models import HomeSection, HomeSectionItem
+from homeNews.cache_utils import build_rendered_response
+from homeNews.home_snapshot import (
+    build_home_snapshot,
+    publish_home_snapshot,
+    render_home_snapshot,
+)
+from homeNews.models import HomeSnapshot
 from media_app.models import Media
 from navigation.models import Menu, MenuItem
 from painelControle.serializers import (
     CategorySerializer,
     HomeSectionItemSerializer,
     HomeSectionSerializer,
+    HomeSnapshotSerializer,
+    LiveBlogEntrySerializer,
     MenuItemSerializer,
     MenuSerializer,
     PainelMediaSerializer,
@@ -27,6 +38,8 @@ class IsAuthorOrAdmin(permissions.BasePermission):
         if request.user.is_staff:
             return True
         author = getattr(obj, 'author', None)
+        if author is None and isinstance(obj, LiveBlogEntry):
+            author = obj.post.author
         return bool(author and author.user_id == request.user.id)
 
 
@@ -63,7 +76,7 @@ class PostViewSet(BaseAuthenticatedViewSet):
     queryset = Post.objects.select_related('author', 'cover_image').prefetch_related(
         'categories', 'tags'
     )
-    search_fields = ['title', 'subtitle', 'content', 'slug']
+    search_fields = ['title', 'subtitle', 'plain_text', 'slug']
     ordering_fields = ['published_at', 'created_at', 'title']
     ordering = ['-published_at', '-created_at']
     permission_classes = [permissions.IsAuthenticated, IsAuthorOrAdmin]
@@ -83,6 +96,27 @@ class PostViewSet(BaseAuthenticatedViewSet):
         serializer.save(author=serializer.instance.author)
 
 
+class LiveBlogEntryViewSet(BaseAuthenticatedViewSet):
+    """
+    Entradas da cobertura ao vivo; cada uma é um insert pequeno, sem salvar o post.
+    Append-only: quem consulta /live/?after=<id> nunca veria uma edição ou
+    exclusão, então correções entram como entradas novas.
+    """
+
+    http_method_names = ['get', 'post', 'head', 'options']
+    queryset = LiveBlogEntry.objects.select_related('post__author')
+    serializer_class = LiveBlogEntrySerializer
+    filterset_fields = ['post']
+    ordering_fields = ['id']
+    ordering = ['-id']
+    permission_classes = [permissions.IsAuthenticated, IsAuthorOrAdmin]
+
+    def perform_create(self, serializer):
+        # Só quem pode editar o post publica entradas nele.
+        self.check_object_permissions(self.request, serializer.validated_data['post'])
+        serializer.save()
+
+
 class HomeSectionViewSet(BaseAuthenticatedViewSet):
     queryset = HomeSection.objects.all()
     serializer_class = HomeSectionSerializer
@@ -98,6 +132,38 @@ class HomeSectionItemViewSet(BaseAuthenticatedViewSet):
     ordering = ['order']
 
 
+class HomeSnapshotViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Versões do snapshot da home: ``POST build/`` monta um rascunho com o estado
+    atual, ``GET <id>/preview/`` devolve o JSON exatamente como será servido em
+    ``/home/`` e ``POST <id>/publish/`` o coloca no ar (ou volta a uma versão antiga).
+    """
+
+    queryset = HomeSnapshot.objects.select_related('published_by').defer('content')
+    serializer_class = HomeSnapshotSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status']
+    ordering_fields = ['id', 'built_at']
+    ordering = ['-id']
+
+    @action(detail=False, methods=['post'])
+    def build(self, request):
+        snapshot = build_home_snapshot()
+        return Response(self.get_serializer(snapshot).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def preview(self, request, pk=None):
+        response = build_rendered_response(request, render_home_snapshot(self.get_object()), 0)
+        response['Cache-Control'] = 'private, no-store'
+        return response
+
+    @action(detail=True, methods=['post'])
+    def publish(self, request, pk=None):
+        snapshot = publish_home_snapshot(self.get_object(), user=request.user)
+        return Response(self.get_serializer(snapshot).data)
+
+
 class MenuViewSet(BaseAuthenticatedViewSet):
     queryset = Menu.objects.all()
     serializer_class = MenuSerializer
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+BASELINES_PATH = Path(__file__).with_name('baselines.json')
+
+# Latência e memória variam entre máquinas; a tolerância evita falso alarme.
+# A contagem de queries é determinística e não tem folga: uma query a mais é
+# exatamente o N+1 que o benchmark existe para pegar.
+LATENCY_TOLERANCE = 1.5
+LATENCY_SLACK_MS = 5.0
+MEMORY_TOLERANCE = 1.5
+
+
+@dataclass(frozen=True)
+class Measurement:
+    status_code: int
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    peak_kib: float
+
+
+def _percentile(samples: list[float], percentile: int) -> float:
+    if len(samples) == 1:
+        return samples[0]
+    return statistics.quantiles(samples, n=100, method='inclusive')[percentile - 1]
+
+
+def _get(client, url: str):
+    response = client.get(url)
+    if response.streaming:
+        # Respostas em streaming só fazem o trabalho (e as queries) ao serem consumidas.
+        b''.join(response.streaming_content)
+    return response
+
+
+def measure_endpoint(client, url: str, *, warm: bool, rounds: int) -> Measurement:
+    """
+    Mede ``rounds`` requisições GET a ``url``.
+
+    ``warm=False`` limpa o cache antes de cada rodada (fora da medição); com
+    ``warm=True`` uma requisição de aquecimento preenche o cache primeiro.
+    """
+    if warm:
+        _get(client, url)
+
+    timings = []
+    for _ in range(rounds):
+        if not warm:
+            cache.clear()
+        started = time.perf_counter()
+        response = _get(client, url)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    # Queries e memória são medidas numa rodada extra para não distorcer a latência.
+    if not warm:
+        cache.clear()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            response = _get(client, url)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return Measurement(
+        status_code=response.status_code,
+        queries=len(queries),
+        p50_ms=round(_percentile(timings, 50), 2),
+        p95_ms=round(_percentile(timings, 95), 2),
+        peak_kib=round(peak / 1024, 1),
+    )
+
+
+def load_baselines(profile: str) -> dict[str, dict]:
+    if not BASELINES_PATH.exists():
+        return {}
+    return json.loads(BASELINES_PATH.read_text(encoding='utf-8')).get(profile, {})
+
+
+def save_baselines(profile: str, measurements: dict[str, Measurement]) -> None:
+    stored = {}
+    if BASELINES_PATH.exists():
+        stored = json.loads(BASELINES_PATH.read_text(encoding='utf-8'))
+    stored[profile] = {
+        name: {key: value for key, value in asdict(m).items() if key != 'status_code'}
+        for name, m in sorted(measurements.items())
+    }
+    BASELINES_PATH.write_text(
+        json.dumps(stored, indent=2, sort_keys=True, ensure_ascii=False) + '\n', encoding='utf-8'
+    )
+
+
+def compare_with_baseline(measurement: Measurement, baseline: dict | None) -> list[str]:
+    if baseline is None:
+        return []
+    problems = []
+    if measurement.queries > baseline['queries']:
+        problems.append(f'queries: {measurement.queries} > baseline {baseline["queries"]}')
+    if baseline.get('p95_ms') is not None:
+        budget = baseline['p95_ms'] * LATENCY_TOLERANCE + LATENCY_SLACK_MS
+        if measurement.p95_ms > budget:
+            problems.append(f'p95: {measurement.p95_ms}ms > budget {budget:.2f}ms')
+    if baseline.get('peak_kib') is not None:
+        budget = baseline['peak_kib'] * MEMORY_TOLERANCE
+        if measurement.peak_kib > budget:
+            problems.append(f'memory: {measurement.peak_kib}KiB > budget {budget:.1f}KiB')
+    return problems
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from rest_framework.settings import api_settings
+from django.utils import timezone
+
+from content.models import Category, Post, PostStatus, Tag
+from content.services.plain_text_extractor import build_excerpt
+from content.services.post_search import refresh_post_search_vector
+from home.models import HomeSectionItem
+from homeNews.home_snapshot import rebuild_home_snapshot
+from navigation.models import Redirect
+from setup.tests.factories import (
+    AuthorFactory,
+    CategoryFactory,
+    HomeSectionFactory,
+    MediaFactory,
+    MenuFactory,
+    MenuItemFactory,
+    PostFactory,
+    RedirectFactory,
+    TagFactory,
+)
+
+
+@dataclass(frozen=True)
+class BenchmarkVolume:
+    posts: int
+    authors: int
+    categories: int
+    tags: int
+    tags_per_post: int
+    menu_depth: int
+    menu_fanout: int
+    home_sections: int
+    items_per_section: int
+    redirects: int
+    batch_size: int = 1000
+
+
+# 'full' reproduz o volume de produção; 'smoke' roda em segundos e serve para
+# validar o próprio harness (os orçamentos de queries valem para os dois).
+BENCHMARK_PROFILES = {
+    'smoke': BenchmarkVolume(
+        posts=400,
+        authors=10,
+        categories=12,
+        tags=60,
+        tags_per_post=3,
+        menu_depth=3,
+        menu_fanout=3,
+        home_sections=4,
+        items_per_section=6,
+        redirects=100,
+    ),
+    'full': BenchmarkVolume(
+        posts=100_000,
+        authors=200,
+        categories=60,
+        tags=2_000,
+        tags_per_post=4,
+        menu_depth=4,
+        menu_fanout=5,
+        home_sections=8,
+        items_per_section=10,
+        redirects=5_000,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class SeededData:
+    post_slug: str
+    category_slug: str
+    tag_slug: str
+    menu_slug: str
+    post_id: int
+    last_page: int
+    editor: User
+
+
+def _seed_posts(volume: BenchmarkVolume, rng: random.Random, authors, categories, tags, cover):
+    now = timezone.now()
+    Through = Post.categories.through
+    TagThrough = Post.tags.through
+    for start in range(0, volume.posts, volume.batch_size):
+        size = min(volume.batch_size, volume.posts - start)
+        # build() não dispara save(): o pipeline de conteúdo é caro demais para
+        # 100k linhas, então preenchemos os campos derivados aqui.
+        posts = PostFactory.build_batch(size, author=authors[0], cover_image=cover)
+        for offset, post in enumerate(posts):
+            post.author = authors[(start + offset) % len(authors)]
+            post.published_at = now - timedelta(minutes=start + offset)
+            if (start + offset) % 20 == 0:
+                post.status = PostStatus.DRAFT
+                post.published_at = None
+            post.plain_text = post.content
+            post.excerpt = build_excerpt(post.content)
+        created = Post.objects.bulk_create(posts, batch_size=volume.batch_size)
+        Through.objects.bulk_create(
+            [Through(post_id=post.pk, category_id=rng.choice(categories).pk) for post in created],
+            batch_size=volume.batch_size,
+            ignore_conflicts=True,
+        )
+        TagThrough.objects.bulk_create(
+            [
+                TagThrough(post_id=post.pk, tag_id=tag.pk)
+                for post in created
+                for tag in rng.sample(tags, volume.tags_per_post)
+            ],
+            batch_size=volume.batch_size,
+            ignore_conflicts=True,
+        )
+    refresh_post_search_vector(Post.objects.all())
+
+
+def _seed_menu_level(menu, parent, depth: int, volume: BenchmarkVolume) -> None:
+    if depth > volume.menu_depth:
+        return
+    for order in range(1, volume.menu_fanout + 1):
+        item = MenuItemFactory(menu=menu, parent=parent, order=order)
+        _seed_menu_level(menu, item, depth + 1, volume)
+
+
+def seed_benchmark_data(volume: BenchmarkVolume, seed: int = 421) -> SeededData:
+    rng = random.Random(seed)
+    cover = MediaFactory()
+    authors = list(AuthorFactory.create_batch(volume.authors, avatar=cover))
+    categories = list(CategoryFactory.create_batch(volume.categories))
+    tags = list(TagFactory.create_batch(volume.tags))
+    _seed_posts(volume, rng, authors, categories, tags, cover)
+
+    published = list(
+        Post.objects.published().order_by('-published_at')[
+            : volume.home_sections * volume.items_per_section
+        ]
+    )
+    items = []
+    for index in range(volume.home_sections):
+        section = HomeSectionFactory(order=index + 1)
+        chunk = published[index * volume.items_per_section : (index + 1) * volume.items_per_section]
+        items.extend(
+            HomeSectionItem(section=section, post=post, order=order)
+            for order, post in enumerate(chunk, start=1)
+        )
+    HomeSectionItem.objects.bulk_create(items)
+    # bulk_create não dispara sinais: a versão no ar da home é montada aqui.
+    rebuild_home_snapshot(publish=True)
+
+    menu = MenuFactory(slug='principal')
+    _seed_menu_level(menu, None, 1, volume)
+
+    Redirect.objects.bulk_create(
+        RedirectFactory.build_batch(volume.redirects), batch_size=volume.batch_size
+    )
+
+    # Fora da janela de acomodação do /sync/: senão a contagem de queries do
+    # endpoint depende de quanto tempo o seed levou.
+    settled = timezone.now() - timedelta(minutes=1)
+    for model in (Category, Tag, Redirect):
+        model._base_manager.update(updated_at=settled)
+
+    editor = User.objects.create_user(username='benchmark-editor', is_staff=True)
+    post = published[0]
+    category = post.categories.first()
+    return SeededData(
+        post_slug=post.slug,
+        category_slug=category.slug,
+        tag_slug=post.tags.first().slug,
+        menu_slug=menu.slug,
+        post_id=post.pk,
+        last_page=max(1, -(-Post.objects.published().count() // api_settings.PAGE_SIZE)),
+        editor=editor,
+    )
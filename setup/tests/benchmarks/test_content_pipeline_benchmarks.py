@@ -0,0 +1,75 @@
+"""
+Benchmark do processamento do HTML dos posts: pipeline em estágios (bleach,
+extração de texto, contagem de palavras) contra a tokenização única.
+
+Desligado por padrão, como os da API. Confere que os dois produzem o mesmo
+texto e registra a mediana de cada um nas propriedades do relatório JUnit::
+
+    CBN_BENCHMARK=smoke pytest -m benchmark --junitxml=pipeline.xml \
+        setup/tests/benchmarks/test_content_pipeline_benchmarks.py
+"""
+
+import os
+import statistics
+import time
+
+import pytest
+
+from content.services.post_content_pipeline import (
+    PIPELINE_SINGLE_PASS,
+    PIPELINE_STAGED,
+    build_post_content_pipeline,
+)
+from setup.tests.benchmarks.seed import BENCHMARK_PROFILES
+
+
+PROFILE = os.getenv('CBN_BENCHMARK', '')
+ROUNDS = int(os.getenv('CBN_BENCHMARK_ROUNDS', '20'))
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.skipif(
+        PROFILE not in BENCHMARK_PROFILES,
+        reason=f'defina CBN_BENCHMARK com um de {sorted(BENCHMARK_PROFILES)}',
+    ),
+]
+
+# Parágrafo típico de matéria colada do editor: links, ênfases, entidades,
+# figura, um embed em <div> e um <script> de terceiros.
+PARAGRAPH = (
+    '<p>O <strong>esquema</strong> envolvia '
+    '<a href="https://cbn.example/doc?id=1&amp;v=2" target="_blank" onclick="x()">contratos</a> '
+    'de R$ 10 milhões &mdash; segundo a <em>Polícia Federal</em>, em 2023.</p>\n'
+    '<h2>Desdobramentos</h2>'
+    '<figure><img src="https://cbn.example/foto.jpg" alt="Fachada">'
+    '<figcaption>Sede da empresa investigada</figcaption></figure>'
+    '<div class="embed"><blockquote>Citação do relatório.</blockquote></div>'
+    '<script>track("view")</script>\n'
+)
+ARTICLE_SIZES_KB = {'smoke': [20, 200], 'full': [20, 200, 500]}
+
+
+def _median_ms(pipeline, raw_html: str) -> float:
+    timings = []
+    for _ in range(max(ROUNDS // 4, 3)):
+        started = time.perf_counter()
+        pipeline.process(raw_html)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+@pytest.mark.parametrize('size_kb', ARTICLE_SIZES_KB.get(PROFILE, []))
+def test_single_pass_pipeline_matches_staged_text(size_kb, record_property):
+    raw_html = PARAGRAPH * (size_kb * 1024 // len(PARAGRAPH))
+    staged = build_post_content_pipeline(PIPELINE_STAGED)
+    single_pass = build_post_content_pipeline(PIPELINE_SINGLE_PASS)
+
+    expected = staged.process(raw_html)
+    processed = single_pass.process(raw_html)
+    assert processed.plain_text == expected.plain_text
+    assert processed.reading_time == expected.reading_time
+
+    # Os tempos só são registrados (--junitxml): comparar relógio numa máquina
+    # compartilhada de CI falha de forma intermitente.
+    record_property('staged_ms', round(_median_ms(staged, raw_html), 1))
+    record_property('single_pass_ms', round(_median_ms(single_pass, raw_html), 1))
@@ -0,0 +1,123 @@
+"""
+Benchmarks da API de leitura (homeNews) e do painel.
+
+Desligados por padrão; rode com, por exemplo::
+
+    CBN_BENCHMARK=smoke pytest -m benchmark setup/tests/benchmarks
+    CBN_BENCHMARK=full CBN_BENCHMARK_ROUNDS=30 pytest -m benchmark setup/tests/benchmarks
+
+``CBN_BENCHMARK_UPDATE=1`` regrava ``baselines.json`` com as medições atuais
+em vez de comparar (faça isso ao aceitar uma mudança de custo intencional).
+O arquivo versionado guarda só o orçamento de queries, que não depende da
+máquina; p95 e memória passam a ser cobrados quando gravados na máquina de
+referência (CI com PostgreSQL).
+"""
+
+import os
+
+import pytest
+from django.db import transaction
+from rest_framework.test import APIClient
+
+from setup.tests.benchmarks.harness import (
+    compare_with_baseline,
+    load_baselines,
+    measure_endpoint,
+    save_baselines,
+)
+from setup.tests.benchmarks.seed import BENCHMARK_PROFILES, seed_benchmark_data
+
+
+PROFILE = os.getenv('CBN_BENCHMARK', '')
+ROUNDS = int(os.getenv('CBN_BENCHMARK_ROUNDS', '20'))
+UPDATE_BASELINES = os.getenv('CBN_BENCHMARK_UPDATE') == '1'
+
+pytestmark = [
+    pytest.mark.benchmark,
+    pytest.mark.django_db,
+    pytest.mark.skipif(
+        PROFILE not in BENCHMARK_PROFILES,
+        reason=f'defina CBN_BENCHMARK com um de {sorted(BENCHMARK_PROFILES)}',
+    ),
+]
+
+PUBLIC_ENDPOINTS = {
+    'public:posts-list': '/api/v1/posts/',
+    'public:posts-list-deep-page': '/api/v1/posts/?page={last_page}',
+    'public:posts-list-cursor': '/api/v1/posts/?cursor=',
+    'public:posts-by-category': '/api/v1/posts/?category={category_slug}',
+    'public:posts-by-tag': '/api/v1/posts/?tag={tag_slug}',
+    'public:posts-by-title': '/api/v1/posts/?title=post 1',
+    'public:post-detail': '/api/v1/posts/{post_slug}/',
+    'public:categories-list': '/api/v1/categories/',
+    'public:category-detail': '/api/v1/categories/{category_slug}/',
+    'public:tags-list': '/api/v1/tags/',
+    'public:tag-detail': '/api/v1/tags/{tag_slug}/',
+    'public:home': '/api/v1/home/',
+    'public:menus-list': '/api/v1/menus/',
+    'public:menu-detail': '/api/v1/menus/{menu_slug}/',
+    'public:redirects-list': '/api/v1/redirects/',
+    'public:redirects-sync': '/api/v1/redirects/sync/',
+    'public:redirects-dump': '/api/v1/redirects/dump/',
+    'public:categories-sync': '/api/v1/categories/sync/',
+    'public:tags-sync': '/api/v1/tags/sync/',
+    'public:tags-dump': '/api/v1/tags/dump/',
+    'public:feed-rss': '/api/v1/feeds/rss/',
+    'public:category-feed-atom': '/api/v1/feeds/categories/{category_slug}/atom/',
+}
+
+PAINEL_ENDPOINTS = {
+    'painel:media-list': '/api/v1/painel/media/',
+    'painel:categories-list': '/api/v1/painel/categories/',
+    'painel:tags-list': '/api/v1/painel/tags/',
+    'painel:posts-list': '/api/v1/painel/posts/',
+    'painel:posts-search': '/api/v1/painel/posts/?search=post',
+    'painel:post-detail': '/api/v1/painel/posts/{post_id}/',
+    'painel:home-sections-list': '/api/v1/painel/home-sections/',
+    'painel:home-section-items-list': '/api/v1/painel/home-section-items/',
+    'painel:menus-list': '/api/v1/painel/menus/',
+    'painel:menu-items-list': '/api/v1/painel/menu-items/',
+}
+
+ENDPOINTS = {**PUBLIC_ENDPOINTS, **PAINEL_ENDPOINTS}
+MODES = ['cold', 'warm']
+
+_measurements = {}
+
+
+@pytest.fixture(scope='module')
+def seeded(django_db_setup, django_db_blocker):
+    # Semeado uma vez por módulo dentro de uma transação desfeita no final,
+    # para não vazar 100k posts para outros testes da mesma sessão.
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield seed_benchmark_data(BENCHMARK_PROFILES[PROFILE])
+            transaction.set_rollback(True)
+    if UPDATE_BASELINES and _measurements:
+        save_baselines(PROFILE, _measurements)
+
+
+@pytest.mark.parametrize('mode', MODES)
+@pytest.mark.parametrize('name', sorted(ENDPOINTS))
+def test_endpoint_stays_within_baseline(seeded, name, mode):
+    url = ENDPOINTS[name].format(
+        post_slug=seeded.post_slug,
+        post_id=seeded.post_id,
+        last_page=seeded.last_page,
+        category_slug=seeded.category_slug,
+        tag_slug=seeded.tag_slug,
+        menu_slug=seeded.menu_slug,
+    )
+    client = APIClient()
+    if name.startswith('painel:'):
+        client.force_authenticate(user=seeded.editor)
+
+    measurement = measure_endpoint(client, url, warm=mode == 'warm', rounds=ROUNDS)
+
+    assert measurement.status_code == 200, url
+    key = f'{name}:{mode}'
+    _measurements[key] = measurement
+    if UPDATE_BASELINES:
+        return
+    problems = compare_with_baseline(measurement, load_baselines(PROFILE).get(key))
+    assert not problems, f'{key} ({url}) regrediu: ' + '; '.join(problems)